@@ -0,0 +1,179 @@
+"""
+Rerun-latency harness for the Streamlit app: time per interaction vs task count.
+
+For each owner size, seeds a synthetic owner into a scratch `pawpal_data/`
+store, drives app.py through Streamlit's AppTest (initial load, sort and
+filter changes, completing a task, "Generate schedule", an idle rerun) and
+records the median wall time and widget count of every rerun. Results are
+compared with a stored baseline: a step fails if it got slower than
+`--tolerance` times its baseline (plus `--slack` seconds for timer noise) or
+renders more widgets than before. The first run, or --update-baseline,
+records the baseline instead. Baselines are machine-specific; record one per
+machine (or CI runner) and compare only against that.
+
+Usage: python benchmarks/bench_app_rerun.py [--sizes 50 200 1000] [--pets 5] [--repeats 3]
+           [--baseline benchmarks/app_rerun_baseline.json] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from pawpal_batch import owner_files, write_synthetic_owners
+from pawpal_system import load_owner, owner_cache, save_owner
+
+APP = os.path.join(ROOT, "app.py")
+DATA_DIR = "pawpal_data"  # app.py's store, relative to the working directory
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_rerun_baseline.json")
+
+# AppTest element lists counted as widgets
+WIDGET_TYPES = ("button", "checkbox", "color_picker", "date_input", "multiselect", "number_input",
+                "radio", "selectbox", "select_slider", "slider", "text_area", "text_input",
+                "time_input", "toggle")
+
+
+def widget_count(at) -> int:
+    return sum(len(getattr(at, kind)) for kind in WIDGET_TYPES)
+
+
+def selectbox(at, label: str):
+    return next(box for box in at.selectbox if box.label == label)
+
+
+def complete_button(at):
+    return next(button for button in at.button if (button.key or "").startswith("complete_"))
+
+
+# (step name, action taking the AppTest and returning it after one rerun)
+STEPS = [
+    ("initial load", lambda at: at.run()),
+    ("sort by priority", lambda at: selectbox(at, "Sort by:").set_value("Priority").run()),
+    ("sort by pet", lambda at: selectbox(at, "Sort by:").set_value("Pet").run()),
+    ("filter overdue", lambda at: selectbox(at, "Filter by:").set_value("Overdue").run()),
+    ("filter by pet", lambda at: selectbox(at, "Filter by:").set_value("Pet").run()),
+    ("filter none", lambda at: selectbox(at, "Filter by:").set_value("None").run()),
+    ("complete task", lambda at: complete_button(at).click().run()),
+    ("generate schedule", lambda at: next(b for b in at.button if b.label == "Generate schedule").click().run()),
+    ("idle rerun", lambda at: at.run()),
+]
+
+
+def seed_store(directory: str, pets: int, tasks: int, seed: int) -> None:
+    """Write one synthetic owner with `tasks` tasks spread over `pets` pets as a segmented store"""
+    owner_dir = os.path.join(directory, "seed")
+    write_synthetic_owners(owner_dir, 1, pets_per_owner=pets, tasks_per_pet=max(1, tasks // pets), seed=seed)
+    save_owner(load_owner(owner_files(owner_dir)[0]), os.path.join(directory, DATA_DIR))
+
+
+def run_scenario(tasks: int, pets: int, timeout: float, seed: int) -> dict:
+    """One pass over STEPS in a fresh app session; step -> (seconds, widgets)"""
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_store(tmp, pets, tasks, seed)
+        os.chdir(tmp)
+        owner_cache.invalidate(DATA_DIR)  # the cache is process-wide and keyed by the relative path
+        try:
+            at = AppTest.from_file(APP, default_timeout=timeout)
+            for name, action in STEPS:
+                start = time.perf_counter()
+                at = action(at)
+                elapsed = time.perf_counter() - start
+                if at.exception:
+                    raise RuntimeError(f"{name}: app raised {at.exception[0].value}")
+                results[name] = (elapsed, widget_count(at))
+        finally:
+            owner_cache.invalidate(DATA_DIR)
+            os.chdir(cwd)
+    return results
+
+
+def measure(sizes, pets: int, repeats: int, timeout: float) -> dict:
+    """size -> step -> {"seconds": median wall time, "widgets": count}"""
+    curves = {}
+    for tasks in sizes:
+        runs = [run_scenario(tasks, pets, timeout, seed) for seed in range(repeats)]
+        curves[str(tasks)] = {
+            name: {
+                "seconds": round(statistics.median(run[name][0] for run in runs), 4),
+                "widgets": max(run[name][1] for run in runs),
+            }
+            for name, _ in STEPS
+        }
+    return curves
+
+
+def compare(curves: dict, baseline: dict, tolerance: float, slack: float) -> list:
+    """Messages for every step that regressed against the baseline"""
+    regressions = []
+    for size, steps in curves.items():
+        for name, now in steps.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                continue
+            limit = before["seconds"] * tolerance + slack
+            if now["seconds"] > limit:
+                regressions.append(f"{size} tasks, {name}: {now['seconds'] * 1e3:.0f} ms "
+                                   f"(baseline {before['seconds'] * 1e3:.0f} ms, limit {limit * 1e3:.0f} ms)")
+            if now["widgets"] > before["widgets"]:
+                regressions.append(f"{size} tasks, {name}: {now['widgets']} widgets (baseline {before['widgets']})")
+    return regressions
+
+
+def print_table(curves: dict) -> None:
+    sizes = list(curves)
+    print(f"{'step':20}" + "".join(f"{size + ' tasks':>18}" for size in sizes))
+    for name, _ in STEPS:
+        cells = "".join(f"{curves[s][name]['seconds'] * 1e3:9.0f} ms {curves[s][name]['widgets']:5d}w" for s in sizes)
+        print(f"{name:20}{cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="tasks per owner")
+    parser.add_argument("--pets", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3, help="fresh sessions per size (median is kept)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="AppTest timeout per rerun, in seconds")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor per step")
+    parser.add_argument("--slack", type=float, default=0.05, help="extra seconds allowed per step for noise")
+    args = parser.parse_args()
+
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        print("streamlit is not installed (pip install -r requirements.txt)", file=sys.stderr)
+        return 2
+
+    curves = measure(args.sizes, args.pets, args.repeats, args.timeout)
+    print_table(curves)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": platform.node(), "python": platform.python_version(), "curves": curves}, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(curves, baseline["curves"], args.tolerance, args.slack)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"No regressions against {args.baseline} (recorded on {baseline.get('machine')})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
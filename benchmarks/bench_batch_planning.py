@@ -0,0 +1,43 @@
+"""
+Benchmark batch planning throughput across process-pool sizes.
+
+Usage: python benchmarks/bench_batch_planning.py [--owners 10000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pawpal_batch import owner_files, plan_owners, write_synthetic_owners
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--owners", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+
+    with tempfile.TemporaryDirectory() as owner_dir:
+        print(f"Writing {args.owners} synthetic owners...")
+        write_synthetic_owners(owner_dir, args.owners)
+        paths = owner_files(owner_dir)
+
+        baseline = None
+        for workers in worker_counts:
+            report = plan_owners(paths, workers=workers, chunk_size=args.chunk_size)
+            baseline = baseline or report.owners_per_second
+            speedup = report.owners_per_second / baseline
+            print(f"workers={workers:<3} {report.elapsed:8.2f}s  "
+                  f"{report.owners_per_second:10.1f} owners/s  speedup x{speedup:.2f}  "
+                  f"errors={len(report.errors)}")
+
+
+if __name__ == "__main__":
+    main()
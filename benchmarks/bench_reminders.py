@@ -0,0 +1,67 @@
+"""
+Benchmark the reminder timer wheel with a large number of pending reminders.
+
+Schedules N reminders spread over a horizon, reschedules and cancels a share of
+them (as task edits and completions would), then advances the clock through the
+whole horizon, reporting per-operation costs.
+
+Usage: python benchmarks/bench_reminders.py [--reminders 1000000] [--days 90]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pawpal_reminders import TimerWheel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--churn", type=float, default=0.1, help="share of reminders moved and cancelled")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    start = 1_000_000_000
+    horizon = args.days * 1440
+    minutes = [start + rng.randint(1, horizon) for _ in range(args.reminders)]
+    wheel = TimerWheel(start)
+
+    t = time.perf_counter()
+    for key, minute in enumerate(minutes):
+        wheel.schedule(key, minute, minute)
+    insert = time.perf_counter() - t
+
+    churn = rng.sample(range(args.reminders), int(args.reminders * args.churn))
+    half = len(churn) // 2
+    t = time.perf_counter()
+    for key in churn[:half]:
+        wheel.schedule(key, start + rng.randint(1, horizon))
+    for key in churn[half:]:
+        wheel.cancel(key)
+    churned = time.perf_counter() - t
+
+    t = time.perf_counter()
+    fired = 0
+    now = start
+    while now < start + horizon:
+        now += 1
+        fired += len(wheel.advance(now))
+    advance = time.perf_counter() - t
+
+    n = args.reminders
+    print(f"{n} reminders over {args.days} days")
+    print(f"insert     {insert:7.2f}s  {insert / n * 1e9:8.0f} ns/op")
+    print(f"move+cancel{churned:7.2f}s  {churned / max(1, len(churn)) * 1e9:8.0f} ns/op")
+    print(f"advance    {advance:7.2f}s  {horizon} ticks, {fired} fired, "
+          f"{advance / max(1, fired) * 1e9:.0f} ns per fired reminder")
+    assert fired == n - (len(churn) - half), "every live reminder fires exactly once"
+
+
+if __name__ == "__main__":
+    main()
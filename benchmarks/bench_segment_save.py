@@ -0,0 +1,81 @@
+"""
+Benchmark the save after one task completion: single JSON file vs per-pet segments.
+
+Builds an owner with N pets, saves it both ways, then repeatedly completes one
+task for one pet and saves again, reporting time and bytes written per save.
+
+Usage: python benchmarks/bench_segment_save.py [--pets 50] [--tasks-per-pet 200] [--saves 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pawpal_system import Owner, Pet, Priority, Scheduler, Task, save_owner_segments, save_owner_to_json
+
+
+def build_owner(pets: int, tasks_per_pet: int) -> Owner:
+    rng = random.Random(0)
+    owner = Owner("Facility")
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    for p in range(pets):
+        pet = Pet(f"Pet {p}", "Dog", 3, 20.0, [])
+        owner.add_pet(pet)
+        for t in range(tasks_per_pet):
+            pet.add_task(Task(f"Task {t % 25}", rng.choice(list(Priority)), rng.choice((5, 15, 30)),
+                              due_date=today + timedelta(days=rng.randint(0, 30))))
+    return owner
+
+
+def tree_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pets", type=int, default=50)
+    parser.add_argument("--tasks-per-pet", type=int, default=200)
+    parser.add_argument("--saves", type=int, default=20)
+    args = parser.parse_args()
+
+    owner = build_owner(args.pets, args.tasks_per_pet)
+    scheduler = Scheduler()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "owner.json")
+        directory = os.path.join(tmp, "owner")
+        save_owner_to_json(owner, filename)
+        save_owner_segments(owner, directory)
+
+        results = {"single file": 0.0, "segments": 0.0}
+        for _ in range(args.saves):
+            pet = rng.choice(owner.pets)
+            open_tasks = [task for task in pet.tasks if not task.completed]
+            scheduler.complete_task(owner, rng.choice(open_tasks))
+
+            t = time.perf_counter()
+            save_owner_to_json(owner, filename)
+            results["single file"] += time.perf_counter() - t
+            t = time.perf_counter()
+            written = save_owner_segments(owner, directory)
+            results["segments"] += time.perf_counter() - t
+            assert written == 1, "only the changed pet's segment is rewritten"
+
+        segment = tree_size(directory) / args.pets
+        written_bytes = {"single file": tree_size(filename), "segments": segment}
+        print(f"{args.pets} pets x {args.tasks_per_pet} tasks, {args.saves} single-task saves")
+        for name, seconds in results.items():
+            print(f"{name:12} {seconds / args.saves * 1e3:8.2f} ms/save  ~{written_bytes[name] / 1024:8.1f} KiB written")
+
+
+if __name__ == "__main__":
+    main()
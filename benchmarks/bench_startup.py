@@ -0,0 +1,112 @@
+"""
+Benchmark app startup: module import, owner loading and time to first render.
+
+Each measurement runs in a fresh interpreter so import and file caches inside
+the process don't carry over between runs. Time to first render is measured
+with Streamlit's AppTest when Streamlit is installed; otherwise the benchmark
+times the work app.py does before its first task row (import, load through the
+owner cache, build the first row).
+
+Usage: python benchmarks/bench_startup.py [--pets 20] [--tasks-per-pet 500] [--runs 7]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from pawpal_batch import write_synthetic_owners
+from pawpal_system import load_owner_from_json, save_owner, snapshot_path
+
+# Each snippet prints the seconds it took; {path} is the app's segmented store
+SNIPPETS = {
+    "import pawpal_system": """
+import time; t = time.perf_counter()
+import pawpal_system
+print(time.perf_counter() - t)
+""",
+    "load (eager)": """
+import time; from pawpal_system import load_owner
+t = time.perf_counter(); load_owner({path!r}); print(time.perf_counter() - t)
+""",
+    "load (lazy)": """
+import time; from pawpal_system import load_owner
+t = time.perf_counter(); load_owner({path!r}, lazy=True); print(time.perf_counter() - t)
+""",
+    "load (snapshot hit)": """
+import time; from pawpal_system import load_owner
+t = time.perf_counter(); load_owner({path!r}, snapshot=True); print(time.perf_counter() - t)
+""",
+    "first row (no streamlit)": """
+import time; t = time.perf_counter()
+from pawpal_system import owner_cache, task_view
+owner = owner_cache.get({path!r})
+pet = owner.pets[0]
+task_view(owner).row(pet.tasks[0])
+print(time.perf_counter() - t)
+""",
+}
+
+APP_TEST = """
+import os, time; os.chdir({data_dir!r})
+from streamlit.testing.v1 import AppTest
+t = time.perf_counter()
+AppTest.from_file({app!r}, default_timeout=120).run()
+print(time.perf_counter() - t)
+"""
+
+
+def time_snippet(code: str, runs: int) -> float:
+    """Median seconds reported by `code` over `runs` fresh interpreters"""
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        samples.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def streamlit_installed() -> bool:
+    return subprocess.run([sys.executable, "-c", "import streamlit.testing.v1"],
+                          capture_output=True).returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pets", type=int, default=20)
+    parser.add_argument("--tasks-per-pet", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        [generated] = write_synthetic_owners(data_dir, 1, args.pets, args.tasks_per_pet)
+        print(f"{args.pets * args.tasks_per_pet} tasks, {os.path.getsize(generated) / 1e6:.1f} MB of JSON")
+        # Stored the way app.py keeps it, so the app doesn't migrate it on the first render
+        path = os.path.join(data_dir, "pawpal_data")
+        save_owner(load_owner_from_json(generated), path)
+        os.remove(generated)
+
+        # Warm the snapshot so "snapshot hit" and the owner-cache runs reuse it
+        subprocess.run([sys.executable, "-c", f"from pawpal_system import load_owner; "
+                        f"load_owner({path!r}, snapshot=True)"], cwd=ROOT, check=True)
+        print(f"snapshot: {os.path.getsize(snapshot_path(path)) / 1e6:.1f} MB")
+
+        for label, code in SNIPPETS.items():
+            seconds = time_snippet(code.format(path=path), args.runs)
+            print(f"{label:<28} {seconds * 1000:9.1f} ms")
+
+        if streamlit_installed():
+            code = APP_TEST.format(data_dir=data_dir, app=os.path.join(ROOT, "app.py"))
+            seconds = time_snippet(code, args.runs)
+            print(f"{'first render (AppTest)':<28} {seconds * 1000:9.1f} ms")
+        else:
+            print("first render (AppTest)       skipped: streamlit is not installed")
+
+
+if __name__ == "__main__":
+    main()
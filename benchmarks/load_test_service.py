@@ -0,0 +1,110 @@
+"""
+Load-test the PawPal+ HTTP service and report p50/p99 latency per endpoint.
+
+Starts an in-process server on a temporary store unless --port is given.
+
+Usage: python benchmarks/load_test_service.py [--clients 50] [--requests 200] [--tasks 500]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pawpal_service import PawPalService, start_server
+
+ENDPOINTS = [
+    ("GET", "/owners/{owner}/plan?top_k=10"),
+    ("GET", "/owners/{owner}/conflicts"),
+    ("GET", "/owners/{owner}/tasks"),
+]
+
+
+async def _client(port, owner, n_requests, latencies):
+    """One keep-alive client cycling through the read endpoints"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i in range(n_requests):
+        method, path = ENDPOINTS[i % len(ENDPOINTS)]
+        path = path.format(owner=owner)
+        start = time.perf_counter()
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n".encode())
+        await writer.drain()
+        await reader.readline()
+        length = 0
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        latencies.setdefault(path.split("/")[3].split("?")[0], []).append(time.perf_counter() - start)
+    writer.close()
+
+
+async def _seed(port, owner, n_tasks):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i in range(n_tasks):
+        body = json.dumps({
+            "pet": f"Pet {i % 5}", "name": f"Task {i}", "priority": ["high", "medium", "low"][i % 3],
+            "duration": 5 + i % 60, "due_date": f"2026-03-{1 + i % 28:02d}",
+            "start_time": f"{8 + i % 10:02d}:{(i * 7) % 60:02d}" if i % 4 == 0 else ""
+        }).encode()
+        writer.write(f"POST /owners/{owner}/tasks HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        await reader.readline()
+        length = 0
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        await reader.readexactly(length)
+    writer.close()
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as store_dir:
+        server = None
+        port = args.port
+        if port is None:
+            server = await start_server(PawPalService(store_dir), port=0)
+            port = server.sockets[0].getsockname()[1]
+
+        owners = [f"owner{i}" for i in range(args.owners)]
+        await asyncio.gather(*(_seed(port, owner, args.tasks) for owner in owners))
+
+        latencies = {}
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _client(port, owners[c % len(owners)], args.requests, latencies) for c in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+        total = sum(len(v) for v in latencies.values())
+        print(f"{total} requests from {args.clients} clients in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+        for endpoint, values in sorted(latencies.items()):
+            print(f"{endpoint:<10} p50={_percentile(values, 50) * 1000:7.2f} ms  "
+                  f"p99={_percentile(values, 99) * 1000:7.2f} ms  mean={statistics.mean(values) * 1000:7.2f} ms")
+
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--owners", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=500, help="tasks seeded per owner")
+    parser.add_argument("--port", type=int, help="test an already running server instead")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,255 @@
+"""
+PawPal+ Command Line - Headless planning, conflict checks, imports, exports and maintenance
+
+Usage:
+    python -m pawpal plan [--data pawpal_data] [--format markdown] [--top-k 10]
+    python -m pawpal conflicts --owner-dir owners/ --workers 4
+    python -m pawpal import tasks.csv
+    python -m pawpal compact --archive-days 90
+    python -m pawpal bench --owners 2000 --profile bench.prof
+"""
+
+from __future__ import annotations
+
+from typing import IO, List
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from pawpal_reports import RENDERERS, write_report
+from pawpal_system import (
+    Owner, RetentionPolicy, export_tasks_csv, export_tasks_jsonl, import_tasks_csv, import_tasks_jsonl,
+    load_owner,
+)
+
+DEFAULT_DATA = "pawpal_data"  # the app's segmented store (see save_owner)
+
+
+def _data_path(args) -> str:
+    """--data, else the app's store, else the app's older single-file data"""
+    if args.data:
+        return args.data
+    if not os.path.exists(DEFAULT_DATA) and os.path.exists(DEFAULT_DATA + ".json"):
+        return DEFAULT_DATA + ".json"
+    return DEFAULT_DATA
+
+
+def _read(path: str, lazy: bool = False) -> Owner | None:
+    """load_owner, exiting with a message if `path` isn't owner data"""
+    try:
+        return load_owner(path, lazy=lazy)
+    except (OSError, ValueError, KeyError) as e:
+        raise SystemExit(f"pawpal: can't read owner data at {path}: {e}")
+
+
+def _load(path: str, lazy: bool = False) -> Owner:
+    owner = _read(path, lazy)
+    if owner is None:
+        raise SystemExit(f"pawpal: no owner data at {path}")
+    return owner
+
+
+def _owner_paths(args) -> List[str]:
+    from pawpal_batch import owner_files
+    try:
+        paths = owner_files(args.owner_dir)
+    except FileNotFoundError:
+        raise SystemExit(f"pawpal: {args.owner_dir} doesn't exist")
+    if not paths:
+        raise SystemExit(f"pawpal: no owners in {args.owner_dir}")
+    return paths
+
+
+def _report_options(args) -> dict:
+    options = {}
+    if args.command == "plan":
+        options.update(top_k=args.top_k, max_minutes=args.max_minutes)
+    return options
+
+
+def cmd_report(args, out: IO[str]) -> int:
+    """plan / conflicts / overdue: stream one report section per owner"""
+    sections = (args.command,)
+    if not args.owner_dir:
+        write_report(_load(_data_path(args), lazy=True), out, args.format, sections, **_report_options(args))
+        return 0
+
+    from pawpal_batch import map_owner_files, report_owner_file
+    failed = 0
+    for path, report, error in map_owner_files(report_owner_file, _owner_paths(args),
+                                               (args.format, sections, _report_options(args)),
+                                               args.workers, args.chunk_size):
+        if error:
+            print(f"pawpal: {path}: {error}", file=sys.stderr)
+            failed += 1
+        else:
+            out.write(report)
+    return 1 if failed else 0
+
+
+def cmd_import(args, out: IO[str]) -> int:
+    path = _data_path(args)
+    owner = _read(path) or Owner(args.owner_name)
+    importer = import_tasks_jsonl if args.file.endswith((".jsonl", ".ndjson")) else import_tasks_csv
+    try:
+        result = importer(owner, args.file, filename=path, strict=args.strict)
+    except ValueError as e:  # --strict rejects the whole batch
+        print(f"pawpal: nothing imported: {e}", file=sys.stderr)
+        return 1
+    for error in result.errors:
+        print(f"pawpal: {error}", file=sys.stderr)
+    out.write(f"Imported {result.added} tasks ({result.pets_created} new pets) into {path}\n")
+    return 1 if result.errors else 0
+
+
+def cmd_export(args, out: IO[str]) -> int:
+    owner = _load(_data_path(args))
+    jsonl = args.as_ == "jsonl" or (args.as_ is None and args.file.endswith((".jsonl", ".ndjson")))
+    exporter = export_tasks_jsonl if jsonl else export_tasks_csv
+    count = exporter(owner, out if args.file == "-" else args.file)
+    if args.file != "-":
+        out.write(f"Exported {count} tasks to {args.file}\n")
+    return 0
+
+
+def cmd_compact(args, out: IO[str]) -> int:
+    from pawpal_batch import compact_owner_file, map_owner_files
+    policy = RetentionPolicy(keep_last=args.keep_last, keep_days=args.keep_days)
+    paths = _owner_paths(args) if args.owner_dir else [_data_path(args)]
+    workers = args.workers if args.owner_dir else 1
+    failed = 0
+    for path, result, error in map_owner_files(compact_owner_file, paths, (policy, args.archive_days),
+                                               workers, args.chunk_size):
+        if error:
+            print(f"pawpal: {path}: {error}", file=sys.stderr)
+            failed += 1
+        else:
+            compacted, archived = result
+            out.write(f"{path}: compacted {compacted}, archived {archived}\n")
+    return 1 if failed else 0
+
+
+def cmd_bench(args, out: IO[str]) -> int:
+    """Time planning and report rendering on synthetic owners (or --owner-dir)"""
+    from pawpal_batch import map_owner_files, owner_files, plan_owners, report_owner_file, write_synthetic_owners
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.owner_dir:
+            paths = _owner_paths(args)
+        else:
+            write_synthetic_owners(tmp, args.owners, args.pets, args.tasks_per_pet)
+            paths = owner_files(tmp)
+        out.write(f"{len(paths)} owners, {args.workers or os.cpu_count() or 1} workers\n")
+
+        report = plan_owners(paths, workers=args.workers, chunk_size=args.chunk_size)
+        out.write(f"plan+conflicts {report.elapsed:8.2f}s  {report.owners_per_second:10.1f} owners/s"
+                  f"  errors={len(report.errors)}\n")
+
+        start = time.perf_counter()
+        rendered = sum(len(text or "") for _, text, _ in
+                       map_owner_files(report_owner_file, paths, (args.format,), args.workers, args.chunk_size))
+        elapsed = time.perf_counter() - start
+        out.write(f"reports        {elapsed:8.2f}s  {len(paths) / elapsed:10.1f} owners/s"
+                  f"  {rendered / 1024:.0f} KiB rendered\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data", help=f"owner JSON file or segmented store (default: {DEFAULT_DATA})")
+    common.add_argument("--output", "-o", default="-", help="write to this file instead of stdout")
+    common.add_argument("--profile", nargs="?", const="-", metavar="FILE",
+                        help="report wall time and the slowest calls on stderr; with FILE, also save "
+                             "cProfile stats there (parallel workers aren't profiled)")
+
+    multi = argparse.ArgumentParser(add_help=False)
+    multi.add_argument("--owner-dir", help="run over every owner in a multi-owner store directory")
+    multi.add_argument("--workers", type=int, help="worker processes for --owner-dir (default: CPU count)")
+    multi.add_argument("--chunk-size", type=int, default=64, help="owners per worker task")
+
+    fmt = argparse.ArgumentParser(add_help=False)
+    fmt.add_argument("--format", "-f", choices=sorted(RENDERERS), default="text")
+
+    parser = argparse.ArgumentParser(prog="pawpal", description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", parents=[common, multi, fmt], help="prioritized plan of open tasks")
+    plan.add_argument("--top-k", type=int, help="only the K most urgent tasks")
+    plan.add_argument("--max-minutes", type=int, help="stop once this much time is planned")
+    commands.add_parser("conflicts", parents=[common, multi, fmt], help="overlapping tasks")
+    commands.add_parser("overdue", parents=[common, multi, fmt], help="open tasks past their due date")
+
+    importer = commands.add_parser("import", parents=[common], help="add tasks from CSV or JSON Lines")
+    importer.add_argument("file", help="a .csv file, or .jsonl/.ndjson")
+    importer.add_argument("--strict", action="store_true", help="import nothing if any row is invalid")
+    importer.add_argument("--owner-name", default="Owner", help="name for a new owner if --data doesn't exist")
+
+    exporter = commands.add_parser("export", parents=[common], help="write every task as CSV or JSON Lines")
+    exporter.add_argument("file", help="destination (.csv, .jsonl), or - for stdout")
+    exporter.add_argument("--as", dest="as_", choices=("csv", "jsonl"), help="format (default: by extension, else CSV)")
+
+    compact = commands.add_parser("compact", parents=[common, multi], help="compact and archive old history")
+    compact.add_argument("--keep-last", type=int, default=RetentionPolicy.keep_last,
+                         help="completed occurrences kept per recurring task")
+    compact.add_argument("--keep-days", type=int, help="also keep completions from the last N days")
+    compact.add_argument("--archive-days", type=int,
+                         help="move completed tasks older than N days to the compressed archive")
+
+    bench = commands.add_parser("bench", parents=[common, multi, fmt],
+                                help="time batch planning and reports on synthetic owners")
+    bench.add_argument("--owners", type=int, default=1000)
+    bench.add_argument("--pets", type=int, default=2, help="pets per synthetic owner")
+    bench.add_argument("--tasks-per-pet", type=int, default=10)
+    return parser
+
+
+COMMANDS = {
+    "plan": cmd_report,
+    "conflicts": cmd_report,
+    "overdue": cmd_report,
+    "import": cmd_import,
+    "export": cmd_export,
+    "compact": cmd_compact,
+    "bench": cmd_bench,
+}
+
+
+def _profiled(func, args, out: IO[str]) -> int:
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        return profiler.runcall(func, args, out)
+    finally:
+        elapsed = time.perf_counter() - start
+        print(f"pawpal: {args.command} took {elapsed:.3f}s", file=sys.stderr)
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(15)
+        if args.profile != "-":
+            stats.dump_stats(args.profile)
+            print(f"pawpal: profile saved to {args.profile}", file=sys.stderr)
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    func = COMMANDS[args.command]
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        if args.profile:
+            return _profiled(func, args, out)
+        return func(args, out)
+    except BrokenPipeError:
+        # Output piped into e.g. `head` that stopped reading; exit quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
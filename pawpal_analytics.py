@@ -0,0 +1,265 @@
+"""
+PawPal+ Analytics - Adherence metrics per pet and per task from rolling aggregates
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+import bisect
+
+from pawpal_system import Owner, Task
+
+
+@dataclass
+class CareStats:
+    """Running totals for one task series (pet + task name) or one whole pet"""
+    completions: int = 0
+    on_time: int = 0
+    total_days_late: int = 0
+    total_minutes: int = 0
+    streak: int = 0  # consecutive on-time completions, ending with the latest one
+    best_streak: int = 0
+    last_done: datetime = None
+    open_due: List[int] = field(default_factory=list)  # sorted due-date ordinals of open occurrences
+    minutes_by_week: Dict[Tuple[int, int], int] = field(default_factory=dict)  # ISO (year, week) -> minutes
+
+    def record(self, duration: int, due: datetime | None, done: datetime | None) -> None:
+        """Count one completion"""
+        days_late = max(0, (done.date() - due.date()).days) if done and due else 0
+        self.completions += 1
+        self.total_minutes += duration
+        self.total_days_late += days_late
+        if days_late == 0:
+            self.on_time += 1
+            self.streak += 1
+            self.best_streak = max(self.best_streak, self.streak)
+        else:
+            self.streak = 0
+        if done is not None:
+            self.last_done = max(self.last_done or done, done)
+            week = done.isocalendar()[:2]
+            self.minutes_by_week[week] = self.minutes_by_week.get(week, 0) + duration
+
+    def unrecord(self, duration: int, due: datetime | None, done: datetime | None) -> None:
+        """
+        Take back one completion counted by record(), e.g. when a task is marked
+        not done again. The streak loses it too, but best_streak and last_done
+        aren't rewound (recompute() rebuilds them exactly).
+        """
+        days_late = max(0, (done.date() - due.date()).days) if done and due else 0
+        self.completions -= 1
+        self.total_minutes -= duration
+        self.total_days_late -= days_late
+        if days_late == 0:
+            self.on_time -= 1
+            self.streak = max(0, self.streak - 1)
+        if done is not None:
+            week = done.isocalendar()[:2]
+            self.minutes_by_week[week] = self.minutes_by_week.get(week, 0) - duration
+
+    def overdue(self, today: date) -> int:
+        """Open occurrences due before today, in O(log n)"""
+        return bisect.bisect_left(self.open_due, today.toordinal())
+
+    def completion_rate(self, today: date = None) -> float:
+        """Completions divided by completions plus occurrences currently overdue"""
+        missed = self.overdue(today or datetime.now().date())
+        total = self.completions + missed
+        return self.completions / total if total else 1.0
+
+    @property
+    def on_time_rate(self) -> float:
+        return self.on_time / self.completions if self.completions else 1.0
+
+    @property
+    def average_days_late(self) -> float:
+        return self.total_days_late / self.completions if self.completions else 0.0
+
+    def minutes_in_week(self, day: date) -> int:
+        """Minutes of care completed in the ISO week containing `day`"""
+        return self.minutes_by_week.get(day.isocalendar()[:2], 0)
+
+
+class CareAnalytics:
+    """
+    Adherence metrics kept up to date as tasks are completed
+
+    Registered as an owner listener, so every completion (Scheduler.complete_task,
+    Owner.mark_complete, ...) updates per-series and per-pet CareStats in O(1),
+    and dashboard queries read those totals instead of rescanning Pet.tasks.
+    Completed tasks later removed by compact_history keep their contribution,
+    and totals already rolled into pet.history are included at start-up. Each
+    completion is counted once by task id, so moving a completed task to
+    another pet (remove + add) doesn't count it again, and marking it not
+    done takes it back.
+    """
+
+    def __init__(self, owner: Owner):
+        self.owner = owner
+        self._series: Dict[Tuple[str, str], CareStats] = {}  # (pet name, task name) -> stats
+        self._pets: Dict[str, CareStats] = {}
+        self._seen: Dict[str, tuple] = {}  # task id -> (pet name, task name, completed, due ordinal) as last seen
+        # task id -> (pet name, task name, duration, due, done) as counted; kept after removal
+        self._counted: Dict[str, tuple] = {}
+        self._seed_history()
+        owner.add_listener(self)
+
+    # Queries
+    def series(self, pet_name: str, task_name: str) -> CareStats:
+        """Stats for one task of one pet (empty stats if it was never seen)"""
+        return self._series.get((pet_name, task_name)) or CareStats()
+
+    def pet(self, pet_name: str) -> CareStats:
+        """Stats across every task of one pet"""
+        return self._pets.get(pet_name) or CareStats()
+
+    def completion_rate(self, pet_name: str, task_name: str = None, today: date = None) -> float:
+        stats = self.series(pet_name, task_name) if task_name else self.pet(pet_name)
+        return stats.completion_rate(today)
+
+    def average_days_late(self, pet_name: str, task_name: str = None) -> float:
+        stats = self.series(pet_name, task_name) if task_name else self.pet(pet_name)
+        return stats.average_days_late
+
+    def streak(self, pet_name: str, task_name: str) -> int:
+        return self.series(pet_name, task_name).streak
+
+    def minutes_in_week(self, pet_name: str, day: date = None) -> int:
+        return self.pet(pet_name).minutes_in_week(day or datetime.now().date())
+
+    # Owner listener hooks
+    def task_added(self, task: Task) -> None:
+        pet = self.owner.pet_of(task)
+        pet_name = pet.name if pet else None
+        due = task.due_day
+        if task.completed:
+            if task.id not in self._counted:
+                self._record(pet_name, task)
+        elif due is not None:
+            self._add_open(pet_name, task.name, due)
+        self._seen[task.id] = (pet_name, task.name, task.completed, due)
+
+    def task_changed(self, task: Task) -> None:
+        previous = self._seen.get(task.id)
+        if previous is None:
+            self.task_added(task)
+            return
+        pet_name, name, was_completed, due = previous
+        if not was_completed and due is not None:
+            self._remove_open(pet_name, name, due)
+        if task.completed and not was_completed and task.id not in self._counted:
+            self._record(pet_name, task)
+        elif was_completed and not task.completed:
+            self._unrecord(task.id)
+        new_due = task.due_day
+        if not task.completed and new_due is not None:
+            self._add_open(pet_name, task.name, new_due)
+        self._seen[task.id] = (pet_name, task.name, task.completed, new_due)
+
+    def task_removed(self, task: Task) -> None:
+        previous = self._seen.pop(task.id, None)
+        if previous is None:
+            return
+        pet_name, name, was_completed, due = previous
+        # Completed work stays counted (e.g. after compaction); open occurrences are dropped
+        if not was_completed and due is not None:
+            self._remove_open(pet_name, name, due)
+
+    def clear(self) -> None:
+        self._series.clear()
+        self._pets.clear()
+        self._seen.clear()
+        self._counted.clear()
+        self._seed_history()
+
+    # Batch recompute
+    def recompute(self, rows: Iterable[tuple] = None) -> None:
+        """
+        Rebuild every aggregate in one batch pass
+
+        Args:
+            rows: Completed-task rows (pet name, task name, duration, due date, completed at),
+                e.g. streamed from an archive (see pawpal_archive.recompute_analytics).
+                Defaults to completed_rows().
+        """
+        self._series.clear()
+        self._pets.clear()
+        self._seen.clear()
+        self._counted.clear()
+        self._seed_history()
+
+        if rows is None:
+            rows = self.completed_rows()
+        # Column-wise: order every completion by time once, then fold in that order
+        rows = sorted(rows, key=lambda r: (r[4] or datetime.min, r[3] or datetime.min))
+        for pet_name, name, duration, due, done in rows:
+            self._series_stats(pet_name, name).record(duration, due, done)
+            self._pet_stats(pet_name).record(duration, due, done)
+
+        for pet in self.owner.pets:
+            for task in pet.tasks:
+                due = task.due_day
+                if task.completed:
+                    self._counted[task.id] = (pet.name, task.name, task.duration, task.due_date, task.last_completed)
+                elif due is not None:
+                    self._add_open(pet.name, task.name, due)
+                self._seen[task.id] = (pet.name, task.name, task.completed, due)
+
+    def completed_rows(self) -> Iterator[tuple]:
+        """Rows for recompute() from the owner's completed tasks"""
+        return ((pet.name, t.name, t.duration, t.due_date, t.last_completed)
+                for pet in self.owner.pets for t in pet.tasks if t.completed)
+
+    # Helpers
+    def _series_stats(self, pet_name: str, task_name: str) -> CareStats:
+        return self._series.setdefault((pet_name, task_name), CareStats())
+
+    def _pet_stats(self, pet_name: str) -> CareStats:
+        return self._pets.setdefault(pet_name, CareStats())
+
+    def _record(self, pet_name: str, task: Task) -> None:
+        for stats in (self._series_stats(pet_name, task.name), self._pet_stats(pet_name)):
+            stats.record(task.duration, task.due_date, task.last_completed)
+        self._counted[task.id] = (pet_name, task.name, task.duration, task.due_date, task.last_completed)
+
+    def _unrecord(self, task_id: str) -> None:
+        counted = self._counted.pop(task_id, None)
+        if counted is None:
+            return
+        pet_name, name, duration, due, done = counted
+        for stats in (self._series_stats(pet_name, name), self._pet_stats(pet_name)):
+            stats.unrecord(duration, due, done)
+
+    def _add_open(self, pet_name: str, task_name: str, due: int) -> None:
+        for stats in (self._series_stats(pet_name, task_name), self._pet_stats(pet_name)):
+            bisect.insort(stats.open_due, due)
+
+    def _remove_open(self, pet_name: str, task_name: str, due: int) -> None:
+        for stats in (self._series_stats(pet_name, task_name), self._pet_stats(pet_name)):
+            i = bisect.bisect_left(stats.open_due, due)
+            if i < len(stats.open_due) and stats.open_due[i] == due:
+                del stats.open_due[i]
+
+    def _seed_history(self) -> None:
+        """Start from the aggregates compact_history already rolled up"""
+        for pet in self.owner.pets:
+            for history in pet.history.values():
+                for stats in (self._series_stats(pet.name, history.name), self._pet_stats(pet.name)):
+                    stats.completions += history.count
+                    stats.on_time += history.on_time
+                    stats.total_days_late += history.total_days_late
+                    stats.total_minutes += history.total_minutes
+                    stats.best_streak = max(stats.best_streak, history.best_streak)
+                    if history.last_done:
+                        stats.last_done = max(stats.last_done or history.last_done, history.last_done)
+                self._series_stats(pet.name, history.name).streak = history.streak
+
+
+def care_analytics(owner: Owner) -> CareAnalytics:
+    """Get the owner's analytics, building and registering them on first use"""
+    analytics = getattr(owner, "_analytics", None)
+    if analytics is None:
+        analytics = owner._analytics = CareAnalytics(owner)
+    return analytics
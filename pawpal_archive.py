@@ -0,0 +1,271 @@
+"""
+PawPal+ Archive - Compressed, columnar, append-only cold storage for old completed tasks
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Tuple
+import importlib
+import json
+import os
+import struct
+import sys
+
+from pawpal_analytics import CareAnalytics, care_analytics
+from pawpal_system import (
+    Owner, Task, TaskTemplate, dict_to_template, is_segmented_store, new_task_id, template_to_dict,
+)
+
+# An archive is a directory of segment files. Each segment is MAGIC followed by
+# blocks of up to BLOCK_ROWS tasks; a block is BLOCK_HEADER, a small uncompressed
+# JSON header (row count, codec, the block's pet and template tables, completion
+# time range) and the compressed body. The body holds four int64 columns (pet
+# index, template index, due and completion time in microseconds since
+# datetime.min, NO_TIME for none) followed by the newline-joined task ids.
+# Headers let queries skip blocks without decompressing them.
+MAGIC = b"PAWARC1\n"
+BLOCK_HEADER = struct.Struct("<II")  # header length, compressed body length
+BLOCK_ROWS = 4096
+CODECS = ("lzma", "zlib")  # standard-library modules with compress()/decompress()
+NO_TIME = -1
+COLUMNS = 4
+SEGMENT_EXTENSION = ".pza"
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def archive_path(store: str) -> str:
+    """Where a data store keeps its archive: archive/ inside a segmented store, else <name>.archive/"""
+    if is_segmented_store(store):
+        return os.path.join(store, "archive")
+    return os.path.splitext(store)[0] + ".archive"
+
+
+def _to_micros(moment: datetime | None) -> int:
+    return NO_TIME if moment is None else (moment - datetime.min) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime | None:
+    return None if value == NO_TIME else datetime.min + timedelta(microseconds=value)
+
+
+def _encode_block(rows: List[Tuple[str, Task]], codec: str) -> bytes:
+    pets: Dict[str, int] = {}
+    templates: Dict[TaskTemplate, int] = {}
+    columns = [array("q") for _ in range(COLUMNS)]
+    pet_column, template_column, due_column, done_column = columns
+    for pet_name, task in rows:
+        pet_column.append(pets.setdefault(pet_name, len(pets)))
+        template_column.append(templates.setdefault(task.template, len(templates)))
+        due_column.append(_to_micros(task.due_date))
+        done_column.append(_to_micros(task.last_completed))
+    if sys.byteorder == "big":
+        for column in columns:
+            column.byteswap()
+    body = b"".join(column.tobytes() for column in columns) + "\n".join(task.id for _, task in rows).encode("utf-8")
+
+    done = [task.last_completed for _, task in rows if task.last_completed]
+    header = json.dumps({
+        "rows": len(rows),
+        "codec": codec,
+        "pets": list(pets),
+        "templates": [template_to_dict(template) for template in templates],
+        "first_done": min(done).isoformat() if done else None,
+        "last_done": max(done).isoformat() if done else None,
+    }).encode("utf-8")
+    compressed = importlib.import_module(codec).compress(body)
+    return BLOCK_HEADER.pack(len(header), len(compressed)) + header + compressed
+
+
+def _decode_block(header: dict, compressed: bytes) -> Tuple[List[array], List[str]]:
+    body = importlib.import_module(header["codec"]).decompress(compressed)
+    rows = header["rows"]
+    width = rows * 8
+    columns = []
+    for i in range(COLUMNS):
+        column = array("q")
+        column.frombytes(body[i * width:(i + 1) * width])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+    ids = body[COLUMNS * width:].decode("utf-8").split("\n") if rows else []
+    return columns, ids
+
+
+def segment_files(directory: str) -> List[str]:
+    """An archive's segment files, oldest first"""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in sorted(names) if name.endswith(SEGMENT_EXTENSION)]
+
+
+def write_segment(directory: str, rows: List[Tuple[str, Task]], codec: str = "lzma",
+                  block_rows: int = BLOCK_ROWS) -> str | None:
+    """
+    Append one segment holding (pet name, task) rows, sorted by completion time
+
+    The segment is written to a temporary file and renamed into place, so
+    readers never see a partial segment. Existing segments are never modified.
+
+    Returns:
+        The new segment's path, or None if there were no rows
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r} (expected one of {', '.join(CODECS)})")
+    if not rows:
+        return None
+    rows = sorted(rows, key=lambda row: (row[1].last_completed or datetime.min, row[1].due_date or datetime.min))
+    os.makedirs(directory, exist_ok=True)
+    # Names sort by creation time; the random suffix keeps concurrent writers apart
+    name = f"{datetime.now():%Y%m%dT%H%M%S%f}-{new_task_id()[:8]}{SEGMENT_EXTENSION}"
+    path = os.path.join(directory, name)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        for start in range(0, len(rows), block_rows):
+            f.write(_encode_block(rows[start:start + block_rows], codec))
+    os.replace(tmp, path)
+    return path
+
+
+def _blocks(filename: str, wanted: Callable[[dict], bool]) -> Iterator[Tuple[dict, List[array], List[str]]]:
+    """Decompress one block at a time, skipping blocks whose header `wanted` rejects"""
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} is not a PawPal+ archive segment")
+        while True:
+            prefix = f.read(BLOCK_HEADER.size)
+            if not prefix:
+                return
+            if len(prefix) < BLOCK_HEADER.size:
+                raise ValueError(f"{filename} is truncated")
+            header_length, body_length = BLOCK_HEADER.unpack(prefix)
+            header = json.loads(f.read(header_length))
+            if not wanted(header):
+                f.seek(body_length, os.SEEK_CUR)
+                continue
+            compressed = f.read(body_length)
+            if len(compressed) < body_length:
+                raise ValueError(f"{filename} is truncated")
+            columns, ids = _decode_block(header, compressed)
+            yield header, columns, ids
+
+
+def _block_filter(pet_name: str | None, task_name: str | None, since: datetime | None,
+                  until: datetime | None) -> Callable[[dict], bool]:
+    def wanted(header: dict) -> bool:
+        if pet_name is not None and pet_name not in header["pets"]:
+            return False
+        if task_name is not None and all(t["name"] != task_name for t in header["templates"]):
+            return False
+        if since is not None and header["last_done"] and datetime.fromisoformat(header["last_done"]) < since:
+            return False
+        if until is not None and header["first_done"] and datetime.fromisoformat(header["first_done"]) >= until:
+            return False
+        return True
+    return wanted
+
+
+def iter_archive(directory: str, pet_name: str = None, task_name: str = None,
+                 since: datetime = None, until: datetime = None) -> Iterator[Tuple[str, Task]]:
+    """
+    Stream archived tasks as (pet name, Task), oldest segment first
+
+    Only one block is decompressed at a time, and blocks that can't match the
+    filters (by pet, task name or completion time in [since, until)) aren't
+    decompressed at all. Occurrences of the same task share one interned
+    TaskTemplate, as they do when loaded from the live file.
+    """
+    wanted = _block_filter(pet_name, task_name, since, until)
+    lower = NO_TIME if since is None else _to_micros(since)
+    upper = None if until is None else _to_micros(until)
+    for filename in segment_files(directory):
+        for header, (pets, templates, due, done), ids in _blocks(filename, wanted):
+            pet_names = header["pets"]
+            template_table = [dict_to_template(t) for t in header["templates"]]
+            for i, task_id in enumerate(ids):
+                name = pet_names[pets[i]]
+                template = template_table[templates[i]]
+                if pet_name is not None and name != pet_name:
+                    continue
+                if task_name is not None and template.name != task_name:
+                    continue
+                if done[i] < lower or (upper is not None and done[i] >= upper):
+                    continue
+                yield name, Task(template=template, due_date=_from_micros(due[i]), completed=True,
+                                 last_completed=_from_micros(done[i]), id=task_id)
+
+
+def iter_rows(directory: str, pet_name: str = None) -> Iterator[tuple]:
+    """
+    Stream archived completions as CareAnalytics rows (pet name, task name,
+    duration, due date, completed at), without building Task objects
+    """
+    wanted = _block_filter(pet_name, None, None, None)
+    for filename in segment_files(directory):
+        for header, (pets, templates, due, done), _ in _blocks(filename, wanted):
+            pet_names = header["pets"]
+            template_table = [(t["name"], t["duration"]) for t in header["templates"]]
+            for i in range(header["rows"]):
+                name = pet_names[pets[i]]
+                if pet_name is not None and name != pet_name:
+                    continue
+                task_name, duration = template_table[templates[i]]
+                yield name, task_name, duration, _from_micros(due[i]), _from_micros(done[i])
+
+
+def archive_completed(owner: Owner, directory: str, older_than_days: int = 90, now: datetime = None,
+                      codec: str = "lzma") -> int:
+    """
+    Move completed tasks finished more than `older_than_days` ago into a new archive segment
+
+    The segment is written before the tasks are removed from their pets (and
+    the pets marked dirty), so saving the owner afterwards leaves only active
+    and recent tasks in the live file. A crash in between can duplicate tasks
+    in the archive and the live file, but never lose them. Tasks completed
+    with no completion or due date are archived too.
+
+    Args:
+        owner: The pet owner
+        directory: Archive directory (see archive_path)
+        older_than_days: Keep tasks completed within this many days
+        now: Reference time (defaults to now)
+        codec: "lzma" (smaller) or "zlib" (faster)
+
+    Returns:
+        Number of tasks archived
+    """
+    cutoff = (now or datetime.now()) - timedelta(days=older_than_days)
+
+    def is_old(task: Task) -> bool:
+        finished = task.last_completed or task.due_date
+        return task.completed and (finished is None or finished < cutoff)
+
+    rows = []
+    old_by_pet = []
+    for pet in owner.pets:
+        old = [task for task in pet.tasks if is_old(task)]
+        if old:
+            old_by_pet.append((pet, old))
+            rows.extend((pet.name, task) for task in old)
+    if not rows:
+        return 0
+    write_segment(directory, rows, codec)
+    for pet, old in old_by_pet:
+        pet.remove_tasks(old)
+    return len(rows)
+
+
+def recompute_analytics(owner: Owner, directory: str) -> CareAnalytics:
+    """
+    Rebuild the owner's CareAnalytics from the archive plus the live completed
+    tasks, e.g. after a restart (archived tasks are no longer in the live file)
+    """
+    analytics = care_analytics(owner)
+    analytics.recompute(chain(iter_rows(directory), analytics.completed_rows()))
+    return analytics
@@ -0,0 +1,242 @@
+"""
+PawPal+ Batch Planning - Nightly plans and conflict checks across many owners
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, time
+from typing import Callable, Iterator, List
+import io
+import os
+import random
+
+from pawpal_archive import archive_completed, archive_path
+from pawpal_reports import SECTIONS, write_report
+from pawpal_system import (
+    MANIFEST_FILE, Owner, Pet, Task, Priority, Recurrence, RetentionPolicy, Scheduler,
+    compact_history, load_owner, save_owner, save_owner_to_json
+)
+
+
+@dataclass
+class OwnerDigest:
+    """Compact planning result for one owner, cheap to send back from a worker"""
+    path: str
+    owner: str
+    open_tasks: int
+    planned_minutes: int
+    overdue: int
+    top_tasks: List[str]
+    conflicts: List[str]
+
+
+@dataclass
+class BatchReport:
+    """Digests for a batch run plus throughput figures"""
+    digests: List[OwnerDigest] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    workers: int = 1
+    elapsed: float = 0.0  # seconds
+
+    @property
+    def owners_per_second(self) -> float:
+        return len(self.digests) / self.elapsed if self.elapsed else 0.0
+
+
+def owner_files(owner_dir: str) -> List[str]:
+    """List the owners (JSON files and segmented stores) in a multi-owner store directory, sorted by name"""
+    return sorted(
+        os.path.join(owner_dir, name)
+        for name in os.listdir(owner_dir)
+        if name.endswith(".json") or os.path.isfile(os.path.join(owner_dir, name, MANIFEST_FILE))
+    )
+
+
+def plan_owner_file(path: str, top_n: int = 5) -> OwnerDigest | None:
+    """
+    Load one owner file and build its digest
+
+    Args:
+        path: Owner JSON file or segmented store
+        top_n: How many of the most urgent open tasks to name in the digest
+
+    Returns:
+        The OwnerDigest, or None if the file doesn't exist
+    """
+    owner = load_owner(path)
+    if owner is None:
+        return None
+
+    scheduler = Scheduler()
+    top_tasks = [task.name for task in scheduler.next_tasks(owner, top_n)]
+    open_tasks = [task for pet in owner.pets for task in pet.tasks if not task.completed]
+    return OwnerDigest(
+        path=path,
+        owner=owner.name,
+        open_tasks=len(open_tasks),
+        planned_minutes=sum(task.duration for task in open_tasks),
+        overdue=len(owner.due_index.overdue()),
+        top_tasks=top_tasks,
+        conflicts=scheduler.detect_conflicts(owner)
+    )
+
+
+def _describe(error: Exception) -> str:
+    """An error message for one owner, naming the exception type unless it's a usual I/O or format error"""
+    if isinstance(error, (OSError, ValueError)):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def _plan_chunk(paths: List[str], top_n: int) -> tuple:
+    """Worker entry point: each worker loads its own owners, so only paths and digests cross processes"""
+    digests = []
+    errors = []
+    for path in paths:
+        try:
+            digest = plan_owner_file(path, top_n)
+        except Exception as e:  # one corrupt owner is reported, not allowed to abort the batch
+            errors.append(f"{path}: {_describe(e)}")
+            continue
+        if digest is None:
+            errors.append(f"{path}: not found")
+        else:
+            digests.append(digest)
+    return digests, errors
+
+
+def plan_owners(paths: List[str], workers: int = None, chunk_size: int = 64, top_n: int = 5) -> BatchReport:
+    """
+    Plan and conflict-check many owners, sharded across a process pool
+
+    Args:
+        paths: Owner JSON files (see owner_files)
+        workers: Number of worker processes; defaults to the CPU count. 1 runs in-process.
+        chunk_size: Owners per task sent to a worker
+        top_n: How many of the most urgent open tasks each digest names
+
+    Returns:
+        BatchReport with digests in the same order as paths
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    report = BatchReport(workers=workers)
+
+    start = datetime.now()
+    if workers == 1:
+        results = (_plan_chunk(chunk, top_n) for chunk in chunks)
+        for digests, errors in results:
+            report.digests.extend(digests)
+            report.errors.extend(errors)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for digests, errors in pool.map(_plan_chunk, chunks, [top_n] * len(chunks)):
+                report.digests.extend(digests)
+                report.errors.extend(errors)
+    report.elapsed = (datetime.now() - start).total_seconds()
+    return report
+
+
+def report_owner_file(path: str, fmt: str = "text", sections: tuple = SECTIONS,
+                      options: dict = None) -> str | None:
+    """Render one owner's report (see pawpal_reports.write_report); None if the file doesn't exist"""
+    owner = load_owner(path, lazy=True)
+    if owner is None:
+        return None
+    out = io.StringIO()
+    write_report(owner, out, fmt, sections, **(options or {}))
+    return out.getvalue()
+
+
+def compact_owner_file(path: str, policy: RetentionPolicy = None, archive_days: int = None) -> tuple | None:
+    """
+    Compact one owner's recurring history and, with `archive_days`, archive completed
+    tasks older than that (see pawpal_archive). Saves only if something changed.
+
+    Returns:
+        (tasks compacted, tasks archived), or None if the file doesn't exist
+    """
+    owner = load_owner(path)
+    if owner is None:
+        return None
+    compacted = compact_history(owner, policy)
+    archived = archive_completed(owner, archive_path(path), archive_days) if archive_days is not None else 0
+    if compacted or archived:
+        save_owner(owner, path)
+    return compacted, archived
+
+
+def _map_chunk(func: Callable, paths: List[str], args: tuple) -> list:
+    """Worker entry point for map_owner_files"""
+    results = []
+    for path in paths:
+        try:
+            result = func(path, *args)
+        except Exception as e:  # one corrupt owner is reported, not allowed to abort the batch
+            results.append((path, None, _describe(e)))
+            continue
+        results.append((path, result, None if result is not None else "not found"))
+    return results
+
+
+def map_owner_files(func: Callable, paths: List[str], args: tuple = (), workers: int = None,
+                    chunk_size: int = 64) -> Iterator[tuple]:
+    """
+    Run func(path, *args) for many owners, sharded across a process pool
+
+    `func` must be a module-level function (it is pickled by name), such as
+    plan_owner_file, report_owner_file or compact_owner_file.
+
+    Yields:
+        (path, result, error) in the same order as paths, as soon as each chunk
+        is done; error is None on success and result is None on failure
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    if workers == 1:
+        for chunk in chunks:
+            yield from _map_chunk(func, chunk, args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_map_chunk, [func] * len(chunks), chunks, [args] * len(chunks)):
+            yield from results
+
+
+def write_synthetic_owners(owner_dir: str, count: int, pets_per_owner: int = 2,
+                           tasks_per_pet: int = 10, seed: int = 0) -> List[str]:
+    """
+    Write `count` randomly generated owner files for benchmarks and tests
+
+    Returns:
+        The paths written
+    """
+    rng = random.Random(seed)
+    os.makedirs(owner_dir, exist_ok=True)
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    priorities = list(Priority)
+    recurrences = list(Recurrence)
+    paths = []
+
+    for i in range(count):
+        owner = Owner(f"Owner {i}")
+        for p in range(pets_per_owner):
+            pet = Pet(f"Pet {p}", rng.choice(["Dog", "Cat", "Bird", "Other"]), rng.randint(0, 15),
+                      round(rng.uniform(1, 80), 1), [])
+            for t in range(tasks_per_pet):
+                pet.tasks.append(Task(
+                    name=f"Task {t}",
+                    priority=rng.choice(priorities),
+                    duration=rng.choice([5, 10, 15, 30, 45, 60]),
+                    due_date=today + timedelta(days=rng.randint(-3, 14)),
+                    start_time=time(rng.randint(7, 19), rng.choice([0, 30])) if rng.random() < 0.3 else None,
+                    completed=rng.random() < 0.2,
+                    recurrence=rng.choice(recurrences)
+                ))
+            owner.add_pet(pet)
+
+        path = os.path.join(owner_dir, f"owner_{i:06d}.json")
+        save_owner_to_json(owner, path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,211 @@
+"""
+PawPal+ Calendar Export - Streaming iCalendar (RFC 5545) feeds with one VEVENT per task
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import IO, Iterator
+
+from pawpal_system import Owner, Priority, Recurrence, Task
+
+# One recurring task becomes one VEVENT with a native RRULE instead of one event per occurrence.
+# Monthly tasks repeat every 30 days in PawPal (see RECURRENCE_INTERVAL_DAYS), not on a day of the month.
+RRULES = {
+    Recurrence.DAILY: "FREQ=DAILY",
+    Recurrence.WEEKLY: "FREQ=WEEKLY",
+    Recurrence.BIWEEKLY: "FREQ=WEEKLY;INTERVAL=2",
+    Recurrence.MONTHLY: "FREQ=DAILY;INTERVAL=30",
+}
+
+# iCalendar priorities run 1 (highest) to 9 (lowest)
+ICS_PRIORITY = {Priority.HIGH: 1, Priority.MEDIUM: 5, Priority.LOW: 9}
+
+PRODID = "-//PawPal+//Pet Care Scheduler//EN"
+
+
+class TaskChangeLog:
+    """
+    Owner listener that stamps each task with the owner-wide version of its last change
+
+    Every add, edit or removal bumps `version`. Tasks are kept in change order,
+    so changed_since() walks back from the newest change and stops at the first
+    one that's already been seen: an incremental export costs O(changes), not
+    O(tasks). Removed tasks are remembered as tombstones so exports can cancel them,
+    along with the last time each task was scheduled at, since a cancellation must
+    still carry a DTSTART after the task loses its due date.
+    Versions count from when the log was attached and are not persisted.
+    """
+
+    def __init__(self, owner: Owner):
+        self.version = 0
+        self._changes: OrderedDict[str, tuple] = OrderedDict()  # task id -> (version, task, removed), oldest first
+        self._starts: dict[str, tuple] = {}  # task id -> (due_date, start_time, duration) while it had a due date
+        for pet in owner.pets:
+            for task in pet.tasks:
+                self._remember_start(task)
+        owner.add_listener(self)
+
+    def _remember_start(self, task: Task) -> None:
+        if task.due_date is not None:
+            self._starts[task.id] = (task.due_date, task.start_time, task.duration)
+
+    def _record(self, task: Task, removed: bool) -> None:
+        self.version += 1
+        self._changes[task.id] = (self.version, task, removed)
+        self._changes.move_to_end(task.id)
+        self._remember_start(task)
+
+    def changed_since(self, version: int) -> Iterator[tuple]:
+        """Yield (task, removed) for every task changed after `version`, newest first"""
+        for changed, task, removed in reversed(self._changes.values()):
+            if changed <= version:
+                return
+            yield task, removed
+
+    def revision(self, task: Task) -> int:
+        """Version of the task's last change (0 if never seen)"""
+        return self._changes.get(task.id, (0,))[0]
+
+    def last_start(self, task: Task) -> tuple | None:
+        """(due_date, start_time, duration) the task is or was last scheduled at, or None if it never had a due date"""
+        if task.due_date is not None:
+            return task.due_date, task.start_time, task.duration
+        return self._starts.get(task.id)
+
+    # Owner listener hooks
+    def task_added(self, task: Task) -> None:
+        self._record(task, removed=False)
+
+    def task_changed(self, task: Task) -> None:
+        self._record(task, removed=False)
+
+    def task_removed(self, task: Task) -> None:
+        self._record(task, removed=True)
+
+    def clear(self) -> None:
+        # Owner.reindex() replays every task afterwards, which re-stamps them;
+        # tombstones for removed tasks are kept
+        pass
+
+
+def change_log(owner: Owner) -> TaskChangeLog:
+    """Get the owner's change log, building and registering it on first use"""
+    log = getattr(owner, "_change_log", None)
+    if log is None:
+        log = owner._change_log = TaskChangeLog(owner)
+    return log
+
+
+def rrule(task: Task) -> str | None:
+    """The RRULE value for a recurring task, repeating every Task.interval_days like the scheduler"""
+    if task.recurrence == Recurrence.ONCE:
+        return None
+    if task.recurrence_days:
+        return f"FREQ=DAILY;INTERVAL={task.recurrence_days}"
+    return RRULES[task.recurrence]
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value"""
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold(line: str) -> str:
+    """Fold a content line into CRLF-terminated chunks of at most 75 octets"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    chunks = []
+    start, limit = 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:  # don't split a UTF-8 sequence
+            end -= 1
+        chunks.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(chunks) + "\r\n"
+
+
+def _event_lines(task: Task, pet_name: str | None, stamp: str, sequence: int,
+                 cancelled: bool, start: tuple) -> Iterator[str]:
+    yield "BEGIN:VEVENT"
+    yield f"UID:{task.id}@pawpal"
+    yield f"DTSTAMP:{stamp}"
+    yield f"SEQUENCE:{sequence}"
+    # Without a METHOD every VEVENT needs a DTSTART, cancellations included
+    due_date, start_time, duration = start
+    if start_time is not None:
+        # Floating local time: PawPal has no time zones
+        begin = datetime.combine(due_date.date(), start_time)
+        yield f"DTSTART:{begin:%Y%m%dT%H%M%S}"
+        yield f"DTEND:{begin + timedelta(minutes=duration):%Y%m%dT%H%M%S}"
+    else:
+        # An all-day event spans the whole day, whatever the task's duration
+        yield f"DTSTART;VALUE=DATE:{due_date:%Y%m%d}"
+        yield "DURATION:P1D"
+    summary = f"{task.name} ({pet_name})" if pet_name else task.name
+    yield f"SUMMARY:{escape_text(summary)}"
+    if task.description:
+        yield f"DESCRIPTION:{escape_text(task.description)}"
+    yield f"PRIORITY:{ICS_PRIORITY[task.priority]}"
+    if cancelled:
+        yield "STATUS:CANCELLED"
+    else:
+        rule = rrule(task)
+        if rule:
+            yield f"RRULE:{rule}"
+    yield "END:VEVENT"
+
+
+def export_ics(owner: Owner, stream: IO[str], since: int = None, calendar_name: str = None) -> int:
+    """
+    Stream the owner's tasks to an iCalendar feed, one VEVENT per task
+
+    A full export (since=None) includes every open task with a due date.
+    An incremental export includes only tasks changed after version `since`:
+    open dated tasks are re-sent with a higher SEQUENCE, and tasks that were
+    completed, removed or lost their due date are sent as STATUS:CANCELLED so
+    calendar apps drop them, dated at the task's last known due date. Tasks
+    that never had a due date were never exported and are skipped. Completing a recurring task cancels its series;
+    the next occurrence (a new task) starts a new one.
+
+    Args:
+        owner: The pet owner
+        stream: Anything with a write(str) method; lines end with CRLF
+        since: Version returned by a previous export_ics call, or None for everything
+        calendar_name: X-WR-CALNAME shown by calendar apps (defaults to the owner's name)
+
+    Returns:
+        The current version, to pass as `since` next time
+    """
+    log = change_log(owner)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+              f"X-WR-CALNAME:{escape_text(calendar_name or f'PawPal+ - {owner.name}')}"]
+    stream.write("".join(fold(line) for line in header))
+
+    if since is None:
+        changes = ((task, False) for pet in owner.pets for task in pet.tasks)
+    else:
+        changes = log.changed_since(since)
+    for task, removed in changes:
+        pet = None if removed else owner.pet_of(task)
+        cancelled = removed or task.completed or task.due_date is None
+        start = log.last_start(task)
+        if start is None or (cancelled and since is None):
+            continue
+        lines = _event_lines(task, pet.name if pet else None, stamp, log.revision(task), cancelled, start)
+        stream.write("".join(fold(line) for line in lines))
+
+    stream.write(fold("END:VCALENDAR"))
+    return log.version
+
+
+def export_ics_file(owner: Owner, filename: str, since: int = None) -> int:
+    """Write export_ics() output to a file; returns the version to pass as `since` next time"""
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        return export_ics(owner, f, since)
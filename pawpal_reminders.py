@@ -0,0 +1,282 @@
+"""
+PawPal+ Reminders - Due and start-time notifications from a hierarchical timer wheel
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List
+import threading
+
+from pawpal_system import Owner, Task
+
+# The wheel has LEVELS levels of SLOTS slots. Level k slots are SLOTS**k minutes wide,
+# so four levels of 64 cover 64**4 minutes (about 32 years) before falling back to overflow.
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+LEVELS = 4
+
+
+def to_minute(moment: datetime) -> int:
+    """Minutes since 0001-01-01, the same day * 1440 + minute encoding as Task.start_minute"""
+    return moment.toordinal() * 1440 + moment.hour * 60 + moment.minute
+
+
+def from_minute(minute: int) -> datetime:
+    day, minute = divmod(minute, 1440)
+    return datetime.fromordinal(day) + timedelta(minutes=minute)
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel keyed by integer minutes
+
+    A timer is filed at the level of the most significant base-64 digit where its
+    expiry differs from the current minute, in the slot of that digit. Insert and
+    cancel are O(1) dict operations. advance() steps the clock a minute at a
+    time: a level-0 slot holds only timers for the current minute, and whenever a
+    higher digit rolls over, that level's slot is re-filed one level down (each
+    timer cascades at most LEVELS - 1 times). Minutes with nothing filed anywhere
+    are skipped in one jump.
+    """
+
+    def __init__(self, now: int):
+        self.now = now
+        self._levels = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self._overflow: Dict[object, list] = {}  # timers beyond the top level
+        self._slot_of: Dict[object, dict] = {}  # key -> the dict its entry lives in
+        self._expired: List[tuple] = []  # (key, value) of timers scheduled in the past
+
+    def __len__(self) -> int:
+        return len(self._slot_of) + len(self._expired)
+
+    def schedule(self, key, minute: int, value=None) -> None:
+        """Add (or move) a timer; timers at or before the current minute fire on the next advance()"""
+        self.cancel(key)
+        if minute <= self.now:
+            self._expired.append((key, value))
+            return
+        self._file([minute, key, value])
+
+    def cancel(self, key) -> bool:
+        """Remove a timer, returning whether it was pending"""
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            del slot[key]
+            return True
+        for i, (expired_key, _) in enumerate(self._expired):
+            if expired_key == key:
+                del self._expired[i]
+                return True
+        return False
+
+    def clear(self) -> None:
+        for level in self._levels:
+            for slot in level:
+                slot.clear()
+        self._overflow.clear()
+        self._slot_of.clear()
+        self._expired.clear()
+
+    def _file(self, entry: list) -> None:
+        minute = entry[0]
+        differing = minute ^ self.now
+        level = (differing.bit_length() - 1) // SLOT_BITS if differing else 0
+        if level >= LEVELS:
+            slot = self._overflow
+        else:
+            slot = self._levels[level][(minute >> (level * SLOT_BITS)) & (SLOTS - 1)]
+        slot[entry[1]] = entry
+        self._slot_of[entry[1]] = slot
+
+    def _cascade(self, slot: dict) -> None:
+        entries = list(slot.values())
+        slot.clear()
+        for entry in entries:
+            self._file(entry)
+
+    def advance(self, now: int) -> List[tuple]:
+        """Move the clock to `now`, returning (key, value) for every timer that came due, in time order"""
+        fired = self._expired
+        self._expired = []
+        while self.now < now:
+            if not self._slot_of:
+                self.now = now
+                break
+            self.now += 1
+            # Re-file the slot of every digit that just rolled over, highest first
+            if self.now & (SLOTS - 1) == 0:
+                top = LEVELS
+                for level in range(1, LEVELS):
+                    if (self.now >> (level * SLOT_BITS)) & (SLOTS - 1):
+                        top = level
+                        break
+                if top == LEVELS and self._overflow:
+                    self._cascade(self._overflow)
+                for level in range(min(top, LEVELS - 1), 0, -1):
+                    self._cascade(self._levels[level][(self.now >> (level * SLOT_BITS)) & (SLOTS - 1)])
+            slot = self._levels[0][self.now & (SLOTS - 1)]
+            if slot:
+                for key, entry in slot.items():
+                    del self._slot_of[key]
+                    fired.append((key, entry[2]))
+                slot.clear()
+        return fired
+
+
+@dataclass
+class Reminder:
+    """A fired reminder for one task"""
+    task: Task
+    pet_name: str | None
+    at: datetime  # when the reminder was due
+    kind: str  # "start" (ahead of a start time) or "due" (the due date itself)
+
+    @property
+    def message(self) -> str:
+        pet = f" ({self.pet_name})" if self.pet_name else ""
+        if self.kind == "start":
+            start = datetime.combine(self.task.due_date.date(), self.task.start_time)
+            return f"⏰ '{self.task.name}'{pet} starts at {start:%H:%M} on {start:%Y-%m-%d}"
+        return f"⏰ '{self.task.name}'{pet} is due {self.task.due_date:%Y-%m-%d}"
+
+
+class LogFileSink:
+    """Append one line per reminder to a log file"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def __call__(self, reminder: Reminder) -> None:
+        with open(self.filename, "a", encoding="utf-8") as f:
+            f.write(f"{reminder.at:%Y-%m-%d %H:%M} {reminder.task.id} {reminder.message}\n")
+
+
+class SmtpSink:
+    """
+    Email each reminder through an SMTP server, by default a local stand-in
+    such as `python -m aiosmtpd -n -l localhost:1025`
+    """
+
+    def __init__(self, recipient: str, sender: str = "pawpal@localhost", host: str = "localhost",
+                 port: int = 1025, timeout: float = 10.0):
+        self.recipient = recipient
+        self.sender = sender
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def __call__(self, reminder: Reminder) -> None:
+        from email.message import EmailMessage
+        import smtplib
+
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = self.recipient
+        message["Subject"] = f"PawPal+ reminder: {reminder.task.name}"
+        message.set_content(reminder.message + (f"\n\n{reminder.task.description}" if reminder.task.description else ""))
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(message)
+
+
+class ReminderEngine:
+    """
+    Fires reminders for an owner's open tasks
+
+    Registered as an owner listener, so adding, editing, completing or removing
+    a task schedules, moves or cancels its reminder in O(1) instead of polling
+    the plan. Tasks with a start time are reminded `lead_minutes` before it;
+    other dated tasks when their due date arrives. Call advance() periodically
+    (or start() a background thread) to dispatch due reminders to the sinks,
+    which are any callables taking a Reminder (see LogFileSink and SmtpSink).
+    Reminders that were already past when the engine started are skipped rather
+    than all fired at once, and each reminder fires once: a later event for the
+    same task (an edit, a segment reload) only fires it again if it moved to a
+    different minute. A failing sink doesn't stop the others; its errors
+    are kept in `errors`.
+    """
+
+    def __init__(self, owner: Owner, sinks: Iterable[Callable[[Reminder], None]] = (),
+                 lead_minutes: int = 15, now: datetime = None):
+        self.owner = owner
+        self.sinks = list(sinks)
+        self.lead_minutes = lead_minutes
+        self.errors: List[tuple] = []  # (reminder, exception) for sink failures
+        self._started = to_minute(now or datetime.now())
+        self._wheel = TimerWheel(self._started)
+        # task id -> minute its reminder last fired at; kept across removal so a
+        # reloaded copy of the task isn't reminded again
+        self._fired: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        owner.add_listener(self)
+
+    def __len__(self) -> int:
+        return len(self._wheel)
+
+    def remind_at(self, task: Task) -> tuple | None:
+        """(minute, kind) a task should be reminded at, or None if it needs no reminder"""
+        if task.completed or task.due_date is None:
+            return None
+        if task.start_time is not None:
+            return task.start_minute - self.lead_minutes, "start"
+        return task.due_minute, "due"
+
+    def advance(self, now: datetime = None) -> List[Reminder]:
+        """Dispatch every reminder due by `now` (default: the current time) and return them"""
+        with self._lock:
+            fired = self._wheel.advance(to_minute(now or datetime.now()))
+            reminders = []
+            for task_id, (minute, kind) in fired:
+                self._fired[task_id] = minute
+                task = self.owner.get_task(task_id)
+                if task is None:
+                    continue
+                pet = self.owner.pet_of(task)
+                reminders.append(Reminder(task, pet.name if pet else None, from_minute(minute), kind))
+        for reminder in reminders:
+            for sink in self.sinks:
+                try:
+                    sink(reminder)
+                except Exception as error:  # one broken sink shouldn't silence the rest
+                    self.errors.append((reminder, error))
+        return reminders
+
+    def start(self, interval: float = 30.0) -> threading.Thread:
+        """Call advance() every `interval` seconds on a daemon thread until stop()"""
+        def loop():
+            while not self._stop.wait(interval):
+                self.advance()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="pawpal-reminders", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # Owner listener hooks
+    def task_added(self, task: Task) -> None:
+        when = self.remind_at(task)
+        with self._lock:
+            if when is None or when[0] < self._started or self._fired.get(task.id) == when[0]:
+                self._wheel.cancel(task.id)
+            else:
+                self._wheel.schedule(task.id, when[0], when)
+
+    def task_changed(self, task: Task) -> None:
+        self.task_added(task)
+
+    def task_removed(self, task: Task) -> None:
+        with self._lock:
+            self._wheel.cancel(task.id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._wheel.clear()
@@ -0,0 +1,299 @@
+"""
+PawPal+ Reports - Streaming plan, conflict and overdue reports in text, Markdown, HTML and JSON
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, IO, Iterable, List
+import html
+import json
+import os
+
+from pawpal_system import Owner, Scheduler, Task, load_owner
+
+
+class Renderer:
+    """
+    A report format: one str.format template per report element
+
+    Field values are passed through escape() before they are substituted, so
+    templates can be written for the target format without worrying about
+    quoting (None renders as an empty string, or null in JSON). `separator` is written between
+    consecutive items of a list (plan tasks, conflicts, overdue tasks) and
+    `section_separator` between sections.
+    """
+    extension = "txt"
+    separator = ""
+    section_separator = "\n"
+    no_due = "No due date"
+    templates: Dict[str, str] = {
+        "report_start": "PawPal+ report for {owner} ({generated})\n\n",
+        "plan_start": "Schedule Plan: {count} tasks, {minutes} minutes total\n\n",
+        "plan_task": "{index}. {name} ({pet}) - Priority {priority} - {duration} min ({due})\n",
+        "plan_description": "   {description}\n",
+        "plan_empty": "No tasks scheduled.\n",
+        "plan_end": "",
+        "conflicts_start": "Conflicts:\n",
+        "conflict": "⚠️ '{name1}' ({pet1}) overlaps with '{name2}' ({pet2}) on {day}\n",
+        "conflicts_empty": "No conflicts.\n",
+        "conflicts_end": "",
+        "overdue_start": "Overdue: {count} tasks\n",
+        "overdue_task": "- {name} ({pet}) - due {due}, {days_late} days late\n",
+        "overdue_empty": "Nothing overdue.\n",
+        "overdue_end": "",
+        "report_end": "",
+    }
+
+    def escape(self, value) -> str:
+        return "" if value is None else str(value)
+
+    def write(self, stream: IO[str], element: str, **fields) -> None:
+        """Render one template to the stream"""
+        template = self.templates[element]
+        if template:
+            stream.write(template.format(**{k: self.escape(v) for k, v in fields.items()}))
+
+
+class MarkdownRenderer(Renderer):
+    extension = "md"
+    templates = {
+        "report_start": "# PawPal+ report for {owner}\n\n_Generated {generated}_\n\n",
+        "plan_start": "## Schedule plan\n\n{count} tasks, {minutes} minutes total\n\n"
+                      "| # | Task | Pet | Priority | Minutes | Due |\n|---|---|---|---|---|---|\n",
+        "plan_task": "| {index} | {name} | {pet} | {priority} | {duration} | {due} |\n",
+        "plan_description": "|  | {description} |  |  |  |  |\n",
+        "plan_empty": "No tasks scheduled.\n",
+        "plan_end": "",
+        "conflicts_start": "## Conflicts\n\n",
+        "conflict": "- ⚠️ **{name1}** ({pet1}) overlaps with **{name2}** ({pet2}) on {day}\n",
+        "conflicts_empty": "No conflicts.\n",
+        "conflicts_end": "",
+        "overdue_start": "## Overdue ({count})\n\n",
+        "overdue_task": "- **{name}** ({pet}): due {due}, {days_late} days late\n",
+        "overdue_empty": "Nothing overdue.\n",
+        "overdue_end": "",
+        "report_end": "",
+    }
+
+    def escape(self, value) -> str:
+        text = super().escape(value).replace("\n", " ")
+        for char in "\\`*_[]<>|#":
+            text = text.replace(char, "\\" + char)
+        return text
+
+
+class HtmlRenderer(Renderer):
+    extension = "html"
+    section_separator = ""
+    templates = {
+        "report_start": "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+                        "<title>PawPal+ report for {owner}</title></head><body>\n"
+                        "<h1>PawPal+ report for {owner}</h1>\n<p>Generated {generated}</p>\n",
+        "plan_start": "<h2>Schedule plan</h2>\n<p>{count} tasks, {minutes} minutes total</p>\n<ol>\n",
+        # </li> is optional in HTML, which lets the description follow as its own element
+        "plan_task": "<li><strong>{name}</strong> ({pet}) - {priority} - {duration} min ({due})\n",
+        "plan_description": "<br><small>{description}</small>\n",
+        "plan_empty": "<p>No tasks scheduled.</p>\n",
+        "plan_end": "</ol>\n",
+        "conflicts_start": "<h2>Conflicts</h2>\n<ul>\n",
+        "conflict": "<li><strong>{name1}</strong> ({pet1}) overlaps with <strong>{name2}</strong> ({pet2}) on {day}</li>\n",
+        "conflicts_empty": "<li>No conflicts.</li>\n",
+        "conflicts_end": "</ul>\n",
+        "overdue_start": "<h2>Overdue ({count})</h2>\n<ul>\n",
+        "overdue_task": "<li><strong>{name}</strong> ({pet}): due {due}, {days_late} days late</li>\n",
+        "overdue_empty": "<li>Nothing overdue.</li>\n",
+        "overdue_end": "</ul>\n",
+        "report_end": "</body></html>\n",
+    }
+
+    def escape(self, value) -> str:
+        return html.escape(super().escape(value))
+
+
+class JsonRenderer(Renderer):
+    extension = "json"
+    separator = ","
+    section_separator = ""  # every section starts with its own ", " after report_start's fields
+    no_due = None
+    templates = {
+        "report_start": "{{\"owner\": {owner}, \"generated\": {generated}",
+        "plan_start": ", \"plan\": {{\"count\": {count}, \"minutes\": {minutes}, \"tasks\": [",
+        "plan_task": "\n{{\"index\": {index}, \"id\": {id}, \"name\": {name}, \"pet\": {pet}, "
+                     "\"priority\": {priority}, \"duration\": {duration}, \"due\": {due}, "
+                     "\"description\": {description}}}",
+        "plan_description": "",
+        "plan_empty": "",
+        "plan_end": "]}}",
+        "conflicts_start": ", \"conflicts\": [",
+        "conflict": "\n{{\"task1\": {id1}, \"name1\": {name1}, \"pet1\": {pet1}, "
+                    "\"task2\": {id2}, \"name2\": {name2}, \"pet2\": {pet2}, \"day\": {day}}}",
+        "conflicts_empty": "",
+        "conflicts_end": "]",
+        "overdue_start": ", \"overdue\": [",
+        "overdue_task": "\n{{\"id\": {id}, \"name\": {name}, \"pet\": {pet}, \"due\": {due}, "
+                        "\"days_late\": {days_late}}}",
+        "overdue_empty": "",
+        "overdue_end": "]",
+        "report_end": "}}\n",
+    }
+
+    def escape(self, value) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+
+RENDERERS: Dict[str, Renderer] = {
+    "text": Renderer(),
+    "markdown": MarkdownRenderer(),
+    "html": HtmlRenderer(),
+    "json": JsonRenderer(),
+}
+
+SECTIONS = ("plan", "conflicts", "overdue")
+
+
+def _renderer(fmt: str | Renderer) -> Renderer:
+    if isinstance(fmt, Renderer):
+        return fmt
+    try:
+        return RENDERERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown report format {fmt!r}; expected one of {', '.join(RENDERERS)}") from None
+
+
+def _due(task: Task) -> str | None:
+    return task.due_date.strftime("%Y-%m-%d") if task.due_date else None
+
+
+def _pet_name(owner: Owner, task: Task) -> str:
+    return getattr(owner.pet_of(task), "name", "Unknown")
+
+
+def _write_plan(owner: Owner, stream: IO[str], renderer: Renderer, scheduler: Scheduler,
+                top_k: int | None, max_minutes: int | None) -> None:
+    # Plans cover open tasks only. Totals come first in every format, so count
+    # in a first pass and render in a second
+    if top_k is None and max_minutes is None:
+        tasks = [task for task in scheduler.get_all_pet_tasks(owner) if not task.completed]
+        count, minutes = len(tasks), sum(task.duration for task in tasks)
+    else:
+        count = minutes = 0
+        for task in scheduler.iter_plan(owner, top_k, max_minutes, include_completed=False):
+            count += 1
+            minutes += task.duration
+
+    renderer.write(stream, "plan_start", count=count, minutes=minutes)
+    if count == 0:
+        renderer.write(stream, "plan_empty")
+    for index, task in enumerate(scheduler.iter_plan(owner, top_k, max_minutes, include_completed=False), 1):
+        if index > 1:
+            stream.write(renderer.separator)
+        renderer.write(stream, "plan_task", index=index, id=task.id, name=task.name,
+                       pet=_pet_name(owner, task), priority=task.priority.value, duration=task.duration,
+                       due=_due(task) or renderer.no_due, description=task.description)
+        if task.description:
+            renderer.write(stream, "plan_description", description=task.description)
+    renderer.write(stream, "plan_end")
+
+
+def _write_conflicts(owner: Owner, stream: IO[str], renderer: Renderer, scheduler: Scheduler) -> None:
+    renderer.write(stream, "conflicts_start")
+    written = 0
+    for task1, task2 in scheduler.iter_conflicts(owner):
+        if written:
+            stream.write(renderer.separator)
+        renderer.write(stream, "conflict", id1=task1.id, name1=task1.name, pet1=_pet_name(owner, task1),
+                       id2=task2.id, name2=task2.name, pet2=_pet_name(owner, task2), day=_due(task1))
+        written += 1
+    if not written:
+        renderer.write(stream, "conflicts_empty")
+    renderer.write(stream, "conflicts_end")
+
+
+def _write_overdue(owner: Owner, stream: IO[str], renderer: Renderer, today: date) -> None:
+    # The count comes first, so walk the due-date index twice instead of building a list
+    index = owner.due_index
+    count = sum(1 for _ in index.iter_overdue(today))
+    renderer.write(stream, "overdue_start", count=count)
+    for i, task in enumerate(index.iter_overdue(today)):
+        if i:
+            stream.write(renderer.separator)
+        renderer.write(stream, "overdue_task", id=task.id, name=task.name, pet=_pet_name(owner, task),
+                       due=_due(task), days_late=(today - task.due_date.date()).days)
+    if not count:
+        renderer.write(stream, "overdue_empty")
+    renderer.write(stream, "overdue_end")
+
+
+def write_report(owner: Owner, stream: IO[str], fmt: str | Renderer = "text",
+                 sections: Iterable[str] = SECTIONS, scheduler: Scheduler = None,
+                 top_k: int = None, max_minutes: int = None, today: date = None) -> None:
+    """
+    Stream a report for one owner to any writable text stream
+
+    Each task is rendered and written as soon as it comes off Scheduler.iter_plan
+    (or the conflict sweep / due-date index), so the rendered report is never
+    held in memory. What remains grows with the owner, not the output: the plan
+    heap, and the conflicting index pairs, which are sorted into task order
+    before the first one is written. Overdue tasks are streamed from the index.
+
+    Args:
+        owner: The pet owner
+        stream: Anything with a write(str) method (file, sys.stdout, StringIO, socket wrapper)
+        fmt: "text", "markdown", "html", "json", or a Renderer
+        sections: Which of "plan", "conflicts" and "overdue" to include, in order
+        scheduler: Scheduler to plan with (a default one if omitted)
+        top_k, max_minutes: Limits passed to Scheduler.iter_plan
+        today: Reference day for overdue tasks (defaults to today)
+    """
+    renderer = _renderer(fmt)
+    scheduler = scheduler or Scheduler()
+    today = today or datetime.now().date()
+    sections = list(sections)
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown report sections: {', '.join(sorted(unknown))}")
+
+    renderer.write(stream, "report_start", owner=owner.name, generated=datetime.now().isoformat(timespec="seconds"))
+    for i, section in enumerate(sections):
+        if i:
+            stream.write(renderer.section_separator)
+        if section == "plan":
+            _write_plan(owner, stream, renderer, scheduler, top_k, max_minutes)
+        elif section == "conflicts":
+            _write_conflicts(owner, stream, renderer, scheduler)
+        else:
+            _write_overdue(owner, stream, renderer, today)
+    renderer.write(stream, "report_end")
+
+
+def write_owner_reports(paths: Iterable[str], out_dir: str, fmt: str | Renderer = "markdown",
+                        **options) -> List[str]:
+    """
+    Write one report file per owner file, e.g. for nightly digests
+
+    Owners are loaded, reported and dropped one at a time, so only one owner is
+    in memory at once. Files that don't exist are skipped.
+
+    Args:
+        paths: Owner JSON files or segmented stores
+        out_dir: Directory for the reports, named after each owner file
+        fmt: Report format (see write_report)
+        options: Passed on to write_report
+
+    Returns:
+        The report paths written
+    """
+    renderer = _renderer(fmt)
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for path in paths:
+        owner = load_owner(path)
+        if owner is None:
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        report_path = os.path.join(out_dir, f"{stem}.{renderer.extension}")
+        with open(report_path, "w", encoding="utf-8") as f:
+            write_report(owner, f, renderer, **options)
+        written.append(report_path)
+    return written
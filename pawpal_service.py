@@ -0,0 +1,231 @@
+"""
+PawPal+ Service - asyncio API around Scheduler with a small local HTTP front
+
+Run with `python pawpal_service.py --store-dir owners --port 8080`. Each owner is
+stored as <store-dir>/<owner>.json, the same layout pawpal_batch reads.
+
+Endpoints (JSON in, JSON out):
+    GET  /owners/{owner}/tasks
+    POST /owners/{owner}/tasks                      body: one task row (see TASK_COLUMNS)
+    POST /owners/{owner}/tasks/{task_id}/complete
+    GET  /owners/{owner}/plan?top_k=N&max_minutes=M
+    GET  /owners/{owner}/conflicts
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import parse_qs, unquote, urlsplit
+import argparse
+import asyncio
+import json
+import os
+
+from pawpal_system import (
+    Owner, Scheduler, import_tasks, iter_task_rows, load_owner_from_json, save_owner_to_json
+)
+
+
+class ServiceError(Exception):
+    """Error returned to the client with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class PawPalService:
+    """
+    Async facade over Scheduler for many owners
+
+    Owners are loaded on first use and kept in memory. Writes to an owner are
+    serialized with a per-owner lock; planning, conflict checks, loads and saves
+    run on an executor so the event loop keeps serving other clients.
+    """
+
+    def __init__(self, store_dir: str, executor: Executor = None):
+        self.store_dir = store_dir
+        self.scheduler = Scheduler()
+        self._executor = executor or ThreadPoolExecutor()
+        self._owners: Dict[str, Owner] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _path(self, owner_name: str) -> str:
+        if not owner_name or "/" in owner_name or owner_name.startswith("."):
+            raise ServiceError(400, f"invalid owner name {owner_name!r}")
+        return os.path.join(self.store_dir, f"{owner_name}.json")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _owner(self, owner_name: str) -> Owner:
+        owner = self._owners.get(owner_name)
+        if owner is None:
+            async with self._lock(owner_name):
+                owner = self._owners.get(owner_name)
+                if owner is None:
+                    owner = await self._run(load_owner_from_json, self._path(owner_name))
+                    self._owners[owner_name] = owner = owner or Owner(owner_name)
+        return owner
+
+    def _lock(self, owner_name: str) -> asyncio.Lock:
+        return self._locks.setdefault(owner_name, asyncio.Lock())
+
+    async def list_tasks(self, owner_name: str) -> List[dict]:
+        """All tasks of an owner as flat rows, in pet order"""
+        owner = await self._owner(owner_name)
+        return list(iter_task_rows(owner))
+
+    async def create_task(self, owner_name: str, row: dict) -> dict:
+        """Validate and add one task row, then persist the owner"""
+        owner = await self._owner(owner_name)
+        async with self._lock(owner_name):
+            result = import_tasks(owner, [row])
+            if result.errors:
+                raise ServiceError(400, result.errors[0])
+            pet = next(p for p in owner.pets if p.name == str(row["pet"]).strip())
+            task = pet.tasks[-1]
+            await self._run(save_owner_to_json, owner, self._path(owner_name))
+        return {"pet": pet.name, "id": task.id}
+
+    async def complete_task(self, owner_name: str, task_id: str) -> dict:
+        """Complete a task by id, scheduling the next occurrence if it recurs"""
+        owner = await self._owner(owner_name)
+        async with self._lock(owner_name):
+            task = owner.get_task(task_id)
+            if task is None:
+                raise ServiceError(404, f"no task with id {task_id!r}")
+            next_task = self.scheduler.complete_task(owner, task)
+            await self._run(save_owner_to_json, owner, self._path(owner_name))
+        return {
+            "completed": task.id,
+            "next_id": next_task.id if next_task else None,
+            "next_due_date": next_task.due_date.isoformat() if next_task else None
+        }
+
+    async def plan(self, owner_name: str, top_k: int = None, max_minutes: int = None) -> List[dict]:
+        """The owner's plan in create_plan order, optionally cut off early"""
+        owner = await self._owner(owner_name)
+
+        def build():
+            return [
+                {"id": t.id, "name": t.name, "priority": t.priority.value, "duration": t.duration,
+                 "due_date": t.due_date.isoformat() if t.due_date else None, "completed": t.completed}
+                for t in self.scheduler.iter_plan(owner, top_k=top_k, max_minutes=max_minutes)
+            ]
+        return await self._run(build)
+
+    async def conflicts(self, owner_name: str) -> List[str]:
+        """Conflict warnings for the owner's scheduled appointments"""
+        owner = await self._owner(owner_name)
+        return await self._run(self.scheduler.detect_conflicts, owner)
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple:
+        """Route one HTTP request to the service, returning (status, payload)"""
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        try:
+            if len(parts) < 3 or parts[0] != "owners":
+                raise ServiceError(404, "not found")
+            owner_name, resource = parts[1], parts[2:]
+
+            if method == "GET" and resource == ["tasks"]:
+                return 200, await self.list_tasks(owner_name)
+            if method == "POST" and resource == ["tasks"]:
+                return 201, await self.create_task(owner_name, _json_body(body))
+            if method == "POST" and len(resource) == 3 and resource[0] == "tasks" and resource[2] == "complete":
+                return 200, await self.complete_task(owner_name, resource[1])
+            if method == "GET" and resource == ["plan"]:
+                top_k = _int_param(query["top_k"], "top_k") if "top_k" in query else None
+                max_minutes = _int_param(query["max_minutes"], "max_minutes") if "max_minutes" in query else None
+                return 200, await self.plan(owner_name, top_k, max_minutes)
+            if method == "GET" and resource == ["conflicts"]:
+                return 200, await self.conflicts(owner_name)
+            raise ServiceError(404, "not found")
+        except ServiceError as e:
+            return e.status, {"error": str(e)}
+
+
+def _json_body(body: bytes) -> dict:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise ServiceError(400, "request body is not valid JSON")
+    if not isinstance(data, dict):
+        raise ServiceError(400, "request body must be a JSON object")
+    return data
+
+
+def _int_param(raw: str, name: str) -> int:
+    try:
+        return int(raw)
+    except ValueError:
+        raise ServiceError(400, f"{name} must be an integer")
+
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+async def _handle_connection(service: PawPalService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve HTTP/1.1 requests on one connection until the client closes it"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, _version = request_line.decode("latin-1").split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            try:
+                status, payload = await service.dispatch(method, target, body)
+            except Exception as e:  # keep serving other requests on unexpected errors
+                status, payload = 500, {"error": str(e)}
+
+            data = json.dumps(payload).encode()
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service: PawPalService, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+    """Start serving the service over HTTP; use port 0 to pick a free port"""
+    return await asyncio.start_server(lambda r, w: _handle_connection(service, r, w), host, port)
+
+
+async def _serve(store_dir: str, host: str, port: int) -> None:
+    server = await start_server(PawPalService(store_dir), host, port)
+    print(f"PawPal+ service on http://{host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the PawPal+ HTTP service")
+    parser.add_argument("--store-dir", default="owners")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    os.makedirs(args.store_dir, exist_ok=True)
+    asyncio.run(_serve(args.store_dir, args.host, args.port))
@@ -4,11 +4,27 @@ PawPal+ System - A pet care task scheduling system
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, time
-from typing import List
+from datetime import date, datetime, timedelta, time
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple
 from enum import Enum
+import bisect
+import heapq
+import itertools
 import json
+import math
+import operator
+import os
+import sys
+import threading
+import weakref
+
+# Only needed for annotations; csv and pickle are imported where they're used,
+# so importing this module (e.g. at app startup) stays cheap
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 
 class Priority(str, Enum):
@@ -18,6 +34,10 @@ class Priority(str, Enum):
     LOW = "low"
 
 
+# Priority order for sorting: high < medium < low
+PRIORITY_RANK = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
+
+
 class Recurrence(str, Enum):
     """Recurrence patterns for tasks"""
     ONCE = "once"
@@ -27,6 +47,31 @@ class Recurrence(str, Enum):
     MONTHLY = "monthly"
 
 
+# Conflict scopes: timed tasks only conflict with tasks in the same scope.
+# Unscoped tasks share the owner-wide scope; "pet" confines a task to its own pet.
+OWNER_SCOPE = "owner"
+PET_SCOPE = "pet"
+
+# Partitions with at least this many timed tasks are checked on the executor, if one is given
+PARALLEL_SCOPE_SIZE = 2000
+
+# Day number undated tasks sort at: after every real date (date.max is day 3652059)
+NO_DUE_DAY = 1 << 31
+
+# Days between occurrences of each recurring pattern (monthly is a fixed 30 days)
+RECURRENCE_INTERVAL_DAYS = {
+    Recurrence.DAILY: 1,
+    Recurrence.WEEKLY: 7,
+    Recurrence.BIWEEKLY: 14,
+    Recurrence.MONTHLY: 30,
+}
+
+
+# Pet attributes whose assignment marks the pet dirty (tasks edited in place go through
+# Pet.add_task/remove_task and Owner.update_task, which mark it too)
+PET_DATA_FIELDS = frozenset({"name", "breed", "age", "weight", "tasks", "scope", "history"})
+
+
 @dataclass
 class Pet:
     """Represents a pet with basic information and a list of tasks"""
@@ -35,6 +80,43 @@ class Pet:
     age: int
     weight: float
     tasks: list
+    scope: str = None  # Default conflict scope for this pet's tasks (see conflict_scope)
+    history: Dict[str, TaskHistory] = field(default_factory=dict, repr=False)  # task name -> compacted stats
+    _owner: Owner = field(default=None, init=False, repr=False, compare=False)
+    # Set whenever the pet or its tasks change, cleared once its segment is saved (see save_owner_segments)
+    dirty: bool = field(default=True, init=False, repr=False, compare=False)
+    _segment: str = field(default=None, init=False, repr=False, compare=False)  # segment file name, once saved
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in PET_DATA_FIELDS:
+            object.__setattr__(self, "dirty", True)
+
+    def __getattr__(self, name):
+        # Only reached when `tasks` isn't set yet, i.e. the pet was loaded with
+        # defer_tasks(): convert the raw task dicts on first access
+        raw = self.__dict__.pop("_raw_tasks", None) if name == "tasks" else None
+        if raw is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        raw_tasks, templates = raw
+        object.__setattr__(self, "tasks", [dict_to_task(task_data, templates) for task_data in raw_tasks])
+        if self._owner is not None:
+            self._owner._pet_loaded(self)
+        return self.tasks
+
+    def defer_tasks(self, raw_tasks: list, templates: List[TaskTemplate] = None) -> None:
+        """
+        Replace the task list with raw task dicts (and the pet's template table, see
+        pet_to_dict), converted the first time pet.tasks is read
+        """
+        self.__dict__.pop("tasks", None)
+        object.__setattr__(self, "_raw_tasks", (raw_tasks, templates))
+
+    @property
+    def tasks_loaded(self) -> bool:
+        """False while the pet's tasks are still deferred raw dicts"""
+        return "_raw_tasks" not in self.__dict__
+
     @property
     def num_tasks(self):
         return len(self.tasks)
@@ -42,21 +124,233 @@ class Pet:
     def add_task(self, task: Task) -> None:
         """Add a task to this pet's task list"""
         self.tasks.append(task)
-
-
-@dataclass
-class Task:
-    """Represents a single activity with scheduling information"""
+        self.dirty = True
+        if self._owner is not None:
+            self._owner._task_added(self, task)
+
+    def remove_task(self, task: Task) -> None:
+        """Remove a task from this pet's task list (matched by identity, not field equality)"""
+        index = next((i for i, t in enumerate(self.tasks) if t is task), None)
+        if index is None:
+            raise ValueError(f"{task.name!r} is not one of {self.name}'s tasks")
+        del self.tasks[index]
+        self.dirty = True
+        if self._owner is not None:
+            self._owner._task_removed(task)
+
+    def remove_tasks(self, tasks: Iterable[Task]) -> None:
+        """Remove many tasks in one pass over the task list (tasks this pet doesn't have are ignored)"""
+        removed_ids = {task.id for task in tasks}
+        removed = [task for task in self.tasks if task.id in removed_ids]
+        if not removed:
+            return
+        self.tasks[:] = [task for task in self.tasks if task.id not in removed_ids]
+        self.dirty = True
+        if self._owner is not None:
+            for task in removed:
+                self._owner._task_removed(task)
+
+
+def new_task_id() -> str:
+    """Generate a random, stable task identifier"""
+    return os.urandom(8).hex()  # same as secrets.token_hex(8), without importing secrets
+
+
+# Fields a TaskTemplate holds for every occurrence of a task, in Task's argument order
+TEMPLATE_FIELDS = ("name", "priority", "duration", "start_time", "description",
+                   "recurrence", "recurrence_days", "scope")
+
+
+@dataclass(frozen=True)
+class TaskTemplate:
+    """
+    The definition shared by every occurrence of a task (flyweight)
+
+    Templates are immutable and interned: TaskTemplate.intern() returns the one
+    live template with those fields, so a daily task's occurrences (and any
+    identical tasks) share a single object, with their strings interned too.
+    """
     name: str
-    priority: Priority # high, medium, or low
-    duration: int # in minutes
-    due_date: datetime = None  # When the task should be done
-    start_time: time = None  # Optional start time for tasks with scheduled appointments
-    completed: bool = False
+    priority: Priority
+    duration: int
+    start_time: time = None
     description: str = None
     recurrence: Recurrence = Recurrence.ONCE
-    recurrence_days: int = None  # For custom intervals like every 3 days
-    last_completed: datetime = None
+    recurrence_days: int = None
+    scope: str = None
+
+    @classmethod
+    def intern(cls, name: str, priority: Priority, duration: int, start_time: time = None,
+               description: str = None, recurrence: Recurrence = Recurrence.ONCE,
+               recurrence_days: int = None, scope: str = None) -> TaskTemplate:
+        """The shared template with these fields, created on first use"""
+        key = (name, priority, duration, start_time, description, recurrence, recurrence_days, scope)
+        template = _TEMPLATES.get(key)
+        if template is None:
+            template = cls(*(sys.intern(v) if type(v) is str else v for v in key))
+            _TEMPLATES[key] = template
+        return template
+
+    def replace(self, **changes) -> TaskTemplate:
+        """The interned template with some fields changed"""
+        fields = {name: getattr(self, name) for name in TEMPLATE_FIELDS}
+        fields.update(changes)
+        return TaskTemplate.intern(**fields)
+
+
+# Live templates by field tuple; entries disappear once no task uses them
+_TEMPLATES: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def _template_property(name: str) -> property:
+    # Reads go to the template; writes re-point this task at another interned
+    # template (copy-on-write), so other occurrences are unaffected
+    get = operator.attrgetter(f"template.{name}")
+
+    def set(self, value):
+        self.template = self.template.replace(**{name: value})
+        self._times = None  # start_time and duration feed the cached minutes
+
+    return property(get, set, doc=f"The task's {name} (shared through its template)")
+
+
+class Task:
+    """
+    Represents a single activity with scheduling information
+
+    A task is one occurrence: its due date, completion state and id are its
+    own, while name, priority, duration, start_time, description, recurrence,
+    recurrence_days and scope live in a shared TaskTemplate and read like
+    ordinary attributes (assigning one gives just this task a new template).
+
+    Tasks compare and hash by id, so membership tests and set/dict lookups are
+    O(1) and two otherwise identical tasks stay distinct. Use same_fields() to
+    compare the scheduling fields themselves.
+
+    Scheduling math runs on integers cached per task (see due_day, due_minute,
+    start_minute, end_minute): days count from 0001-01-01 like date.toordinal(),
+    minutes are day * 1440 + minute of the day. They're computed on first use
+    and recomputed after due_date, start_time or duration change.
+    """
+    __slots__ = ("template", "_due_date", "completed", "last_completed", "id", "_times")
+
+    def __init__(self, name: str = None, priority: Priority = None, duration: int = None,
+                 due_date: datetime = None,  # When the task should be done
+                 start_time: time = None,  # Optional start time for tasks with scheduled appointments
+                 completed: bool = False,
+                 description: str = None,
+                 recurrence: Recurrence = Recurrence.ONCE,
+                 recurrence_days: int = None,  # For custom intervals like every 3 days
+                 last_completed: datetime = None,
+                 scope: str = None,  # Conflict scope, e.g. "pet", "caretaker:sam", "resource:grooming table"
+                 id: str = None,  # Stable identifier, persisted in JSON (generated if omitted)
+                 template: TaskTemplate = None):  # Share an existing definition instead of the fields above
+        if template is None:
+            if name is None or priority is None or duration is None:
+                raise TypeError("Task() needs name, priority and duration, or a template")
+            template = TaskTemplate.intern(name, priority, duration, start_time, description,
+                                           recurrence, recurrence_days, scope)
+        self.template = template
+        self._due_date = due_date
+        self._times = None
+        self.completed = completed
+        self.last_completed = last_completed
+        self.id = id or new_task_id()
+
+    name = _template_property("name")
+    priority = _template_property("priority")
+    duration = _template_property("duration")  # in minutes
+    start_time = _template_property("start_time")
+    description = _template_property("description")
+    recurrence = _template_property("recurrence")
+    recurrence_days = _template_property("recurrence_days")
+    scope = _template_property("scope")
+
+    @property
+    def due_date(self) -> datetime | None:
+        return self._due_date
+
+    @due_date.setter
+    def due_date(self, value: datetime | None) -> None:
+        self._due_date = value
+        self._times = None
+
+    def _time_model(self) -> tuple:
+        # (sort day, due minute, start minute, end minute), ints; undated tasks
+        # sort at NO_DUE_DAY and have no minutes
+        times = self._times
+        if times is None:
+            due = self._due_date
+            if due is None:
+                times = (NO_DUE_DAY, None, None, None)
+            else:
+                day = due.toordinal()
+                start_time = self.template.start_time
+                if start_time is None:
+                    start = end = None
+                else:
+                    start = day * 1440 + start_time.hour * 60 + start_time.minute
+                    end = start + self.template.duration
+                times = (day, day * 1440 + due.hour * 60 + due.minute, start, end)
+            self._times = times
+        return times
+
+    @property
+    def due_day(self) -> int | None:
+        """Due date as a day number (date.toordinal()), or None if undated"""
+        day = self._time_model()[0]
+        return None if day == NO_DUE_DAY else day
+
+    @property
+    def sort_day(self) -> int:
+        """due_day, or NO_DUE_DAY for undated tasks so they sort last"""
+        return self._time_model()[0]
+
+    @property
+    def due_minute(self) -> int | None:
+        """The due date's minute (day * 1440 + minute of day), or None if undated"""
+        return self._time_model()[1]
+
+    @property
+    def start_minute(self) -> int | None:
+        """Start of a timed task's slot in minutes, or None without a due date and start time"""
+        return self._time_model()[2]
+
+    @property
+    def end_minute(self) -> int | None:
+        """start_minute + duration, or None"""
+        return self._time_model()[3]
+
+    def __repr__(self) -> str:
+        t = self.template
+        return (f"Task(name={t.name!r}, priority={t.priority!r}, duration={t.duration!r}, "
+                f"due_date={self.due_date!r}, start_time={t.start_time!r}, completed={self.completed!r}, "
+                f"description={t.description!r}, recurrence={t.recurrence!r}, "
+                f"recurrence_days={t.recurrence_days!r}, last_completed={self.last_completed!r}, "
+                f"scope={t.scope!r}, id={self.id!r})")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @property
+    def interval_days(self) -> int | None:
+        """Days between occurrences (recurrence_days, if set, overrides the pattern's), or None for one-time tasks"""
+        interval = RECURRENCE_INTERVAL_DAYS.get(self.recurrence)
+        return interval and (self.recurrence_days or interval)
+
+    def same_fields(self, other: Task) -> bool:
+        """Structural comparison of every field except the id"""
+        return (
+            self.template == other.template
+            and self.due_date == other.due_date
+            and self.completed == other.completed
+            and self.last_completed == other.last_completed
+        )
 
     def needs_scheduling(self) -> bool:
         """Check if a recurring task needs to be scheduled again"""
@@ -66,20 +360,8 @@ class Task:
         if self.last_completed is None:
             return True
 
-        # Calculate interval based on recurrence pattern
-        if self.recurrence == Recurrence.DAILY:
-            interval = timedelta(days=1)
-        elif self.recurrence == Recurrence.WEEKLY:
-            interval = timedelta(days=7)
-        elif self.recurrence == Recurrence.BIWEEKLY:
-            interval = timedelta(days=14)
-        elif self.recurrence == Recurrence.MONTHLY:
-            interval = timedelta(days=30)
-        else:
-            return True
-
         # Check if enough time has passed since last completion
-        return datetime.now() - self.last_completed >= interval
+        return datetime.now() - self.last_completed >= timedelta(days=self.interval_days)
 
     def is_overdue(self) -> bool:
         """Check if a task is overdue based on its due date"""
@@ -91,32 +373,490 @@ class Task:
         today = datetime.now().date()
         return due_date_only < today and not self.completed
 
+class DueDateIndex:
+    """
+    Calendar-bucket index of tasks keyed by the ordinal day of their due date.
+
+    Each bucket maps task keys to tasks, and open (not completed) minutes and
+    counts are kept per day so today/overdue/upcoming queries are range lookups
+    over a sorted list of days instead of a scan over every task.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every indexed task"""
+        self._buckets: Dict[int, Dict[str, Task]] = {}  # ordinal day -> {key: task}
+        self._undated: Dict[str, Task] = {}  # tasks without a due date
+        self._entries: Dict[str, tuple] = {}  # task id -> (ordinal, duration, completed) as indexed
+        self._open_minutes: Dict[int, int] = {}  # ordinal day -> minutes of open tasks
+        self._open_count: Dict[int, int] = {}  # ordinal day -> number of open tasks
+        self._open_days: List[int] = []  # sorted ordinal days that have open tasks
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def task_added(self, task: Task) -> None:
+        """Index a task under the bucket for its due date"""
+        key = task.id
+        if key in self._entries:
+            self.task_removed(task)
+
+        ordinal = task.due_day
+        self._entries[key] = (ordinal, task.duration, task.completed)
+        if ordinal is None:
+            self._undated[key] = task
+            return
+
+        self._buckets.setdefault(ordinal, {})[key] = task
+        if not task.completed:
+            self._open_minutes[ordinal] = self._open_minutes.get(ordinal, 0) + task.duration
+            self._open_count[ordinal] = self._open_count.get(ordinal, 0) + 1
+            if self._open_count[ordinal] == 1:
+                bisect.insort(self._open_days, ordinal)
+
+    def task_removed(self, task: Task) -> None:
+        """Drop a task from the index using the values it was indexed with"""
+        key = task.id
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        ordinal, duration, completed = entry
+        if ordinal is None:
+            self._undated.pop(key, None)
+            return
+
+        bucket = self._buckets[ordinal]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[ordinal]
+        if not completed:
+            self._open_minutes[ordinal] -= duration
+            self._open_count[ordinal] -= 1
+            if self._open_count[ordinal] == 0:
+                del self._open_minutes[ordinal]
+                del self._open_count[ordinal]
+                del self._open_days[bisect.bisect_left(self._open_days, ordinal)]
+
+    def task_changed(self, task: Task) -> None:
+        """Re-bucket a task after its due date, duration or completion changed"""
+        self.task_removed(task)
+        self.task_added(task)
+
+    def due_on(self, day: date, include_completed: bool = False) -> List[Task]:
+        """Tasks due on a given day"""
+        bucket = self._buckets.get(day.toordinal(), {})
+        return [t for t in bucket.values() if include_completed or not t.completed]
+
+    def today(self, today: date = None) -> List[Task]:
+        """Open tasks due today"""
+        return self.due_on(today or datetime.now().date())
+
+    def due_between(self, start: date, end: date) -> List[Task]:
+        """Open tasks due from start through end (inclusive)"""
+        lo = bisect.bisect_left(self._open_days, start.toordinal())
+        hi = bisect.bisect_right(self._open_days, end.toordinal())
+        return self._open_tasks(self._open_days[lo:hi])
+
+    def overdue(self, today: date = None) -> List[Task]:
+        """Open tasks in every bucket before today"""
+        return list(self.iter_overdue(today))
+
+    def iter_overdue(self, today: date = None) -> Iterator[Task]:
+        """Yield overdue() tasks one at a time, without building the list"""
+        today = today or datetime.now().date()
+        hi = bisect.bisect_left(self._open_days, today.toordinal())
+        for i in range(hi):
+            for task in self._buckets[self._open_days[i]].values():
+                if not task.completed:
+                    yield task
+
+    def upcoming(self, days: int, today: date = None) -> List[Task]:
+        """Open tasks due in the next `days` days, not counting today"""
+        today = today or datetime.now().date()
+        return self.due_between(today + timedelta(days=1), today + timedelta(days=days))
+
+    def due_after(self, today: date = None) -> List[Task]:
+        """Open tasks due at any point after today"""
+        today = today or datetime.now().date()
+        lo = bisect.bisect_right(self._open_days, today.toordinal())
+        return self._open_tasks(self._open_days[lo:])
+
+    def undated(self, include_completed: bool = False) -> List[Task]:
+        """Tasks that have no due date"""
+        return [t for t in self._undated.values() if include_completed or not t.completed]
+
+    def minutes_on(self, day: date) -> int:
+        """Total minutes of open tasks due on a given day"""
+        return self._open_minutes.get(day.toordinal(), 0)
+
+    def _open_tasks(self, ordinals: List[int]) -> List[Task]:
+        tasks = []
+        for ordinal in ordinals:
+            tasks.extend(t for t in self._buckets[ordinal].values() if not t.completed)
+        return tasks
+
+
+class ReadyQueue:
+    """
+    Heap of open tasks keyed on (priority, days until due, duration).
+
+    Days until due is stored as the due date's ordinal, which orders the same way
+    regardless of which day "today" is. Completed, edited and removed tasks are
+    deleted lazily: their heap entry is flagged and skipped when it reaches the top.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every queued task"""
+        self._heap = []
+        self._entries: Dict[str, list] = {}  # task id -> live heap entry
+        self._counter = itertools.count()  # tie-breaker keeps insertion order stable
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, task: Task) -> None:
+        """Add an open task, replacing any entry it already has"""
+        self._invalidate(task)
+        if task.completed:
+            return
+        due = task.sort_day
+        entry = [PRIORITY_RANK[task.priority], due, task.duration, next(self._counter), task, True]
+        self._entries[task.id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def reprioritize(self, task: Task) -> None:
+        """Re-key a task after its priority, due date or duration changed"""
+        self.push(task)
+
+    def complete(self, task: Task) -> None:
+        """Drop a completed (or removed) task from the queue"""
+        self._invalidate(task)
+
+    def peek(self) -> Task | None:
+        """The most urgent open task, without removing it"""
+        self._discard_stale()
+        return self._heap[0][4] if self._heap else None
+
+    def pop(self) -> Task | None:
+        """Remove and return the most urgent open task"""
+        self._discard_stale()
+        if not self._heap:
+            return None
+        entry = heapq.heappop(self._heap)
+        del self._entries[entry[4].id]
+        return entry[4]
+
+    def peek_n(self, n: int) -> List[Task]:
+        """The n most urgent open tasks in order, leaving the queue unchanged"""
+        popped = []
+        while len(popped) < n:
+            self._discard_stale()
+            if not self._heap:
+                break
+            popped.append(heapq.heappop(self._heap))
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return [entry[4] for entry in popped]
+
+    # Owner listener hooks
+    def task_added(self, task: Task) -> None:
+        self.push(task)
+
+    def task_changed(self, task: Task) -> None:
+        self.push(task)
+
+    def task_removed(self, task: Task) -> None:
+        self.complete(task)
+
+    def _invalidate(self, task: Task) -> None:
+        entry = self._entries.pop(task.id, None)
+        if entry is None:
+            return
+        entry[5] = False
+        self._stale += 1
+        # Rebuild once stale entries dominate so the heap doesn't grow without bound
+        if self._stale > len(self._entries) and self._stale > 64:
+            self._heap = [e for e in self._heap if e[5]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _discard_stale(self) -> None:
+        while self._heap and not self._heap[0][5]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+
+@dataclass(frozen=True)
+class TaskRow:
+    """Display-ready fields of one task, as shown in task lists"""
+    pet: str
+    title: str
+    duration_minutes: int
+    priority: str  # e.g. "HIGH"
+    recurrence: str
+    due_date: str  # YYYY-MM-DD, or "No due date"
+    due_date_short: str  # MM/DD/YYYY, or "No due date"
+
+
+class TaskViewModel:
+    """
+    Lazily computed display rows derived from an owner's tasks
+
+    Rows are formatted on first request and memoized per task. As an owner
+    listener, the view drops a task's row whenever the task is edited, completed,
+    moved or removed, so rows never drift from the Owner graph.
+    """
+
+    def __init__(self, owner: Owner):
+        self.owner = owner
+        self._rows: Dict[str, TaskRow] = {}  # task id -> memoized row
+
+    def row(self, task: Task) -> TaskRow:
+        """The display row for a task, formatting it only if it changed since last time"""
+        row = self._rows.get(task.id)
+        if row is None:
+            pet = self.owner.pet_of(task)
+            row = TaskRow(
+                pet=pet.name if pet else "Unknown",
+                title=task.name,
+                duration_minutes=task.duration,
+                priority=task.priority.value.upper(),
+                recurrence=task.recurrence.value,
+                due_date=task.due_date.strftime("%Y-%m-%d") if task.due_date else "No due date",
+                due_date_short=task.due_date.strftime("%m/%d/%Y") if task.due_date else "No due date"
+            )
+            self._rows[task.id] = row
+        return row
+
+    def rows(self) -> Iterator[TaskRow]:
+        """Rows for every task, pet by pet"""
+        for pet in self.owner.pets:
+            for task in pet.tasks:
+                yield self.row(task)
+
+    def __len__(self) -> int:
+        return sum(len(pet.tasks) for pet in self.owner.pets)
+
+    # Owner listener hooks
+    def task_added(self, task: Task) -> None:
+        pass
+
+    def task_changed(self, task: Task) -> None:
+        self._rows.pop(task.id, None)
+
+    def task_removed(self, task: Task) -> None:
+        self._rows.pop(task.id, None)
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+
 @dataclass
 class Owner:
     """Represents a pet owner who manages pets"""
     name: str
     pets: List[Pet] = field(default_factory=list)
 
+    def __post_init__(self):
+        self._due_index = DueDateIndex()
+        # Objects notified with task_added/task_changed/task_removed as tasks change
+        self._listeners = [self._due_index]
+        self._tasks_by_id: Dict[str, Task] = {}  # task id -> task
+        self._pet_by_task: Dict[str, Pet] = {}  # task id -> pet that has it
+        self._deferred: List[Pet] = []  # pets whose tasks haven't been loaded (see Pet.defer_tasks)
+        self._ready_queue = None  # built on demand by Scheduler.ready_queue
+        self._task_view = None  # built on demand by task_view()
+        for pet in self.pets:
+            self._attach(pet)
+
+    @property
+    def due_index(self) -> DueDateIndex:
+        """Open tasks bucketed by due date, covering every pet"""
+        self.load_tasks()
+        return self._due_index
+
+    def _attach(self, pet: Pet) -> None:
+        pet._owner = self
+        if not pet.tasks_loaded:
+            if not any(p is pet for p in self._deferred):
+                self._deferred.append(pet)
+            return
+        for task in pet.tasks:
+            self._task_added(pet, task)
+
+    def _pet_loaded(self, pet: Pet) -> None:
+        """Index a deferred pet's tasks once they've been converted"""
+        self._deferred = [p for p in self._deferred if p is not pet]
+        for task in pet.tasks:
+            self._task_added(pet, task)
+
+    def load_tasks(self) -> None:
+        """Convert every pet's deferred tasks, so whole-owner indexes are complete"""
+        while self._deferred:
+            self._deferred[0].tasks  # noqa: B018 - first access loads and indexes the pet
+
+    def _task_added(self, pet: Pet, task: Task) -> None:
+        self._tasks_by_id[task.id] = task
+        self._pet_by_task[task.id] = pet
+        self._notify("task_added", task)
+
+    def _task_removed(self, task: Task) -> None:
+        self._tasks_by_id.pop(task.id, None)
+        self._pet_by_task.pop(task.id, None)
+        self._notify("task_removed", task)
+
+    def _notify(self, event: str, task: Task) -> None:
+        for listener in self._listeners:
+            getattr(listener, event)(task)
+
     def add_pet(self, pet: Pet) -> None:
         """Add a pet to the owner's pet list"""
         self.pets.append(pet)
+        self._attach(pet)
 
     def remove_pet(self, pet: Pet) -> None:
         """Remove a pet from the owner's pet list"""
+        tasks = pet.tasks  # load deferred tasks while still attached, so they can be unindexed
         self.pets.remove(pet)
+        pet._owner = None
+        for task in tasks:
+            self._task_removed(task)
+
+    def replace_pet(self, old: Pet, new: Pet) -> None:
+        """Swap a pet for another (e.g. a freshly reloaded copy) at the same position in the pet list"""
+        index = next(i for i, pet in enumerate(self.pets) if pet is old)
+        self.pets[index] = new
+        if old.tasks_loaded:
+            for task in old.tasks:
+                self._task_removed(task)
+        else:
+            self._deferred = [p for p in self._deferred if p is not old]
+        old._owner = None
+        self._attach(new)
+
+    def get_task(self, task_id: str) -> Task | None:
+        """Look up one of the owner's tasks by its id"""
+        task = self._tasks_by_id.get(task_id)
+        if task is None and self._deferred:
+            self.load_tasks()
+            task = self._tasks_by_id.get(task_id)
+        return task
+
+    def pet_of(self, task: Task | str) -> Pet | None:
+        """The pet that has a task (given as a Task or its id), or None if no pet of this owner has it"""
+        task_id = task if isinstance(task, str) else task.id
+        pet = self._pet_by_task.get(task_id)
+        if pet is None and self._deferred:
+            self.load_tasks()
+            pet = self._pet_by_task.get(task_id)
+        return pet
+
+    def remove_task(self, task: Task | str) -> Task | None:
+        """Remove a task (given as a Task or its id) from whichever pet has it"""
+        task = self.get_task(task) if isinstance(task, str) else task
+        pet = self.pet_of(task) if task is not None else None
+        if pet is None:
+            return None
+        pet.remove_task(task)
+        return task
 
     def add_task_to_pet(self, pet: Pet, task: Task) -> None:
         """Add a task to a specific pet"""
-        pet.tasks.append(task)
-    
+        pet.add_task(task)
+
     def mark_complete(self, task: Task) -> None:
         """Marks a task as completed"""
-        task.completed = True
+        self.update_task(task, completed=True)
+
+    def update_task(self, task: Task | str, **changes) -> None:
+        """Apply field changes to a task (given as a Task or its id) and keep the owner's indexes in sync"""
+        if isinstance(task, str):
+            task_id, task = task, self.get_task(task)
+            if task is None:
+                raise KeyError(task_id)
+        for name, value in changes.items():
+            setattr(task, name, value)
+        pet = self._pet_by_task.get(task.id)
+        if pet is not None:
+            pet.dirty = True
+        self._notify("task_changed", task)
+
+    def add_listener(self, listener) -> None:
+        """Register an object notified of task changes, replaying existing tasks to it"""
+        self.load_tasks()
+        self._listeners.append(listener)
+        for pet in self.pets:
+            for task in pet.tasks:
+                listener.task_added(task)
+
+    def reindex(self) -> None:
+        """Rebuild every index from scratch, e.g. after editing pet.tasks directly"""
+        for listener in self._listeners:
+            listener.clear()
+        self._tasks_by_id.clear()
+        self._pet_by_task.clear()
+        self._deferred.clear()
+        for pet in self.pets:
+            self._attach(pet)
+
+
+def conflict_scope(task: Task, pet: Pet | None) -> str:
+    """
+    The scope a task competes in for conflicts: the task's own scope, else its
+    pet's, else the owner-wide scope. The "pet" scope becomes "pet:<pet name>".
+    """
+    scope = task.scope or (pet.scope if pet else None) or OWNER_SCOPE
+    if scope == PET_SCOPE:
+        return f"{PET_SCOPE}:{pet.name if pet else ''}"
+    return scope
+
+
+def task_view(owner: Owner) -> TaskViewModel:
+    """Get the owner's display view model, building and registering it on first use"""
+    if owner._task_view is None:
+        owner._task_view = TaskViewModel(owner)
+        owner._listeners.append(owner._task_view)
+    return owner._task_view
 
 
 class Scheduler:
     """The "brain" that retrieves, organizes, and manages tasks across pets"""
 
+    def ready_queue(self, owner: Owner) -> ReadyQueue:
+        """
+        Get the owner's ready queue, building it on first use
+
+        The queue is registered as an owner listener, so tasks added, edited,
+        completed or removed afterwards are pushed or lazily deleted automatically.
+
+        Args:
+            owner: The pet owner
+
+        Returns:
+            The ReadyQueue of the owner's open tasks
+        """
+        queue = owner._ready_queue
+        if queue is None:
+            queue = ReadyQueue()
+            owner.add_listener(queue)
+            owner._ready_queue = queue
+        return queue
+
+    def next_task(self, owner: Owner) -> Task | None:
+        """Return the single most urgent open task, or None if nothing is open"""
+        return self.ready_queue(owner).peek()
+
+    def next_tasks(self, owner: Owner, n: int) -> List[Task]:
+        """Return the n most urgent open tasks in plan order"""
+        return self.ready_queue(owner).peek_n(n)
+
     def calculate_next_due_date(self, task: Task) -> datetime | None:
         """
         Calculate the next due date for a recurring task based on its recurrence pattern
@@ -127,23 +867,11 @@ class Scheduler:
         Returns:
             The next due date as a datetime, or None if the task is not recurring
         """
-        if task.recurrence == Recurrence.ONCE or task.due_date is None:
-            return None
-
-        # Calculate the interval based on recurrence pattern
-        if task.recurrence == Recurrence.DAILY:
-            interval = timedelta(days=1)
-        elif task.recurrence == Recurrence.WEEKLY:
-            interval = timedelta(days=7)
-        elif task.recurrence == Recurrence.BIWEEKLY:
-            interval = timedelta(days=14)
-        elif task.recurrence == Recurrence.MONTHLY:
-            interval = timedelta(days=30)
-        else:
+        if task.interval_days is None or task.due_date is None:
             return None
 
         # Return the current due_date + interval
-        return task.due_date + interval
+        return task.due_date + timedelta(days=task.interval_days)
 
     def create_next_recurring_task(self, task: Task) -> Task | None:
         """
@@ -162,19 +890,8 @@ class Scheduler:
         if next_due_date is None:
             return None
 
-        # Create a new task with the same properties but new due date
-        return Task(
-            name=task.name,
-            priority=task.priority,
-            duration=task.duration,
-            due_date=next_due_date,
-            start_time=task.start_time,
-            completed=False,
-            description=task.description,
-            recurrence=task.recurrence,
-            recurrence_days=task.recurrence_days,
-            last_completed=None
-        )
+        # The next occurrence shares the task's template; only the due date is new
+        return Task(template=task.template, due_date=next_due_date)
 
     def complete_task(self, owner: Owner, task: Task) -> Task | None:
         """
@@ -188,18 +905,17 @@ class Scheduler:
             The next recurring task if created, or None if the task is not recurring
         """
         # Mark the current task as completed
-        task.completed = True
-        task.last_completed = datetime.now()
+        owner.update_task(task, completed=True, last_completed=datetime.now())
 
         # If the task is recurring, create the next occurrence
         if task.recurrence != Recurrence.ONCE:
             next_task = self.create_next_recurring_task(task)
             if next_task:
-                # Find the pet that has this task and add the next occurrence
-                for pet in owner.pets:
-                    if task in pet.tasks:
-                        pet.add_task(next_task)
-                        return next_task
+                # Add the next occurrence to the pet that has this task
+                pet = owner.pet_of(task)
+                if pet is not None:
+                    pet.add_task(next_task)
+                    return next_task
         return None
 
     def sort_by_time(self, tasks: List[Task]) -> List[Task]:
@@ -213,10 +929,9 @@ class Scheduler:
             List of tasks sorted by due date (soonest first), with tasks without due dates last
         """
         def sort_key(task):
-            """Sort by due date and time. None due dates go last."""
-            if task.due_date is None:
-                return (float('inf'), 0)  # No due date goes last
-            return (task.due_date, 0)
+            """Sort by due minute, then the full due date for sub-minute order. None due dates go last."""
+            minute = task.due_minute
+            return (NO_DUE_DAY * 1440,) if minute is None else (minute, task.due_date)
 
         return sorted(tasks, key=sort_key)
 
@@ -264,32 +979,77 @@ class Scheduler:
             List of scheduled tasks sorted by priority (high first), due date urgency (soonest/overdue first), then by duration (shortest first)
         """
         # Retrieve all tasks from pets
-        all_tasks = self.get_all_pet_tasks(owner)
+        return self.order_tasks(self.get_all_pet_tasks(owner))
 
-        # Priority order for sorting: high < medium < low
-        priority_order = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
-
-        def sort_key(task):
-            """Sort by priority, then due date urgency, then duration"""
-            priority = priority_order[task.priority]
-
-            # Calculate days until due (negative = overdue, high number = far away)
-            if task.due_date is None:
-                days_until_due = float('inf')  # No due date goes last
-            else:
-                due_date_only = task.due_date.date()
-                today = datetime.now().date()
-                days_until_due = (due_date_only - today).days
+    def order_tasks(self, all_tasks: List[Task]) -> List[Task]:
+        """
+        Sort any list of tasks in plan order (see create_plan)
 
-            duration = task.duration
+        Args:
+            all_tasks: Tasks to order, e.g. a due-date bucket from owner.due_index
 
-            return (priority, days_until_due, duration)
+        Returns:
+            List of tasks sorted by priority, due date urgency, then duration
+        """
+        today = datetime.now().date()
 
         # Sort tasks by priority, then by due date urgency, then by duration
-        scheduled = sorted(all_tasks, key=sort_key)
+        scheduled = sorted(all_tasks, key=lambda task: self.plan_key(task, today))
 
         return scheduled
 
+    def plan_key(self, task: Task, today: date) -> tuple:
+        """Sort by priority, then due date urgency, then duration"""
+        template = task.template
+        priority = PRIORITY_RANK[template.priority]
+
+        # Days until due (negative = overdue, high number = far away); no due date goes last
+        days_until_due = (task._times or task._time_model())[0] - today.toordinal()
+
+        return (priority, days_until_due, template.duration)
+
+    def iter_plan(self, owner: Owner, top_k: int = None, max_minutes: int = None,
+                  include_completed: bool = True) -> Iterator[Task]:
+        """
+        Lazily yield the owner's tasks in create_plan order
+
+        Only the tasks actually consumed are ordered: the task list is heapified
+        in O(n) and each yielded task costs O(log n), so taking k tasks is
+        O(n + k log n) instead of a full sort.
+
+        Args:
+            owner: The pet owner
+            top_k: Stop after this many tasks
+            max_minutes: Stop before the first task that would push the cumulative
+                duration past this many minutes
+            include_completed: False to plan only open tasks
+
+        Yields:
+            Tasks in plan order (ties keep their original order, as in create_plan)
+        """
+        today = datetime.now().date()
+        all_tasks = self.get_all_pet_tasks(owner)
+        if not include_completed:
+            all_tasks = [task for task in all_tasks if not task.completed]
+
+        if max_minutes is None and top_k is not None:
+            # nsmallest is equivalent to sorted(...)[:top_k], including stability
+            yield from heapq.nsmallest(top_k, all_tasks, key=lambda task: self.plan_key(task, today))
+            return
+
+        heap = [(self.plan_key(task, today), i, task) for i, task in enumerate(all_tasks)]
+        heapq.heapify(heap)
+
+        yielded = 0
+        total_minutes = 0
+        while heap and (top_k is None or yielded < top_k):
+            task = heapq.heappop(heap)[2]
+            if max_minutes is not None and total_minutes + task.duration > max_minutes:
+                return
+            total_minutes += task.duration
+            yielded += 1
+            yield task
+
     def explain_plan(self, tasks: List[Task]) -> str:
         """
         Explain the scheduled plan in human-readable format
@@ -305,14 +1065,14 @@ class Scheduler:
 
         total_time = sum(t.duration for t in tasks)
 
-        explanation = f"Schedule Plan: {len(tasks)} tasks, {total_time} minutes total\n\n"
-
+        # Collect the lines and join once: repeated += would copy the text so far for every task
+        lines = [f"Schedule Plan: {len(tasks)} tasks, {total_time} minutes total\n\n"]
         for i, task in enumerate(tasks, 1):
-            explanation += f"{i}. {task.name} - Priority {task.priority} - {task.duration} min\n"
+            lines.append(f"{i}. {task.name} - Priority {task.priority} - {task.duration} min\n")
             if task.description:
-                explanation += f"   {task.description}\n"
+                lines.append(f"   {task.description}\n")
 
-        return explanation
+        return "".join(lines)
 
     def _tasks_overlap(self, task1: Task, task2: Task) -> bool:
         """
@@ -327,49 +1087,329 @@ class Scheduler:
         if not task1.due_date or not task2.due_date:
             return False
 
-        # Use start_time if available, otherwise use midnight
-        start_time1 = task1.start_time if task1.start_time else datetime.min.time()
-        start_time2 = task2.start_time if task2.start_time else datetime.min.time()
-
-        # Combine due_date with start_time to get full datetime
-        start1 = datetime.combine(task1.due_date.date(), start_time1)
-        start2 = datetime.combine(task2.due_date.date(), start_time2)
+        # Use start_time if available, otherwise midnight of the due day
+        start1 = task1.start_minute if task1.start_time else task1.due_day * 1440
+        start2 = task2.start_minute if task2.start_time else task2.due_day * 1440
 
         # Calculate end times based on duration
-        end1 = start1 + timedelta(minutes=task1.duration)
-        end2 = start2 + timedelta(minutes=task2.duration)
+        end1 = start1 + task1.duration
+        end2 = start2 + task2.duration
 
         # Check for overlap: task1 starts before task2 ends AND task2 starts before task1 ends
         return start1 < end2 and start2 < end1
 
-    def detect_conflicts(self, owner: Owner) -> List[str]:
+    def detect_conflicts(self, owner: Owner, executor: Executor = None) -> List[str]:
         """
         Detect scheduling conflicts between tasks with explicit start times.
         Only checks tasks that have scheduled appointment times; flexible tasks without
         start times are not checked for conflicts.
 
+        Tasks are partitioned by conflict scope (see conflict_scope) and each
+        partition is swept in start-time order, so only tasks sharing a scope are
+        compared and the work is O(n log n + conflicts) rather than every pair.
+
         Args:
             owner: The pet owner
+            executor: Optional executor (e.g. a ProcessPoolExecutor) used to check
+                partitions of at least PARALLEL_SCOPE_SIZE tasks in parallel
 
         Returns:
             List of warning messages about conflicts, empty if no conflicts
         """
-        all_tasks = self.get_all_pet_tasks(owner)
         warnings = []
-
-        # Compare each task with every other task (avoiding duplicates)
-        for i, task1 in enumerate(all_tasks):
-            for task2 in all_tasks[i + 1:]:
-                # Only check conflicts for tasks that both have explicit start times
-                if task1.start_time and task2.start_time:
-                    if self._tasks_overlap(task1, task2):
-                        pet1 = next((p.name for p in owner.pets if task1 in p.tasks), "Unknown")
-                        pet2 = next((p.name for p in owner.pets if task2 in p.tasks), "Unknown")
-                        warning = f"⚠️ Conflict: '{task1.name}' ({pet1}) overlaps with '{task2.name}' ({pet2})"
-                        warnings.append(warning)
+        for task1, task2 in self.iter_conflicts(owner, executor):
+            pet1 = getattr(owner.pet_of(task1), "name", "Unknown")
+            pet2 = getattr(owner.pet_of(task2), "name", "Unknown")
+            warning = f"⚠️ Conflict: '{task1.name}' ({pet1}) overlaps with '{task2.name}' ({pet2})"
+            warnings.append(warning)
 
         return warnings
 
+    def iter_conflicts(self, owner: Owner, executor: Executor = None) -> Iterator[tuple]:
+        """
+        Yield each conflicting (task1, task2) pair found by detect_conflicts, in the
+        same order, without building the warning messages
+
+        The pairs are found as index pairs and sorted into task order before the
+        first one is yielded, so memory grows with the number of conflicts.
+
+        Args:
+            owner: The pet owner
+            executor: See detect_conflicts
+
+        Yields:
+            (task1, task2) tuples, task1 coming first in task order
+        """
+        all_tasks = self.get_all_pet_tasks(owner)
+
+        # Only check conflicts for tasks that have an explicit start time and a day
+        partitions: Dict[str, list] = {}
+        for i, task in enumerate(all_tasks):
+            if task.start_time and task.due_date:
+                scope = conflict_scope(task, owner.pet_of(task))
+                partitions.setdefault(scope, []).append((task.start_minute, task.end_minute, i))
+
+        large = [p for p in partitions.values() if executor is not None and len(p) >= PARALLEL_SCOPE_SIZE]
+        small = [p for p in partitions.values() if executor is None or len(p) < PARALLEL_SCOPE_SIZE]
+        pairs = []
+        for partition in small:
+            pairs.extend(_sweep_overlaps(partition))
+        if large:
+            for found in executor.map(_sweep_overlaps, large):
+                pairs.extend(found)
+
+        # Report in task order, as comparing each task with every later task would
+        pairs.sort()
+        for i, j in pairs:
+            yield all_tasks[i], all_tasks[j]
+
+    def find_conflicts_ahead(self, owner: Owner, days: int = 90, limit: int = 10,
+                             start: date = None) -> List[Collision]:
+        """
+        Find the first collisions between open timed tasks over a horizon, including
+        future occurrences of recurring tasks that don't exist yet
+
+        Recurrence is expanded analytically: a task due on day a every p days and one
+        due on day b every q days meet on the days solving x = a (mod p), x = b (mod q),
+        which (by the Chinese remainder theorem) repeat every lcm(p, q) days. Each pair
+        therefore costs O(1) plus O(1) per reported collision, independent of `days`.
+
+        Args:
+            owner: The pet owner
+            days: Length of the horizon in days, starting at `start`
+            limit: Maximum number of collisions to report
+            start: First day of the horizon (defaults to today)
+
+        Returns:
+            Collisions ordered by day, at most `limit` of them
+        """
+        start = start or datetime.now().date()
+        first_day = start.toordinal()
+        last_day = first_day + days - 1
+        partitions: Dict[str, List[Task]] = {}
+        for task in self.get_all_pet_tasks(owner):
+            if task.start_time and task.due_date and not task.completed:
+                partitions.setdefault(conflict_scope(task, owner.pet_of(task)), []).append(task)
+
+        streams = []
+        for timed in partitions.values():
+            for i, task1 in enumerate(timed):
+                for task2 in timed[i + 1:]:
+                    streams.append(_pair_collision_days(task1, task2, first_day, last_day, len(streams)))
+
+        collisions = []
+        for day, _, task1, task2 in heapq.merge(*streams):
+            if len(collisions) >= limit:
+                break
+            collisions.append(Collision(
+                day=date.fromordinal(day),
+                task1=task1,
+                task2=task2,
+                pet1=getattr(owner.pet_of(task1), "name", "Unknown"),
+                pet2=getattr(owner.pet_of(task2), "name", "Unknown")
+            ))
+        return collisions
+
+
+@dataclass
+class Collision:
+    """Two task occurrences that overlap, found by Scheduler.find_conflicts_ahead"""
+    day: date  # day of task1's occurrence
+    task1: Task
+    task2: Task
+    pet1: str
+    pet2: str
+
+    @property
+    def message(self) -> str:
+        return (f"⚠️ Conflict on {self.day.isoformat()}: '{self.task1.name}' ({self.pet1}) "
+                f"overlaps with '{self.task2.name}' ({self.pet2})")
+
+
+def _sweep_overlaps(intervals: List[tuple]) -> List[tuple]:
+    """
+    Find every overlapping pair among (start, end, index) intervals with a sweep line
+
+    Returns:
+        (lower index, higher index) pairs of overlapping intervals
+    """
+    pairs = []
+    active = []  # heap of (end, start, index) for intervals that started and haven't ended
+    for start, end, index in sorted(intervals):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        # A zero-length task only overlaps tasks that started strictly before it
+        pairs.extend((min(index, other), max(index, other))
+                     for _, other_start, other in active if other_start < end)
+        if start < end:
+            heapq.heappush(active, (end, start, index))
+    return pairs
+
+
+def _occurrence_days(first: int, period: int | None, lo: int, hi: int) -> Iterator[int]:
+    """Days in [lo, hi] of a series starting on `first` and repeating every `period` days"""
+    if period is None:
+        if lo <= first <= hi:
+            yield first
+        return
+    day = first if first >= lo else first + -(-(lo - first) // period) * period
+    while day <= hi:
+        yield day
+        day += period
+
+
+def _pair_collision_days(task1: Task, task2: Task, lo: int, hi: int, order: int) -> Iterator[tuple]:
+    """
+    Yield (day, order, task1, task2) for each day in [lo, hi] on which an occurrence
+    of task1 overlaps an occurrence of task2, in increasing day order
+    """
+    a, p = task1.due_day, task1.interval_days
+    b, q = task2.due_day, task2.interval_days
+    s1 = task1.start_minute - a * 1440
+    s2 = task2.start_minute - b * 1440
+
+    # Day offsets k (task2's day minus task1's day) for which the time windows overlap:
+    # s1 < s2 + 1440k + duration2 and s2 + 1440k < s1 + duration1
+    k_lo = (s1 - s2 - task2.duration) // 1440 + 1
+    k_hi = -(-(s1 + task1.duration - s2) // 1440) - 1
+
+    streams = []
+    for k in range(k_lo, k_hi + 1):
+        # task1 occurs on day x, task2 on day x + k, so x must be in both series
+        b_k = b - k
+        start = max(a, b_k)
+        if p is None or q is None:
+            # At most one meeting: the one-time task's day, if the other series hits it
+            x, other_first, other_period = (a, b_k, q) if p is None else (b_k, a, p)
+            if x >= other_first and (other_period is None and x == other_first
+                                     or other_period is not None and (x - other_first) % other_period == 0):
+                streams.append(_occurrence_days(x, None, lo, hi))
+            continue
+
+        g = math.gcd(p, q)
+        if (b_k - a) % g:
+            continue  # the two series never land on the same day
+        step = p // g * q
+        # Solve a + p*t = b_k (mod q) for t
+        t = ((b_k - a) // g) * pow(p // g, -1, q // g) % (q // g) if q // g > 1 else 0
+        x = a + p * t
+        if x < start:
+            x += -(-(start - x) // step) * step
+        streams.append(_occurrence_days(x, step, lo, hi))
+
+    previous = None
+    for day in heapq.merge(*streams):
+        if day != previous:  # long tasks can meet on the same day at two offsets
+            yield day, order, task1, task2
+        previous = day
+
+
+# History Compaction
+
+@dataclass
+class TaskHistory:
+    """Rolled-up statistics for a pet's completed occurrences of one recurring task"""
+    name: str
+    count: int = 0
+    total_minutes: int = 0
+    on_time: int = 0  # completed on or before the due date
+    total_days_late: int = 0
+    first_done: datetime = None
+    last_done: datetime = None
+    last_due: datetime = None
+    streak: int = 0  # consecutive on-time completions, ending with the latest one
+    best_streak: int = 0
+
+    def add(self, task: Task) -> None:
+        """Fold one completed occurrence into the aggregate (oldest first)"""
+        done = task.last_completed
+        days_late = max(0, (done.date() - task.due_date.date()).days) if done and task.due_date else 0
+
+        self.count += 1
+        self.total_minutes += task.duration
+        self.total_days_late += days_late
+        if days_late == 0:
+            self.on_time += 1
+            self.streak += 1
+            self.best_streak = max(self.best_streak, self.streak)
+        else:
+            self.streak = 0
+        if done:
+            self.first_done = min(self.first_done or done, done)
+            self.last_done = max(self.last_done or done, done)
+        if task.due_date:
+            self.last_due = max(self.last_due or task.due_date, task.due_date)
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    How much completed recurring history to keep in full detail
+
+    A completed occurrence is kept if it is one of the last `keep_last`
+    completions of its task, or was completed within the last `keep_days` days.
+    Everything older is rolled into the pet's TaskHistory aggregates.
+    """
+    keep_last: int = 10
+    keep_days: int = None
+
+    def keeps(self, task: Task, position_from_end: int, now: datetime) -> bool:
+        if position_from_end < self.keep_last:
+            return True
+        if self.keep_days is not None and task.last_completed is not None:
+            return now - task.last_completed < timedelta(days=self.keep_days)
+        return False
+
+
+def compact_history(owner: Owner, policy: RetentionPolicy = None, budget: int = None) -> int:
+    """
+    Roll old completed recurring occurrences into per-task aggregates
+
+    Occurrences are folded oldest first, so the job can run incrementally:
+    with a `budget`, at most that many tasks are compacted per call and the
+    next call picks up where this one stopped.
+
+    Args:
+        owner: The pet owner
+        policy: What to keep in full detail (defaults to RetentionPolicy())
+        budget: Maximum number of tasks to compact in this call
+
+    Returns:
+        Number of tasks compacted (removed from pets and folded into pet.history)
+    """
+    policy = policy or RetentionPolicy()
+    now = datetime.now()
+    compacted = 0
+
+    for pet in owner.pets:
+        if budget is not None and compacted >= budget:
+            break
+
+        # Completed occurrences of each recurring task, oldest first
+        series: Dict[str, List[Task]] = {}
+        for task in pet.tasks:
+            if task.completed and task.recurrence != Recurrence.ONCE:
+                series.setdefault(task.name, []).append(task)
+
+        removed = []
+        for name, done in series.items():
+            done.sort(key=lambda t: (t.due_date or datetime.min, t.last_completed or datetime.min))
+            history = pet.history.get(name) or TaskHistory(name)
+            for i, task in enumerate(done):
+                if budget is not None and compacted >= budget:
+                    break
+                if policy.keeps(task, len(done) - 1 - i, now):
+                    break  # everything newer is kept too
+                history.add(task)
+                removed.append(task)
+                compacted += 1
+            if history.count:
+                pet.history[name] = history
+
+        pet.remove_tasks(removed)
+
+    return compacted
+
 
 # JSON Serialization/Deserialization Functions
 
@@ -385,12 +1425,27 @@ def task_to_dict(task: Task) -> dict:
         "description": task.description,
         "recurrence": task.recurrence.value,
         "recurrence_days": task.recurrence_days,
-        "last_completed": task.last_completed.isoformat() if task.last_completed else None
+        "last_completed": task.last_completed.isoformat() if task.last_completed else None,
+        "scope": task.scope,
+        "id": task.id
     }
 
 
-def dict_to_task(data: dict) -> Task:
-    """Convert a dictionary back to a Task object"""
+def dict_to_task(data: dict, templates: List[TaskTemplate] = None) -> Task:
+    """
+    Convert a dictionary back to a Task object
+
+    Accepts both a full task_to_dict() record and the compact occurrence records
+    pet_to_dict() writes, which refer to an entry of the pet's template table.
+    """
+    if "template" in data and templates is not None:
+        return Task(
+            template=templates[data["template"]],
+            due_date=datetime.fromisoformat(data["due_date"]) if data.get("due_date") else None,
+            completed=data.get("completed", False),
+            last_completed=datetime.fromisoformat(data["last_completed"]) if data.get("last_completed") else None,
+            id=data.get("id") or new_task_id()
+        )
     return Task(
         name=data["name"],
         priority=Priority(data["priority"]),
@@ -401,31 +1456,115 @@ def dict_to_task(data: dict) -> Task:
         description=data.get("description"),
         recurrence=Recurrence(data.get("recurrence", "once")),
         recurrence_days=data.get("recurrence_days"),
-        last_completed=datetime.fromisoformat(data["last_completed"]) if data.get("last_completed") else None
+        last_completed=datetime.fromisoformat(data["last_completed"]) if data.get("last_completed") else None,
+        scope=data.get("scope"),
+        id=data.get("id") or new_task_id()  # files saved before ids existed get fresh ones
+    )
+
+
+def template_to_dict(template: TaskTemplate) -> dict:
+    """Convert a TaskTemplate to a dictionary for JSON serialization"""
+    return {
+        "name": template.name,
+        "priority": template.priority.value,
+        "duration": template.duration,
+        "start_time": template.start_time.isoformat() if template.start_time else None,
+        "description": template.description,
+        "recurrence": template.recurrence.value,
+        "recurrence_days": template.recurrence_days,
+        "scope": template.scope
+    }
+
+
+def dict_to_template(data: dict) -> TaskTemplate:
+    """Convert a dictionary back to an (interned) TaskTemplate"""
+    return TaskTemplate.intern(
+        name=data["name"],
+        priority=Priority(data["priority"]),
+        duration=data["duration"],
+        start_time=time.fromisoformat(data["start_time"]) if data.get("start_time") else None,
+        description=data.get("description"),
+        recurrence=Recurrence(data.get("recurrence", "once")),
+        recurrence_days=data.get("recurrence_days"),
+        scope=data.get("scope")
     )
 
 
+def occurrence_to_dict(task: Task, template_index: int) -> dict:
+    """The per-occurrence part of a task, pointing at its pet's template table"""
+    data = {"template": template_index, "id": task.id}
+    if task.due_date:
+        data["due_date"] = task.due_date.isoformat()
+    if task.completed:
+        data["completed"] = True
+    if task.last_completed:
+        data["last_completed"] = task.last_completed.isoformat()
+    return data
+
+
+def history_to_dict(history: TaskHistory) -> dict:
+    """Convert a TaskHistory aggregate to a dictionary for JSON serialization"""
+    data = dict(history.__dict__)
+    for key in ("first_done", "last_done", "last_due"):
+        data[key] = data[key].isoformat() if data[key] else None
+    return data
+
+
+def dict_to_history(data: dict) -> TaskHistory:
+    """Convert a dictionary back to a TaskHistory aggregate"""
+    data = dict(data)
+    for key in ("first_done", "last_done", "last_due"):
+        data[key] = datetime.fromisoformat(data[key]) if data.get(key) else None
+    return TaskHistory(**data)
+
+
 def pet_to_dict(pet: Pet) -> dict:
-    """Convert a Pet object to a dictionary for JSON serialization"""
+    """
+    Convert a Pet object to a dictionary for JSON serialization
+
+    Each distinct task definition is written once to the pet's "templates" table
+    and every task refers to it by index, so a long recurring history stores only
+    dates, completion state and ids per occurrence.
+    """
+    templates: Dict[TaskTemplate, int] = {}  # template -> index in the table
+    tasks = []
+    for task in pet.tasks:
+        index = templates.setdefault(task.template, len(templates))
+        tasks.append(occurrence_to_dict(task, index))
     return {
         "name": pet.name,
         "breed": pet.breed,
         "age": pet.age,
         "weight": pet.weight,
-        "tasks": [task_to_dict(task) for task in pet.tasks]
+        "scope": pet.scope,
+        "templates": [template_to_dict(template) for template in templates],
+        "tasks": tasks,
+        "history": [history_to_dict(history) for history in pet.history.values()]
     }
 
 
-def dict_to_pet(data: dict) -> Pet:
-    """Convert a dictionary back to a Pet object"""
+def dict_to_pet(data: dict, lazy: bool = False) -> Pet:
+    """
+    Convert a dictionary back to a Pet object
+
+    With lazy=True the task dicts are kept as-is and only converted the first
+    time pet.tasks is read (see Pet.defer_tasks). Files written before template
+    tables existed (full task records) load too.
+    """
     pet = Pet(
         name=data["name"],
         breed=data["breed"],
         age=data["age"],
         weight=data["weight"],
-        tasks=[]
+        tasks=[],
+        scope=data.get("scope")
     )
-    pet.tasks = [dict_to_task(task_data) for task_data in data.get("tasks", [])]
+    templates = [dict_to_template(template_data) for template_data in data.get("templates", [])]
+    if lazy:
+        pet.defer_tasks(data.get("tasks", []), templates)
+    else:
+        pet.tasks = [dict_to_task(task_data, templates) for task_data in data.get("tasks", [])]
+    pet.history = {h["name"]: dict_to_history(h) for h in data.get("history", [])}
     return pet
 
 
@@ -437,10 +1576,11 @@ def owner_to_dict(owner: Owner) -> dict:
     }
 
 
-def dict_to_owner(data: dict) -> Owner:
-    """Convert a dictionary back to an Owner object"""
+def dict_to_owner(data: dict, lazy: bool = False) -> Owner:
+    """Convert a dictionary back to an Owner object (lazy defers each pet's tasks, see dict_to_pet)"""
     owner = Owner(name=data["name"])
-    owner.pets = [dict_to_pet(pet_data) for pet_data in data.get("pets", [])]
+    for pet_data in data.get("pets", []):
+        owner.add_pet(dict_to_pet(pet_data, lazy))
     return owner
 
 
@@ -451,11 +1591,892 @@ def save_owner_to_json(owner: Owner, filename: str = "pawpal_data.json") -> None
         json.dump(data, f, indent=2)
 
 
-def load_owner_from_json(filename: str = "pawpal_data.json") -> Owner | None:
-    """Load owner and all associated data from a JSON file. Returns None if file doesn't exist."""
+def load_owner_from_json(filename: str = "pawpal_data.json", lazy: bool = False,
+                         snapshot: bool = False) -> Owner | None:
+    """
+    Load owner and all associated data from a JSON file. Returns None if file doesn't exist.
+
+    Args:
+        filename: JSON file to load
+        lazy: Defer converting each pet's tasks until they are first read
+        snapshot: Reuse (or write) a pickled copy of the fully loaded owner next
+            to the file, keyed by the file's mtime and size, so unchanged data
+            isn't parsed again. Takes precedence over lazy.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    key = (SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size)
+    if snapshot:
+        owner = _read_snapshot(snapshot_path(filename), key)
+        if owner is not None:
+            return owner
     try:
         with open(filename, "r") as f:
             data = json.load(f)
-        return dict_to_owner(data)
     except FileNotFoundError:
         return None
+    owner = dict_to_owner(data, lazy and not snapshot)
+    if snapshot:
+        _write_snapshot(snapshot_path(filename), key, owner)
+    return owner
+
+
+# Bump whenever the pickled layout of Owner/Pet/Task changes, so old snapshots are ignored
+SNAPSHOT_VERSION = 3
+
+
+def snapshot_path(filename: str) -> str:
+    """Where snapshot=True loads keep the snapshot of a JSON file (next to it) or a segmented store (inside it)"""
+    if is_segmented_store(filename):
+        return os.path.join(filename, "owner.snapshot")
+    return filename + ".snapshot"
+
+
+def _read_snapshot(path: str, key: tuple) -> Owner | None:
+    """The snapshotted owner if the snapshot matches key, else None (missing, stale or unreadable)"""
+    import pickle
+    try:
+        with open(path, "rb") as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except Exception:  # a damaged snapshot is just a cache miss
+        return None
+
+
+def _write_snapshot(path: str, key: tuple, owner: Owner) -> None:
+    """Atomically write an owner snapshot; failures (e.g. a read-only directory) are ignored"""
+    import pickle
+    owner.load_tasks()
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # unique per saving thread
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(owner, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:  # best effort: the JSON file is still the source of truth
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+# Segmented Storage
+#
+# A segmented store is a directory holding a small manifest (MANIFEST_FILE) and
+# one JSON segment per pet under pets/. The manifest lists the segments in pet
+# order with a version each, and is replaced atomically after the segments it
+# refers to are written, so readers never see a manifest pointing at missing data.
+
+MANIFEST_FILE = "owner.json"
+SEGMENT_DIR = "pets"
+
+
+def is_segmented_store(path: str) -> bool:
+    """True for a segmented store: an existing directory, or a path that doesn't exist yet and doesn't end in .json"""
+    return os.path.isdir(path) or (not path.endswith(".json") and not os.path.exists(path))
+
+
+def _write_json_atomic(path: str, data, indent: int = None) -> None:
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+def _segment_name(pet: Pet) -> str:
+    slug = "".join(c if c.isalnum() else "-" for c in pet.name.lower()).strip("-")[:40] or "pet"
+    return f"{slug}-{new_task_id()[:8]}.json"
+
+
+def read_manifest(directory: str) -> dict | None:
+    """A segmented store's manifest, or None if there is no store at `directory`"""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def save_owner_segments(owner: Owner, directory: str) -> int:
+    """
+    Save an owner as a segmented store, rewriting only the segments of dirty pets
+
+    A pet is dirty after Pet.add_task/remove_task, Owner.update_task (and so
+    Scheduler.complete_task), compaction, or assigning one of its fields.
+    Completing one task for one of N pets therefore writes one segment plus the
+    manifest instead of the whole owner. Segments of removed pets are deleted.
+
+    Returns:
+        Number of segments written
+    """
+    segment_dir = os.path.join(directory, SEGMENT_DIR)
+    os.makedirs(segment_dir, exist_ok=True)
+    previous = read_manifest(directory) or {"segments": []}
+    versions = {s["file"]: s["version"] for s in previous["segments"]}
+
+    written = 0
+    segments = []
+    for pet in owner.pets:
+        if pet._segment is None:
+            object.__setattr__(pet, "_segment", _segment_name(pet))
+        path = os.path.join(segment_dir, pet._segment)
+        version = versions.get(pet._segment)
+        if pet.dirty or version is None or not os.path.exists(path):
+            _write_json_atomic(path, pet_to_dict(pet), indent=2)
+            object.__setattr__(pet, "dirty", False)
+            # A random token rather than a counter, so two processes saving the
+            # same segment can't both produce "n + 1" and hide one save
+            version = new_task_id()
+            written += 1
+        segments.append({"file": pet._segment, "version": version})
+
+    _write_json_atomic(os.path.join(directory, MANIFEST_FILE),
+                       {"name": owner.name, "segments": segments}, indent=2)
+
+    live = {s["file"] for s in segments}
+    for stale in versions.keys() - live:
+        try:
+            os.remove(os.path.join(segment_dir, stale))
+        except FileNotFoundError:
+            pass
+    return written
+
+
+def load_segment(directory: str, segment: str, lazy: bool = False) -> Pet:
+    """Load one pet segment of a segmented store (clean, remembering its segment)"""
+    with open(os.path.join(directory, SEGMENT_DIR, segment), "r") as f:
+        pet = dict_to_pet(json.load(f), lazy)
+    object.__setattr__(pet, "_segment", segment)
+    object.__setattr__(pet, "dirty", False)
+    return pet
+
+
+def load_owner_segments(directory: str, lazy: bool = False, snapshot: bool = False) -> Owner | None:
+    """
+    Load an owner from a segmented store. Returns None if the store doesn't exist.
+
+    lazy and snapshot work as in load_owner_from_json; the snapshot is kept
+    inside the store and keyed by the manifest, which every save replaces.
+    """
+    try:
+        stat = os.stat(os.path.join(directory, MANIFEST_FILE))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    key = (SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    if snapshot:
+        owner = _read_snapshot(snapshot_path(directory), key)
+        if owner is not None:
+            return owner
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    owner = Owner(name=manifest["name"])
+    for segment in manifest["segments"]:
+        owner.add_pet(load_segment(directory, segment["file"], lazy and not snapshot))
+    if snapshot:
+        _write_snapshot(snapshot_path(directory), key, owner)
+    return owner
+
+
+def read_segment_changes(owner: Owner, directory: str, versions: Dict[str, str],
+                         lazy: bool = False) -> Tuple[dict, Dict[str, Pet]] | None:
+    """
+    Read what changed in a segmented store since an owner loaded it, without touching the owner
+
+    Loads only the segments whose version differs from `versions` (or whose
+    pet the owner doesn't have). A segment deleted between reading the
+    manifest and loading it (another process saved again meanwhile) is left
+    out until the next read. The result is applied with apply_segment_changes,
+    possibly later and on another thread.
+
+    Returns:
+        (manifest, segment file -> freshly loaded pet), or None if the store is gone
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    known = {pet._segment for pet in list(owner.pets)}
+    fresh = {}
+    for segment in manifest["segments"]:
+        file = segment["file"]
+        if file in known and versions.get(file) == segment["version"]:
+            continue
+        try:
+            fresh[file] = load_segment(directory, file, lazy)
+        except FileNotFoundError:
+            pass
+    return manifest, fresh
+
+
+def apply_segment_changes(owner: Owner, versions: Dict[str, str], manifest: dict,
+                          fresh: Dict[str, Pet]) -> Dict[str, str]:
+    """
+    Apply changes read by read_segment_changes to the owner
+
+    Changed pets are swapped in place with Owner.replace_pet, new ones added and
+    deleted ones removed, so listeners (indexes, views, reminders) see only the
+    tasks that actually changed. Pets with unsaved changes (dirty) are kept as
+    they are, so their next save wins, and pets that were never saved are kept
+    after the saved ones.
+
+    Returns:
+        The versions the owner now reflects
+    """
+    by_segment = {pet._segment: pet for pet in owner.pets if pet._segment is not None}
+    applied = {}
+    pets = []
+    for segment in manifest["segments"]:
+        file, version = segment["file"], segment["version"]
+        pet = by_segment.pop(file, None)
+        if pet is None or (versions.get(file) != version and not pet.dirty):
+            loaded = fresh.get(file)
+            if loaded is None:  # deleted before it could be read; retried next time
+                if pet is not None:
+                    pets.append(pet)
+                continue
+            if pet is None:
+                owner.add_pet(loaded)
+            else:
+                owner.replace_pet(pet, loaded)
+            pet = loaded
+        applied[file] = version
+        pets.append(pet)
+    for pet in by_segment.values():
+        owner.remove_pet(pet)
+    pets.extend(pet for pet in owner.pets if pet._segment is None)
+    owner.pets[:] = pets
+    owner.name = manifest["name"]
+    return applied
+
+
+def refresh_owner_segments(owner: Owner, directory: str, versions: Dict[str, str],
+                           lazy: bool = False) -> Dict[str, str] | None:
+    """
+    Bring an owner loaded from a segmented store up to date with what's on disk,
+    reloading only the segments whose version changed (read_segment_changes
+    followed by apply_segment_changes)
+
+    Args:
+        owner: Owner previously loaded from (or saved to) `directory`
+        directory: The segmented store
+        versions: Segment file -> version the owner currently reflects, as
+            returned by segment_versions() or a previous refresh
+
+    Returns:
+        The versions the owner now reflects, or None if the store is gone
+    """
+    changes = read_segment_changes(owner, directory, versions, lazy)
+    if changes is None:
+        return None
+    return apply_segment_changes(owner, versions, *changes)
+
+
+def segment_versions(directory: str) -> Dict[str, str] | None:
+    """Segment file -> version from a segmented store's manifest, or None if there is no store"""
+    manifest = read_manifest(directory)
+    return None if manifest is None else {s["file"]: s["version"] for s in manifest["segments"]}
+
+
+def save_owner(owner: Owner, path: str) -> None:
+    """Save to a segmented store directory, or to a single JSON file if `path` ends in .json"""
+    if is_segmented_store(path):
+        save_owner_segments(owner, path)
+    else:
+        save_owner_to_json(owner, path)
+
+
+def load_owner(path: str, lazy: bool = False, snapshot: bool = False) -> Owner | None:
+    """Load from a segmented store directory or a single JSON file (see save_owner)"""
+    if is_segmented_store(path):
+        return load_owner_segments(path, lazy, snapshot)
+    return load_owner_from_json(path, lazy, snapshot)
+
+
+class OwnerCache:
+    """
+    Process-wide cache of loaded owners, shared by every app session
+
+    Each file (a JSON file or a segmented store directory, see save_owner) is
+    parsed once and the resulting Owner is handed to every session
+    that acquires it. Sessions register with acquire()/put() and unregister with
+    release(); once more than `capacity` files are cached, the least recently used
+    entries with no sessions left are evicted. Writes go through write() (or
+    save()), which serialize on a per-file lock and record the file's stamp
+    (mtime, inode, size) so only changes made outside the cache trigger a reload.
+    With snapshot=True, loads go through the pickled snapshot cache (see
+    load_owner).
+
+    Changes saved by other processes (e.g. other app workers) are applied on
+    the next get()/acquire()/write(), on the calling thread. A JSON file is
+    reloaded whole into a new Owner; a segmented store is refreshed in place,
+    re-reading only the pets whose segment version changed (see
+    refresh_owner_segments). watch() does the reading ahead of time on a
+    background thread, so applying is cheap, but never mutates an owner itself.
+    Before saving, write() applies outside changes first so it doesn't drop
+    another process's changes (and refuses to recreate a deleted file); that can
+    replace Owner, Pet and Task objects, so look them up inside the `with` block
+    (e.g. Owner.get_task).
+    """
+
+    def __init__(self, capacity: int = 16, snapshot: bool = False):
+        self.capacity = capacity
+        self.snapshot = snapshot
+        self._entries: OrderedDict[str, dict] = OrderedDict()  # filename -> entry, oldest first
+        self._lock = threading.RLock()
+        self._stop_watching = threading.Event()
+        self._watcher = None
+
+    @staticmethod
+    def _stamp(filename: str) -> tuple | None:
+        # Every save of a segmented store replaces its manifest, so that stands in for the store
+        if is_segmented_store(filename):
+            filename = os.path.join(filename, MANIFEST_FILE)
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+    def _load(self, filename: str) -> tuple:
+        """(owner, stamp, segment versions) read fresh from disk"""
+        # Stamp and versions are read before the data, so a save landing mid-load
+        # shows up as a change next time instead of being missed
+        stamp = self._stamp(filename)
+        versions = segment_versions(filename) if is_segmented_store(filename) else None
+        return load_owner(filename, snapshot=self.snapshot), stamp, versions
+
+    def _read_changes(self, filename: str, entry: dict) -> tuple | None:
+        """
+        (stamp, entry version, changes) read from disk without mutating the
+        entry's owner, or None if the file is gone. Changes are a new owner and
+        its versions for a JSON file, read_segment_changes() for a store.
+        """
+        version = entry["version"]
+        if entry["segments"] is None:
+            owner, stamp, versions = self._load(filename)
+            return None if owner is None else (stamp, version, (owner, versions))
+        stamp = self._stamp(filename)
+        changes = read_segment_changes(entry["owner"], filename, entry["segments"])
+        return None if changes is None else (stamp, version, changes)
+
+    def _refresh(self, filename: str, entry: dict) -> bool:
+        """Apply outside changes to an entry (caller holds its lock); False if the file is gone"""
+        stamp = self._stamp(filename)
+        if entry["stamp"] is None or entry["stamp"] == stamp:
+            return True
+        # Use what watch() read ahead, unless the file or the entry changed since
+        pending = entry.pop("pending", None)
+        if pending is None or pending[:2] != (stamp, entry["version"]):
+            pending = self._read_changes(filename, entry)
+            if pending is None:
+                return False
+        stamp, _, changes = pending
+        if entry["segments"] is not None:
+            versions = apply_segment_changes(entry["owner"], entry["segments"], *changes)
+            entry.update(stamp=stamp, segments=versions, version=entry["version"] + 1)
+        else:
+            owner, versions = changes
+            entry.update(owner=owner, stamp=stamp, segments=versions, version=entry["version"] + 1)
+        return True
+
+    def _prefetch(self) -> None:
+        """Read outside changes to every cached owner ahead of time (see watch())"""
+        with self._lock:
+            entries = list(self._entries.items())
+        for filename, entry in entries:
+            stamp = self._stamp(filename)
+            pending = entry.get("pending")
+            if entry["stamp"] is None or stamp in (entry["stamp"], pending and pending[0]):
+                continue
+            if not entry["lock"].acquire(blocking=False):
+                continue  # a writer is refreshing it anyway
+            try:
+                pending = self._read_changes(filename, entry)
+            finally:
+                entry["lock"].release()
+            if pending is not None:
+                entry["pending"] = pending
+
+    def _entry(self, filename: str, touch: bool = True) -> dict | None:
+        """Look up an entry, applying changes made behind the cache's back"""
+        entry = self._entries.get(filename)
+        if entry is None:
+            return None
+        # A writer holding the entry applies outside changes itself before saving
+        if entry["lock"].acquire(blocking=False):
+            try:
+                if not self._refresh(filename, entry):
+                    del self._entries[filename]
+                    return None
+            finally:
+                entry["lock"].release()
+        if touch:
+            self._entries.move_to_end(filename)
+        return entry
+
+    def get(self, filename: str = "pawpal_data.json") -> Owner | None:
+        """The cached owner for a file (loading it if needed), without registering a session"""
+        with self._lock:
+            entry = self._entry(filename)
+            if entry is None:
+                owner, stamp, versions = self._load(filename)
+                if owner is None:
+                    return None
+                entry = self._store(filename, owner, stamp, versions)
+            return entry["owner"]
+
+    def acquire(self, filename: str = "pawpal_data.json") -> Owner | None:
+        """Register a session using a file and return its shared owner, or None if the file doesn't exist"""
+        with self._lock:
+            owner = self.get(filename)
+            if owner is not None:
+                self._entries[filename]["refs"] += 1
+            return owner
+
+    def put(self, owner: Owner, filename: str = "pawpal_data.json") -> Owner:
+        """Register a newly created owner for a file that hasn't been saved yet"""
+        with self._lock:
+            entry = self._store(filename, owner, None, None)
+            entry["refs"] += 1
+            return owner
+
+    def release(self, filename: str = "pawpal_data.json") -> None:
+        """Unregister a session; unused entries become eligible for eviction"""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None and entry["refs"] > 0:
+                entry["refs"] -= 1
+            self._evict()
+
+    def invalidate(self, filename: str = "pawpal_data.json") -> None:
+        """Drop a file's owner so the next get()/acquire() reloads it"""
+        with self._lock:
+            self._entries.pop(filename, None)
+
+    def version(self, filename: str = "pawpal_data.json") -> int:
+        """Counter bumped on every write or reload, for callers caching derived data"""
+        with self._lock:
+            entry = self._entries.get(filename)
+            return entry["version"] if entry else 0
+
+    @contextmanager
+    def read(self, filename: str = "pawpal_data.json"):
+        """
+        Hold a cached owner (or None if the file doesn't exist) while reading it
+
+        Every session shares one mutable Owner, so reads that iterate it (due-date
+        buckets, view rows, plans) take the same per-file lock as write() and
+        refreshes, instead of racing them. Hold it for a whole render, e.g. one
+        app rerun; write() inside the block reuses the lock.
+
+        Usage:
+            with cache.read("pawpal_data.json") as owner:
+                rows = list(task_view(owner).rows())
+        """
+        with self._lock:
+            if self.get(filename) is None:
+                entry = None
+            else:
+                entry = self._entries[filename]
+        if entry is None:
+            yield None
+            return
+        with entry["lock"]:
+            yield entry["owner"] if self._refresh(filename, entry) else None
+
+    @contextmanager
+    def write(self, filename: str = "pawpal_data.json"):
+        """
+        Mutate a cached owner and save it, one writer per file at a time
+
+        Outside changes are applied on entry (a JSON file is reloaded whole, a
+        store refreshed in place), so another process's save isn't overwritten.
+        That may replace the owner, pets and tasks, so use the yielded owner and
+        look up the objects to change inside the block rather than reusing ones
+        held from before. Raises FileNotFoundError, saving nothing, if the file
+        was deleted since it was loaded.
+
+        Usage:
+            with cache.write("pawpal_data.json") as owner:
+                scheduler.complete_task(owner, owner.get_task(task_id))
+        """
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is None:
+                raise KeyError(f"{filename} is not cached")
+        with entry["lock"]:
+            if not self._refresh(filename, entry):
+                # Deleted (e.g. reset) by another session or process since it was
+                # loaded: saving would bring it back from stale memory
+                with self._lock:
+                    if self._entries.get(filename) is entry:
+                        del self._entries[filename]
+                raise FileNotFoundError(f"{filename} was deleted since it was loaded; not saving over it")
+            yield entry["owner"]
+            save_owner(entry["owner"], filename)
+            segmented = is_segmented_store(filename)
+            entry.update(stamp=self._stamp(filename), version=entry["version"] + 1,
+                         segments=segment_versions(filename) if segmented else None)
+
+    def save(self, filename: str = "pawpal_data.json") -> None:
+        """Save a cached owner after changes made outside write()"""
+        with self.write(filename):
+            pass
+
+    def refresh(self) -> None:
+        """Apply outside changes to every cached owner now, on the calling thread"""
+        with self._lock:
+            for filename in list(self._entries):
+                self._entry(filename, touch=False)
+
+    def watch(self, interval: float = 1.0) -> threading.Thread:
+        """
+        Every `interval` seconds until unwatch(), read outside changes to cached
+        owners on a daemon thread, so the next get()/acquire() only has to apply
+        them. The thread never mutates an owner sessions may be reading. Polling
+        costs one stat() per cached file per interval. Calling it again while
+        watching returns the running thread.
+        """
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return self._watcher
+
+            def loop():
+                while not self._stop_watching.wait(interval):
+                    self._prefetch()
+
+            self._stop_watching.clear()
+            self._watcher = threading.Thread(target=loop, name="pawpal-owner-watch", daemon=True)
+            self._watcher.start()
+            return self._watcher
+
+    def unwatch(self) -> None:
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, filename: str, owner: Owner, stamp: tuple | None, versions: Dict[str, int] | None) -> dict:
+        entry = self._entries.get(filename)
+        if entry is None:
+            entry = {"owner": owner, "stamp": stamp, "segments": versions, "refs": 0, "version": 0,
+                     "lock": threading.RLock()}
+            self._entries[filename] = entry
+        else:
+            entry.update(owner=owner, stamp=stamp, segments=versions, version=entry["version"] + 1)
+        self._entries.move_to_end(filename)
+        self._evict(keep=filename)
+        return entry
+
+    def _evict(self, keep: str = None) -> None:
+        excess = len(self._entries) - self.capacity
+        if excess <= 0:
+            return
+        unused = [f for f, e in self._entries.items() if e["refs"] == 0 and f != keep]
+        for filename in unused[:excess]:
+            del self._entries[filename]
+
+
+# Shared by every session in the process (Streamlit runs sessions as threads); the
+# snapshot lets a restarted app skip re-parsing an unchanged data file
+owner_cache = OwnerCache(snapshot=True)
+
+
+# Bulk Import/Export Functions
+
+# Columns used by CSV/JSON Lines task files, one row per task
+TASK_COLUMNS = [
+    "id", "pet", "name", "priority", "duration", "due_date", "start_time", "completed",
+    "description", "recurrence", "recurrence_days", "last_completed", "scope"
+]
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a bulk task import"""
+    added: int = 0
+    pets_created: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _parse_column(values: list, parse, column: str, errors: Dict[int, str]) -> list:
+    """
+    Parse one column for every row, caching by raw value so repeated values
+    (the same dates, priorities, durations) are only parsed once per batch
+    """
+    cache = {}
+    parsed = []
+    for row, raw in enumerate(values):
+        if raw in (None, ""):
+            parsed.append(None)
+            continue
+        try:
+            ok, value = cache[raw]
+        except KeyError:
+            try:
+                ok, value = True, parse(raw)
+            except (TypeError, ValueError):
+                ok, value = False, None
+            cache[raw] = (ok, value)
+        except TypeError:  # unhashable, e.g. a list or object in JSON Lines; never valid
+            ok, value = False, None
+        if not ok:
+            errors.setdefault(row, f"invalid {column} {raw!r}")
+        parsed.append(value)
+    return parsed
+
+
+def _enum_parser(enum_cls):
+    """Build a parser mapping case-insensitive enum values (e.g. "High") to members"""
+    lookup = {member.value: member for member in enum_cls}
+
+    def parse(raw):
+        try:
+            return lookup[str(raw).strip().lower()]
+        except KeyError:
+            raise ValueError(raw)
+    return parse
+
+
+def _parse_bool(raw) -> bool:
+    if isinstance(raw, bool):
+        return raw
+    text = str(raw).strip().lower()
+    if text in ("true", "1", "yes"):
+        return True
+    if text in ("false", "0", "no"):
+        return False
+    raise ValueError(raw)
+
+
+def _parse_datetime(raw) -> datetime:
+    if isinstance(raw, str):
+        value = datetime.fromisoformat(raw)
+    elif isinstance(raw, datetime):
+        value = raw
+    elif isinstance(raw, date):
+        value = datetime.combine(raw, datetime.min.time())
+    else:
+        raise TypeError(raw)
+    if value.tzinfo is not None:
+        # PawPal's datetimes are naive local time; comparing them with aware ones fails
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _parse_time(raw) -> time:
+    value = time.fromisoformat(raw) if isinstance(raw, str) else raw
+    if not isinstance(value, time) or value.tzinfo is not None:
+        raise ValueError(raw)
+    return value
+
+
+def _parse_text(raw) -> str:
+    if not isinstance(raw, str):
+        raise TypeError(raw)
+    return raw
+
+
+def _parse_int(raw) -> int:
+    """A whole number, as an int, a whole float (JSON 5.0) or a string; never a bool"""
+    if isinstance(raw, bool) or (isinstance(raw, float) and not raw.is_integer()):
+        raise ValueError(raw)
+    return int(raw)
+
+
+def _parse_positive_int(raw) -> int:
+    value = _parse_int(raw)
+    if value <= 0:
+        raise ValueError(raw)
+    return value
+
+
+def _parse_non_negative_int(raw) -> int:
+    value = _parse_int(raw)
+    if value < 0:
+        raise ValueError(raw)
+    return value
+
+
+def _parse_non_negative_float(raw) -> float:
+    value = float(raw)
+    if not value >= 0:  # also rejects NaN
+        raise ValueError(raw)
+    return value
+
+
+def import_tasks(owner: Owner, rows: Iterable[dict], filename: str = None, strict: bool = False) -> ImportResult:
+    """
+    Add many tasks to an owner in one batch
+
+    Rows are validated column by column (priority, recurrence, numbers, dates,
+    text and pet columns) before any task is added, so a bad row is reported
+    by number and never stops the batch halfway. Rows naming a pet the owner doesn't have yet create
+    that pet, using the optional "breed", "age" and "weight" columns.
+
+    Args:
+        owner: The pet owner receiving the tasks
+        rows: Dicts keyed by TASK_COLUMNS (CSV rows, JSON Lines objects, ...)
+        filename: If given, the owner is saved to this file once after the batch
+        strict: Raise ValueError instead of skipping rows with errors
+
+    Returns:
+        ImportResult with counts of tasks added and pets created, plus one message per rejected row
+    """
+    rows = list(rows)
+    errors: Dict[int, str] = {}
+
+    def column(name):
+        return [row.get(name) for row in rows]
+
+    pets = column("pet")
+    names = column("name")
+    for i in range(len(rows)):
+        if not pets[i] or not str(pets[i]).strip():
+            errors.setdefault(i, "missing pet")
+        elif not names[i] or not str(names[i]).strip():
+            errors.setdefault(i, "missing name")
+
+    priorities = _parse_column(column("priority"), _enum_parser(Priority), "priority", errors)
+    durations = _parse_column(column("duration"), _parse_positive_int, "duration", errors)
+    for i, (priority, duration) in enumerate(zip(priorities, durations)):
+        if priority is None:
+            errors.setdefault(i, "missing priority")
+        elif duration is None:
+            errors.setdefault(i, "missing duration")
+
+    recurrences = _parse_column(column("recurrence"), _enum_parser(Recurrence), "recurrence", errors)
+    recurrence_days = _parse_column(column("recurrence_days"), _parse_positive_int, "recurrence_days", errors)
+    due_dates = _parse_column(column("due_date"), _parse_datetime, "due_date", errors)
+    start_times = _parse_column(column("start_time"), _parse_time, "start_time", errors)
+    completed = _parse_column(column("completed"), _parse_bool, "completed", errors)
+    last_completed = _parse_column(column("last_completed"), _parse_datetime, "last_completed", errors)
+    task_ids = _parse_column(column("id"), _parse_text, "id", errors)
+    descriptions = _parse_column(column("description"), _parse_text, "description", errors)
+    scopes = _parse_column(column("scope"), _parse_text, "scope", errors)
+    # Only used for new pets, but checked up front so a bad value can't stop the batch halfway
+    ages = _parse_column(column("age"), _parse_non_negative_int, "age", errors)
+    weights = _parse_column(column("weight"), _parse_non_negative_float, "weight", errors)
+
+    result = ImportResult(errors=[f"Row {i + 1}: {errors[i]}" for i in sorted(errors)])
+    if strict and errors:
+        raise ValueError("; ".join(result.errors))
+
+    pets_by_name = {pet.name: pet for pet in owner.pets}
+    for i, row in enumerate(rows):
+        if i in errors:
+            continue
+
+        pet_name = str(pets[i]).strip()
+        pet = pets_by_name.get(pet_name)
+        if pet is None:
+            pet = Pet(pet_name, str(row.get("breed") or "Other"), ages[i] or 0, weights[i] or 0.0, [])
+            owner.add_pet(pet)
+            pets_by_name[pet_name] = pet
+            result.pets_created += 1
+
+        task_id = task_ids[i]
+        if not task_id or owner.get_task(task_id) is not None:
+            task_id = new_task_id()
+        pet.add_task(Task(
+            id=task_id,
+            name=str(names[i]).strip(),
+            priority=priorities[i],
+            duration=durations[i],
+            due_date=due_dates[i],
+            start_time=start_times[i],
+            completed=completed[i] or False,
+            description=descriptions[i],
+            recurrence=recurrences[i] or Recurrence.ONCE,
+            recurrence_days=recurrence_days[i],
+            last_completed=last_completed[i],
+            scope=scopes[i]
+        ))
+        result.added += 1
+
+    if filename is not None:
+        save_owner(owner, filename)
+    return result
+
+
+def _open_source(source, mode: str):
+    """Open a path, or wrap an already open file so `with` leaves it open"""
+    if isinstance(source, str):
+        return open(source, mode, newline="" if "b" not in mode else None)
+    return _Borrowed(source)
+
+
+class _Borrowed:
+    """Context manager handing back a caller-owned stream without closing it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __enter__(self):
+        return self.stream
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def import_tasks_csv(owner: Owner, source, filename: str = None, strict: bool = False) -> ImportResult:
+    """Import tasks from a CSV file (path or open file) with a TASK_COLUMNS header row"""
+    import csv
+    with _open_source(source, "r") as f:
+        return import_tasks(owner, csv.DictReader(f), filename, strict)
+
+
+def import_tasks_jsonl(owner: Owner, source, filename: str = None, strict: bool = False) -> ImportResult:
+    """Import tasks from a JSON Lines file (path or open file), one task object per line"""
+    with _open_source(source, "r") as f:
+        return import_tasks(owner, (json.loads(line) for line in f if line.strip()), filename, strict)
+
+
+def iter_task_rows(owner: Owner) -> Iterator[dict]:
+    """Yield one flat TASK_COLUMNS row per task, pet by pet"""
+    for pet in owner.pets:
+        for task in pet.tasks:
+            row = task_to_dict(task)
+            row["pet"] = pet.name
+            yield row
+
+
+def export_tasks_csv(owner: Owner, destination) -> int:
+    """
+    Stream every task to a CSV file (path or writable stream)
+
+    Rows are written as they are produced, so the full owner dict is never built.
+
+    Returns:
+        Number of tasks written
+    """
+    import csv
+    count = 0
+    with _open_source(destination, "w") as f:
+        writer = csv.DictWriter(f, fieldnames=TASK_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for row in iter_task_rows(owner):
+            writer.writerow({k: ("" if v is None else v) for k, v in row.items()})
+            count += 1
+    return count
+
+
+def export_tasks_jsonl(owner: Owner, destination) -> int:
+    """
+    Stream every task to a JSON Lines file (path or writable stream)
+
+    Returns:
+        Number of tasks written
+    """
+    count = 0
+    with _open_source(destination, "w") as f:
+        for row in iter_task_rows(owner):
+            f.write(json.dumps(row) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime, timedelta
+
+from pawpal_analytics import care_analytics
+from pawpal_system import Owner, Pet, Task, Priority, Recurrence, Scheduler, RetentionPolicy, compact_history
+
+
+class TestCareAnalytics(unittest.TestCase):
+    """Tests for rolling adherence metrics"""
+
+    def setUp(self):
+        self.owner = Owner("Jon")
+        self.pet = Pet("Odie", "Dog", 4, 20.0, [])
+        self.owner.add_pet(self.pet)
+        self.scheduler = Scheduler()
+        self.start = datetime(2026, 3, 2)  # a Monday
+
+    def test_metrics_update_as_tasks_are_completed(self):
+        """Verify completion rate, lateness, streaks and weekly minutes follow completions"""
+        analytics = care_analytics(self.owner)
+        walk = Task("Walk", Priority.HIGH, 30, due_date=self.start, recurrence=Recurrence.DAILY)
+        self.pet.add_task(walk)
+
+        # Complete on time, a day late, then on time twice (with backdated timestamps)
+        for days_late in (0, 1, 0, 0):
+            walk.last_completed = walk.due_date + timedelta(days=days_late, hours=9)
+            next_walk = self.scheduler.create_next_recurring_task(walk)
+            self.owner.update_task(walk, completed=True)
+            self.pet.add_task(next_walk)
+            walk = next_walk
+
+        stats = analytics.series("Odie", "Walk")
+        self.assertEqual(stats.completions, 4)
+        self.assertEqual(stats.on_time, 3)
+        self.assertEqual(analytics.average_days_late("Odie", "Walk"), 0.25)
+        self.assertEqual(analytics.streak("Odie", "Walk"), 2)
+        self.assertEqual(stats.best_streak, 2)
+        self.assertEqual(analytics.minutes_in_week("Odie", self.start.date()), 120)
+
+        # The open occurrence (due 03-06) becomes overdue once the day passes
+        today = self.start.date() + timedelta(days=6)
+        self.assertEqual(analytics.completion_rate("Odie", "Walk", today=today), 0.8)
+        self.assertEqual(analytics.completion_rate("Odie", today=self.start.date()), 1.0)
+
+    def test_compaction_and_batch_recompute_keep_totals(self):
+        """Verify compacted history still counts and recompute matches incremental totals"""
+        feed = Task("Feed", Priority.HIGH, 5, due_date=self.start, recurrence=Recurrence.DAILY)
+        self.pet.add_task(feed)
+        for _ in range(6):
+            feed = self.scheduler.complete_task(self.owner, feed)
+
+        analytics = care_analytics(self.owner)
+        before = analytics.series("Odie", "Feed")
+        self.assertEqual(before.completions, 6)
+
+        compact_history(self.owner, RetentionPolicy(keep_last=2))
+        self.assertEqual(self.pet.num_tasks, 3)
+        self.assertEqual(analytics.series("Odie", "Feed").completions, 6)
+
+        analytics.recompute()
+        after = analytics.series("Odie", "Feed")
+        self.assertEqual((after.completions, after.total_minutes, after.open_due),
+                         (6, 30, before.open_due))
+        self.assertIs(care_analytics(self.owner), analytics)
+
+    def test_moving_or_reopening_a_completed_task_counts_it_once(self):
+        """Verify a completed task moved between pets isn't counted twice, and reopening it takes it back"""
+        garfield = Pet("Garfield", "Cat", 6, 15.0, [])
+        self.owner.add_pet(garfield)
+        analytics = care_analytics(self.owner)
+        bath = Task("Bath", Priority.LOW, 20, due_date=self.start)
+        self.pet.add_task(bath)
+        self.owner.update_task(bath, completed=True, last_completed=self.start)
+        self.assertEqual(analytics.pet("Odie").completions, 1)
+
+        self.owner.remove_task(bath)
+        garfield.add_task(bath)
+        self.assertEqual(analytics.pet("Odie").completions + analytics.pet("Garfield").completions, 1)
+
+        self.owner.update_task(bath, completed=False, last_completed=None)
+        stats = analytics.pet("Odie")
+        self.assertEqual((stats.completions, stats.on_time, stats.total_minutes), (0, 0, 0))
+        self.assertEqual(stats.minutes_in_week(self.start.date()), 0)
+        self.owner.update_task(bath, completed=True, last_completed=self.start)
+        self.assertEqual(analytics.pet("Garfield").completions, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
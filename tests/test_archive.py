@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, time, timedelta
+
+from pawpal_analytics import care_analytics
+from pawpal_archive import archive_completed, iter_archive, iter_rows, recompute_analytics, segment_files
+from pawpal_system import Owner, Pet, Task, Priority, Recurrence, pet_to_dict
+
+
+class TestArchive(unittest.TestCase):
+    """Tests for the cold task archive"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = os.path.join(self.tmp.name, "archive")
+        self.now = datetime(2026, 6, 1, 12, 0)
+        self.owner = Owner("Jon")
+        self.odie = Pet("Odie", "Dog", 4, 20.0, [])
+        self.garfield = Pet("Garfield", "Cat", 6, 15.0, [])
+        self.owner.add_pet(self.odie)
+        self.owner.add_pet(self.garfield)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add_walks(self, pet, days, completed=True):
+        for day in range(days):
+            due = self.now - timedelta(days=400 - day)
+            pet.add_task(Task("Walk", Priority.HIGH, 30, due_date=due, start_time=time(8, 0),
+                              recurrence=Recurrence.DAILY, completed=completed,
+                              last_completed=due + timedelta(hours=1, microseconds=day) if completed else None))
+
+    def test_archive_moves_only_old_completed_tasks(self):
+        """Verify old completions leave the pets and round-trip through the archive"""
+        self.add_walks(self.odie, 300)
+        self.garfield.add_task(Task("Brush", Priority.LOW, 10, due_date=self.now - timedelta(days=200)))
+        recent = Task("Feed", Priority.MEDIUM, 5, due_date=self.now, completed=True, last_completed=self.now)
+        self.garfield.add_task(recent)
+        originals = {task.id: task for task in self.odie.tasks}
+
+        self.assertEqual(archive_completed(self.owner, self.archive, older_than_days=90, now=self.now), 300)
+        self.assertEqual(self.odie.tasks, [])
+        self.assertEqual(self.garfield.num_tasks, 2)  # open (even if overdue) and recent tasks stay
+        self.assertTrue(self.odie.dirty)
+        self.assertIsNone(self.owner.get_task(next(iter(originals))))
+
+        archived = list(iter_archive(self.archive))
+        self.assertEqual(len(archived), 300)
+        for pet_name, task in archived:
+            self.assertEqual(pet_name, "Odie")
+            self.assertTrue(originals[task.id].same_fields(task))
+        self.assertIs(archived[0][1].template, archived[1][1].template)
+        self.assertEqual(archive_completed(self.owner, self.archive, older_than_days=90, now=self.now), 0)
+        self.assertEqual(len(segment_files(self.archive)), 1)
+
+    def test_queries_filter_and_archive_is_smaller_than_json(self):
+        """Verify pet, name and time filters, and that the columnar segment compresses well"""
+        self.add_walks(self.odie, 200)
+        self.add_walks(self.garfield, 100)
+        json_size = sum(len(json.dumps(pet_to_dict(pet))) for pet in self.owner.pets)
+        archive_completed(self.owner, self.archive, now=self.now)
+
+        self.assertEqual(sum(1 for _ in iter_archive(self.archive, pet_name="Garfield")), 100)
+        self.assertEqual(sum(1 for _ in iter_archive(self.archive, task_name="Brush")), 0)
+        since = self.now - timedelta(days=250)
+        recent = list(iter_archive(self.archive, since=since))
+        self.assertTrue(recent and all(task.last_completed >= since for _, task in recent))
+        self.assertLess(os.path.getsize(segment_files(self.archive)[0]) * 4, json_size)
+
+    def test_analytics_recompute_streams_archived_rows(self):
+        """Verify archived completions count again after analytics are rebuilt"""
+        self.add_walks(self.odie, 50)
+        self.odie.add_task(Task("Walk", Priority.HIGH, 30, due_date=self.now, completed=True,
+                                last_completed=self.now))
+        archive_completed(self.owner, self.archive, now=self.now, codec="zlib")
+        self.assertEqual(len(list(iter_rows(self.archive, pet_name="Odie"))), 50)
+
+        restarted = Owner("Jon", [Pet("Odie", "Dog", 4, 20.0, list(self.odie.tasks))])
+        self.assertEqual(care_analytics(restarted).pet("Odie").completions, 1)
+        analytics = recompute_analytics(restarted, self.archive)
+        self.assertEqual(analytics.pet("Odie").completions, 51)
+        self.assertEqual(analytics.pet("Odie").total_minutes, 51 * 30)
+
+    def test_rejects_files_that_are_not_segments(self):
+        """Verify a foreign file in the archive directory is reported, not misread"""
+        os.makedirs(self.archive)
+        with open(os.path.join(self.archive, "bogus.pza"), "wb") as f:
+            f.write(b"not an archive")
+        with self.assertRaises(ValueError):
+            list(iter_archive(self.archive))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import unittest
+import os
+import tempfile
+
+from pawpal_batch import (
+    map_owner_files, owner_files, plan_owners, plan_owner_file, report_owner_file, write_synthetic_owners,
+)
+
+
+class TestBatchPlanning(unittest.TestCase):
+    """Tests for batch planning across many owners"""
+
+    def test_parallel_batch_matches_serial(self):
+        """Verify the process pool returns the same digests, in order, as a serial run"""
+        with tempfile.TemporaryDirectory() as owner_dir:
+            write_synthetic_owners(owner_dir, 12, tasks_per_pet=6)
+            paths = owner_files(owner_dir)
+
+            serial = plan_owners(paths, workers=1, chunk_size=5)
+            parallel = plan_owners(paths, workers=2, chunk_size=5)
+
+            self.assertEqual(len(serial.digests), 12)
+            self.assertEqual(serial.digests, parallel.digests)
+            self.assertEqual([d.path for d in parallel.digests], paths)
+            self.assertGreater(parallel.owners_per_second, 0)
+
+    def test_missing_owner_file_is_reported(self):
+        """Verify a missing file becomes an error instead of aborting the batch"""
+        with tempfile.TemporaryDirectory() as owner_dir:
+            paths = write_synthetic_owners(owner_dir, 2)
+            report = plan_owners(paths + [os.path.join(owner_dir, "gone.json")], workers=1)
+
+            self.assertEqual(len(report.digests), 2)
+            self.assertEqual(len(report.errors), 1)
+            self.assertIsNone(plan_owner_file(os.path.join(owner_dir, "gone.json")))
+
+    def test_malformed_owner_file_is_reported(self):
+        """Verify any exception from one corrupt owner is reported for it, across workers too"""
+        with tempfile.TemporaryDirectory() as owner_dir:
+            paths = write_synthetic_owners(owner_dir, 3)
+            corrupt = os.path.join(owner_dir, "corrupt.json")
+            with open(corrupt, "w") as f:
+                json.dump({"name": "Broken", "pets": 5}, f)  # TypeError while loading
+            for workers in (1, 2):
+                report = plan_owners(paths + [corrupt], workers=workers, chunk_size=2)
+                self.assertEqual(len(report.digests), 3)
+                self.assertEqual(report.errors, [f"{corrupt}: TypeError: 'int' object is not iterable"])
+
+                results = list(map_owner_files(report_owner_file, [corrupt] + paths, ("text",), workers, 2))
+                self.assertEqual([path for path, _, _ in results], [corrupt] + paths)
+                self.assertIn("TypeError", results[0][2])
+                self.assertTrue(all(error is None for _, _, error in results[1:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, time, timedelta
+
+import pawpal
+from pawpal_batch import write_synthetic_owners
+from pawpal_system import Owner, Pet, Task, Priority, Recurrence, load_owner, save_owner
+
+
+class TestCommandLine(unittest.TestCase):
+    """Tests for the pawpal command-line entry point"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.tmp.name, "pawpal_data")
+        owner = Owner("Jon")
+        odie = Pet("Odie", "Dog", 4, 20.0, [])
+        owner.add_pet(odie)
+        today = datetime.combine(datetime.now().date(), time())
+        odie.add_task(Task("Walk", Priority.HIGH, 30, due_date=today, start_time=time(8, 0)))
+        odie.add_task(Task("Vet", Priority.MEDIUM, 60, due_date=today, start_time=time(8, 15)))
+        odie.add_task(Task("Feed", Priority.LOW, 5, due_date=today - timedelta(days=200), completed=True,
+                           recurrence=Recurrence.DAILY, last_completed=today - timedelta(days=200)))
+        save_owner(owner, self.store)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *argv) -> tuple:
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            status = pawpal.main(list(argv))
+        return status, out.getvalue(), err.getvalue()
+
+    def test_report_commands_stream_one_section(self):
+        """Verify plan and conflicts read the store and render the requested format"""
+        status, out, _ = self.run_cli("plan", "--data", self.store, "--top-k", "1")
+        self.assertEqual(status, 0)
+        self.assertIn("1. Walk (Odie)", out)
+        self.assertNotIn("Vet", out)
+
+        status, out, _ = self.run_cli("conflicts", "--data", self.store, "-f", "json")
+        self.assertEqual(json.loads(out)["conflicts"][0]["name1"], "Walk")
+
+    def test_plan_leaves_out_completed_tasks(self):
+        """Verify the plan ranks and totals only open tasks"""
+        status, out, _ = self.run_cli("plan", "--data", self.store, "-f", "json")
+        self.assertEqual(status, 0)
+        plan = json.loads(out)["plan"]
+        self.assertEqual([task["name"] for task in plan["tasks"]], ["Walk", "Vet"])
+        self.assertEqual((plan["count"], plan["minutes"]), (2, 90))
+
+        _, out, _ = self.run_cli("plan", "--data", self.store, "--top-k", "5")
+        self.assertNotIn("Feed", out)
+
+    def test_unreadable_data_exits_cleanly(self):
+        """Verify a path that isn't owner data gives a message instead of a traceback"""
+        plain = os.path.join(self.tmp.name, "hostname")
+        with open(plain, "w") as f:
+            f.write("not owner data\n")
+        with self.assertRaises(SystemExit) as exit_:
+            self.run_cli("plan", "--data", plain)
+        self.assertIn("can't read owner data", str(exit_.exception))
+
+    def test_owner_dir_runs_across_workers(self):
+        """Verify --owner-dir reports every owner, in order, with parallel workers"""
+        owner_dir = os.path.join(self.tmp.name, "owners")
+        write_synthetic_owners(owner_dir, 6)
+        status, out, _ = self.run_cli("overdue", "--owner-dir", owner_dir, "--workers", "2",
+                                      "--chunk-size", "2", "-f", "json")
+        self.assertEqual(status, 0)
+        decoder, reports, at = json.JSONDecoder(), [], 0
+        while at < len(out):
+            report, at = decoder.raw_decode(out, at)
+            reports.append(report["owner"])
+            at += 1  # newline after each report
+        self.assertEqual(reports, [f"Owner {i}" for i in range(6)])
+
+    def test_import_export_and_compact(self):
+        """Verify tasks round-trip through export/import and compact archives old ones"""
+        exported = os.path.join(self.tmp.name, "tasks.jsonl")
+        self.assertEqual(self.run_cli("export", exported, "--data", self.store)[0], 0)
+        copy = os.path.join(self.tmp.name, "copy.json")
+        status, out, _ = self.run_cli("import", exported, "--data", copy, "--owner-name", "Liz")
+        self.assertEqual(status, 0)
+        self.assertIn("Imported 3 tasks (1 new pets)", out)
+        self.assertEqual(load_owner(copy).name, "Liz")
+
+        profile = os.path.join(self.tmp.name, "compact.prof")
+        status, out, err = self.run_cli("compact", "--data", self.store, "--archive-days", "90",
+                                        "--profile", profile)
+        self.assertIn("archived 1", out)
+        self.assertIn("compact took", err)
+        self.assertTrue(os.path.exists(profile))
+        self.assertEqual(load_owner(self.store).pets[0].num_tasks, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import io
+import unittest
+from datetime import datetime, time, timedelta
+
+from pawpal_ics import export_ics, fold
+from pawpal_system import Owner, Pet, Task, Priority, Recurrence, Scheduler
+
+
+def events(feed: str) -> list:
+    """Unfold a feed and split it into one {property: value} dict per VEVENT"""
+    lines = feed.replace("\r\n ", "").split("\r\n")
+    found, current = [], None
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            current = {}
+        elif line == "END:VEVENT":
+            found.append(current)
+            current = None
+        elif current is not None:
+            name, _, value = line.partition(":")
+            current[name] = value
+    return found
+
+
+class TestIcsExport(unittest.TestCase):
+    """Tests for the iCalendar exporter"""
+
+    def setUp(self):
+        self.owner = Owner("Jon")
+        self.pet = Pet("Odie", "Dog", 4, 20.0, [])
+        self.owner.add_pet(self.pet)
+        self.day = datetime(2026, 3, 2)
+
+    def export(self, since=None):
+        out = io.StringIO()
+        version = export_ics(self.owner, out, since)
+        return out.getvalue(), version
+
+    def test_recurring_tasks_become_single_events_with_rrules(self):
+        """Verify each recurrence maps to one VEVENT with the matching RRULE"""
+        for recurrence in Recurrence:
+            self.pet.add_task(Task(f"Task {recurrence.value}", Priority.MEDIUM, 15, due_date=self.day,
+                                   recurrence=recurrence))
+        meds_task = Task("Meds", Priority.HIGH, 5, due_date=self.day, start_time=time(8, 30),
+                         recurrence=Recurrence.DAILY, recurrence_days=3, description="Pill, with food")
+        self.pet.add_task(meds_task)
+        self.pet.add_task(Task("Undated", Priority.LOW, 5))
+
+        feed, _ = self.export()
+        self.assertTrue(feed.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(feed.endswith("END:VCALENDAR\r\n"))
+        by_name = {e["SUMMARY"].split(" (")[0]: e for e in events(feed)}
+        self.assertEqual(len(by_name), 6)
+        self.assertNotIn("RRULE", by_name["Task once"])
+        self.assertEqual(by_name["Task daily"]["RRULE"], "FREQ=DAILY")
+        self.assertEqual(by_name["Task weekly"]["RRULE"], "FREQ=WEEKLY")
+        self.assertEqual(by_name["Task biweekly"]["RRULE"], "FREQ=WEEKLY;INTERVAL=2")
+        self.assertEqual(by_name["Task monthly"]["RRULE"], "FREQ=DAILY;INTERVAL=30")
+        self.assertEqual(by_name["Task daily"]["DTSTART;VALUE=DATE"], "20260302")
+
+        meds = by_name["Meds"]
+        self.assertEqual(meds["RRULE"], "FREQ=DAILY;INTERVAL=3")
+        # The scheduler repeats it on the same interval the RRULE advertises
+        self.assertEqual(Scheduler().calculate_next_due_date(meds_task), self.day + timedelta(days=3))
+        self.assertEqual((meds["DTSTART"], meds["DTEND"]), ("20260302T083000", "20260302T083500"))
+        self.assertEqual(meds["DESCRIPTION"], "Pill\\, with food")
+        self.assertEqual(meds["PRIORITY"], "1")
+
+    def test_incremental_export_sends_only_changes(self):
+        """Verify exports since a version carry edits, completions and removals only"""
+        walk = Task("Walk", Priority.HIGH, 30, due_date=self.day, recurrence=Recurrence.DAILY)
+        bath = Task("Bath", Priority.LOW, 20, due_date=self.day)
+        groom = Task("Groom", Priority.LOW, 20, due_date=self.day)
+        for task in (walk, bath, groom):
+            self.pet.add_task(task)
+        _, version = self.export()
+
+        feed, unchanged = self.export(since=version)
+        self.assertEqual(events(feed), [])
+        self.assertEqual(unchanged, version)
+
+        Scheduler().complete_task(self.owner, walk)
+        self.owner.update_task(bath, duration=25)
+        self.owner.remove_task(groom)
+        feed, _ = self.export(since=version)
+
+        changed = {e["UID"]: e for e in events(feed)}
+        self.assertEqual(len(changed), 4)  # walk, its next occurrence, bath, groom
+        self.assertEqual(changed[f"{walk.id}@pawpal"]["STATUS"], "CANCELLED")
+        self.assertEqual(changed[f"{groom.id}@pawpal"]["STATUS"], "CANCELLED")
+        self.assertEqual(changed[f"{bath.id}@pawpal"]["DURATION"], "P1D")  # all-day: no start time
+        self.assertGreater(int(changed[f"{bath.id}@pawpal"]["SEQUENCE"]), version)
+
+    def test_cancelled_events_keep_their_last_start(self):
+        """Verify a task that loses its due date is cancelled at the time it was last scheduled"""
+        vet = Task("Vet", Priority.HIGH, 45, due_date=self.day, start_time=time(9, 30))
+        self.pet.add_task(vet)
+        _, version = self.export()
+
+        self.owner.update_task(vet, due_date=None)
+        feed, _ = self.export(since=version)
+
+        (event,) = events(feed)
+        self.assertEqual(event["STATUS"], "CANCELLED")
+        self.assertEqual(event["DTSTART"], "20260302T093000")
+        self.assertEqual(event["DTEND"], "20260302T101500")
+
+        undated = Task("Brush", Priority.LOW, 10)
+        self.pet.add_task(undated)
+        self.owner.remove_task(undated)
+        feed, _ = self.export(since=version)
+        self.assertEqual([e["UID"] for e in events(feed)], [f"{vet.id}@pawpal"])  # never exported, nothing to cancel
+
+    def test_long_lines_are_folded_without_splitting_characters(self):
+        """Verify content lines are folded at 75 octets on UTF-8 boundaries"""
+        line = "SUMMARY:" + "🐾" * 40
+        folded = fold(line)
+        for part in folded.split("\r\n")[:-1]:
+            self.assertLessEqual(len(part.encode("utf-8")), 75)
+        self.assertEqual(folded.replace("\r\n ", "").rstrip("\r\n"), line)
+
+
+if __name__ == '__main__':
+    unittest.main()
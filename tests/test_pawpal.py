@@ -1,11 +1,21 @@
 import unittest
 from pawpal_system import (
     Owner, Pet, Task, Priority, Recurrence, Scheduler,
-    save_owner_to_json, load_owner_from_json
+    save_owner_to_json, load_owner_from_json,
+    import_tasks_csv, import_tasks_jsonl, export_tasks_csv, export_tasks_jsonl,
+    OwnerCache, task_view, RetentionPolicy, compact_history, TaskTemplate,
+    save_owner_segments, load_owner_segments, load_segment, load_owner, is_segmented_store
 )
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import io
 import os
+import shutil
+import sys
 import json
+import tempfile
+import time as time_module
 
 
 class TestPawPalSystem(unittest.TestCase):
@@ -427,6 +437,81 @@ class TestPawPalSystem(unittest.TestCase):
         # Verify no conflict (one task has no start time)
         self.assertEqual(len(conflicts), 0)
 
+    def test_conflicts_ahead_expand_recurrence(self):
+        """Verify daily vs. weekly appointments at the same time collide every 7 days"""
+        owner = Owner("Test Owner")
+        pet1 = Pet("Fluffy", "Cat", 3, 10.0, [])
+        pet2 = Pet("Buddy", "Dog", 5, 25.0, [])
+        owner.add_pet(pet1)
+        owner.add_pet(pet2)
+
+        start = datetime(2026, 3, 2)
+        pet1.add_task(Task("Meds", Priority.HIGH, 15, due_date=start, start_time=time(9, 0),
+                           recurrence=Recurrence.DAILY))
+        pet2.add_task(Task("Training", Priority.MEDIUM, 60, due_date=start + timedelta(days=3),
+                           start_time=time(8, 30), recurrence=Recurrence.WEEKLY))
+        # No overlap in time of day, so never a conflict
+        pet2.add_task(Task("Walk", Priority.LOW, 30, due_date=start, start_time=time(12, 0),
+                           recurrence=Recurrence.DAILY))
+
+        scheduler = Scheduler()
+        # Only today's occurrences exist, so the classic check sees nothing
+        self.assertEqual(scheduler.detect_conflicts(owner), [])
+
+        collisions = scheduler.find_conflicts_ahead(owner, days=365, limit=3, start=start.date())
+        self.assertEqual([c.day for c in collisions],
+                         [date(2026, 3, 5), date(2026, 3, 12), date(2026, 3, 19)])
+        self.assertIn("Fluffy", collisions[0].message)
+        self.assertIn("Training", collisions[0].message)
+
+    def test_conflicts_ahead_one_time_meets_recurring(self):
+        """Verify a one-time appointment collides only if a recurring series lands on its day"""
+        owner = Owner("Test Owner")
+        pet = Pet("Fluffy", "Cat", 3, 10.0, [])
+        owner.add_pet(pet)
+
+        start = datetime(2026, 3, 2)
+        pet.add_task(Task("Grooming", Priority.HIGH, 60, due_date=start, start_time=time(10, 0),
+                          recurrence=Recurrence.BIWEEKLY))
+        pet.add_task(Task("Vet", Priority.HIGH, 30, due_date=start + timedelta(days=28), start_time=time(10, 30)))
+        pet.add_task(Task("Vet Follow-up", Priority.HIGH, 30, due_date=start + timedelta(days=29), start_time=time(10, 30)))
+
+        collisions = Scheduler().find_conflicts_ahead(owner, days=60, start=start.date())
+        self.assertEqual([(c.day, c.task2.name) for c in collisions], [(date(2026, 3, 30), "Vet")])
+
+    def test_conflict_scopes_partition_tasks(self):
+        """Verify tasks only conflict with tasks sharing their pet, caretaker or resource scope"""
+        owner = Owner("Test Owner")
+        fluffy = Pet("Fluffy", "Cat", 3, 10.0, [], scope="pet")
+        buddy = Pet("Buddy", "Dog", 5, 25.0, [], scope="pet")
+        owner.add_pet(fluffy)
+        owner.add_pet(buddy)
+
+        today = datetime.now()
+        fluffy.add_task(Task("Fluffy Vet", Priority.HIGH, 30, due_date=today, start_time=time(9, 0)))
+        buddy.add_task(Task("Buddy Walk", Priority.HIGH, 30, due_date=today, start_time=time(9, 0)))
+
+        scheduler = Scheduler()
+        # Each pet has its own scope, so different pets no longer conflict
+        self.assertEqual(scheduler.detect_conflicts(owner), [])
+
+        # Both need the grooming table at the same time
+        fluffy.add_task(Task("Fluffy Groom", Priority.LOW, 30, due_date=today, start_time=time(14, 0),
+                             scope="resource:grooming table"))
+        buddy.add_task(Task("Buddy Groom", Priority.LOW, 30, due_date=today, start_time=time(14, 15),
+                            scope="resource:grooming table"))
+        # Same pet, same time
+        buddy.add_task(Task("Buddy Meds", Priority.HIGH, 5, due_date=today, start_time=time(9, 10)))
+
+        conflicts = scheduler.detect_conflicts(owner)
+        self.assertEqual(len(conflicts), 2)
+        self.assertIn("'Fluffy Groom' (Fluffy) overlaps with 'Buddy Groom' (Buddy)", conflicts[0])
+        self.assertIn("'Buddy Walk' (Buddy) overlaps with 'Buddy Meds' (Buddy)", conflicts[1])
+
+        # Large partitions can be checked on an executor with the same result
+        with ThreadPoolExecutor() as executor, patch("pawpal_system.PARALLEL_SCOPE_SIZE", 1):
+            self.assertEqual(scheduler.detect_conflicts(owner, executor=executor), conflicts)
+
     def test_detect_conflicts_multiple_pets(self):
         """Verify conflict detection works correctly with multiple pets"""
         owner = Owner("Test Owner")
@@ -466,6 +551,254 @@ class TestPawPalSystem(unittest.TestCase):
         self.assertIn("Fluffy", conflicts[0])
         self.assertIn("Buddy", conflicts[0])
 
+    # ===== DUE DATE INDEX TESTS =====
+    def test_due_index_buckets_today_overdue_and_future(self):
+        """Verify the owner's due-date index answers today/overdue/upcoming queries"""
+        owner = Owner("Test Owner")
+        pet = Pet("Fluffy", "Cat", 3, 10.0, [])
+        owner.add_pet(pet)
+
+        today = datetime(2026, 3, 10)
+        overdue = Task("Overdue", Priority.HIGH, 10, due_date=today - timedelta(days=2))
+        due_today = Task("Today", Priority.LOW, 20, due_date=today)
+        soon = Task("Soon", Priority.MEDIUM, 30, due_date=today + timedelta(days=3))
+        later = Task("Later", Priority.MEDIUM, 40, due_date=today + timedelta(days=30))
+        for task in (overdue, due_today, soon, later):
+            pet.add_task(task)
+
+        index = owner.due_index
+        self.assertEqual(index.overdue(today.date()), [overdue])
+        self.assertEqual(index.today(today.date()), [due_today])
+        self.assertEqual(index.upcoming(7, today.date()), [soon])
+        self.assertEqual(index.due_after(today.date()), [soon, later])
+        self.assertEqual(index.minutes_on(today.date()), 20)
+
+    def test_due_index_tracks_completion_and_edits(self):
+        """Verify completing or editing a task moves it between buckets"""
+        owner = Owner("Test Owner")
+        pet = Pet("Buddy", "Dog", 5, 25.0, [])
+        owner.add_pet(pet)
+
+        today = datetime.now()
+        task = Task("Walk", Priority.HIGH, 30, due_date=today - timedelta(days=1), recurrence=Recurrence.DAILY)
+        pet.add_task(task)
+        self.assertEqual(owner.due_index.overdue(), [task])
+
+        # Completing creates the next occurrence in today's bucket
+        next_task = Scheduler().complete_task(owner, task)
+        self.assertEqual(owner.due_index.overdue(), [])
+        self.assertEqual(owner.due_index.today(), [next_task])
+        self.assertEqual(owner.due_index.minutes_on(today.date()), 30)
+
+        # Editing the due date re-buckets the task
+        owner.update_task(next_task, due_date=today + timedelta(days=2), duration=45)
+        self.assertEqual(owner.due_index.today(), [])
+        self.assertEqual(owner.due_index.minutes_on((today + timedelta(days=2)).date()), 45)
+
+        pet.remove_task(next_task)
+        self.assertEqual(owner.due_index.due_after(), [])
+
+    # ===== READY QUEUE TESTS =====
+    def test_ready_queue_matches_plan_order_for_open_tasks(self):
+        """Verify next_tasks returns open tasks in the same order as create_plan"""
+        owner = Owner("Test Owner")
+        pet = Pet("Buddy", "Dog", 5, 25.0, [])
+        owner.add_pet(pet)
+
+        today = datetime.now()
+        pet.add_task(Task("Low-Today", Priority.LOW, 10, due_date=today))
+        pet.add_task(Task("High-Tomorrow", Priority.HIGH, 60, due_date=today + timedelta(days=1)))
+        pet.add_task(Task("High-Today-Long", Priority.HIGH, 30, due_date=today))
+        pet.add_task(Task("High-Today-Short", Priority.HIGH, 5, due_date=today))
+        pet.add_task(Task("Done", Priority.HIGH, 1, due_date=today, completed=True))
+
+        scheduler = Scheduler()
+        expected = [t.name for t in scheduler.create_plan(owner) if not t.completed]
+        self.assertEqual([t.name for t in scheduler.next_tasks(owner, 10)], expected)
+        self.assertEqual(scheduler.next_task(owner).name, "High-Today-Short")
+
+    def test_ready_queue_follows_completion_and_edits(self):
+        """Verify completed and re-prioritized tasks are handled lazily by the queue"""
+        owner = Owner("Test Owner")
+        pet = Pet("Fluffy", "Cat", 3, 10.0, [])
+        owner.add_pet(pet)
+
+        today = datetime.now()
+        feed = Task("Feed", Priority.HIGH, 5, due_date=today)
+        brush = Task("Brush", Priority.LOW, 10, due_date=today)
+        pet.add_task(feed)
+        pet.add_task(brush)
+
+        scheduler = Scheduler()
+        self.assertIs(scheduler.next_task(owner), feed)
+
+        scheduler.complete_task(owner, feed)
+        self.assertIs(scheduler.next_task(owner), brush)
+
+        # Tasks added after the queue exists are pushed automatically
+        meds = Task("Meds", Priority.MEDIUM, 5, due_date=today)
+        pet.add_task(meds)
+        self.assertIs(scheduler.next_task(owner), meds)
+
+        owner.update_task(brush, priority=Priority.HIGH)
+        self.assertEqual(scheduler.next_tasks(owner, 2), [brush, meds])
+        self.assertIs(scheduler.ready_queue(owner).pop(), brush)
+        self.assertEqual(len(scheduler.ready_queue(owner)), 1)
+
+    # ===== STREAMING PLAN TESTS =====
+    def test_iter_plan_matches_create_plan(self):
+        """Verify the streaming plan yields the same order as create_plan, with cutoffs"""
+        owner = Owner("Test Owner")
+        pet = Pet("Buddy", "Dog", 5, 25.0, [])
+        owner.add_pet(pet)
+
+        today = datetime.now()
+        for i, priority in enumerate([Priority.LOW, Priority.HIGH, Priority.MEDIUM, Priority.HIGH, Priority.LOW]):
+            pet.add_task(Task(f"Task {i}", priority, 10 * (i + 1), due_date=today + timedelta(days=i % 2)))
+        pet.add_task(Task("No Due Date", Priority.HIGH, 5))
+        pet.add_task(Task("Same Key A", Priority.MEDIUM, 30, due_date=today))
+        pet.add_task(Task("Same Key B", Priority.MEDIUM, 30, due_date=today))
+
+        scheduler = Scheduler()
+        plan = scheduler.create_plan(owner)
+
+        self.assertEqual(list(scheduler.iter_plan(owner)), plan)
+        self.assertEqual(list(scheduler.iter_plan(owner, top_k=3)), plan[:3])
+
+        # Cumulative cutoff stops before the task that would exceed the budget
+        budget = plan[0].duration + plan[1].duration
+        self.assertEqual(list(scheduler.iter_plan(owner, max_minutes=budget)), plan[:2])
+        self.assertEqual(list(scheduler.iter_plan(owner, top_k=1, max_minutes=budget)), plan[:1])
+
+    # ===== OWNER CACHE TESTS =====
+    def test_owner_cache_shares_one_owner_and_saves_writes(self):
+        """Verify sessions share one parsed owner and writes go to disk"""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "owner.json")
+            owner = Owner("Jon")
+            owner.add_pet(Pet("Odie", "Dog", 4, 20.0, []))
+            save_owner_to_json(owner, filename)
+
+            cache = OwnerCache()
+            first = cache.acquire(filename)
+            second = cache.acquire(filename)
+            self.assertIs(first, second)
+
+            with cache.write(filename) as shared:
+                shared.pets[0].add_task(Task("Walk", Priority.HIGH, 30))
+            self.assertEqual(cache.version(filename), 1)
+            self.assertEqual(load_owner_from_json(filename).pets[0].num_tasks, 1)
+            # Our own write doesn't trigger a reload
+            self.assertIs(cache.get(filename), first)
+
+    def test_owner_cache_reloads_external_changes_and_evicts_lru(self):
+        """Verify out-of-band file changes are reloaded and unused entries are evicted"""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f"owner{i}.json") for i in range(3)]
+            for i, path in enumerate(paths):
+                save_owner_to_json(Owner(f"Owner {i}"), path)
+
+            cache = OwnerCache(capacity=2)
+            held = cache.acquire(paths[0])
+            cache.get(paths[1])
+            cache.get(paths[2])
+            # paths[0] is still referenced, so the unused paths[1] was evicted instead
+            self.assertEqual(len(cache), 2)
+            self.assertIs(cache.get(paths[0]), held)
+
+            # Another process rewrites the file
+            changed = Owner("Renamed")
+            save_owner_to_json(changed, paths[0])
+            os.utime(paths[0], ns=(0, 1))
+            self.assertEqual(cache.get(paths[0]).name, "Renamed")
+
+            cache.release(paths[0])
+            os.remove(paths[0])
+            self.assertIsNone(cache.get(paths[0]))
+            self.assertIsNone(cache.acquire(os.path.join(tmp, "missing.json")))
+
+    # ===== TASK VIEW MODEL TESTS =====
+    def test_task_view_rows_are_memoized_and_refreshed_on_change(self):
+        """Verify display rows are formatted once and refreshed after edits and moves"""
+        owner = Owner("Test Owner")
+        fluffy = Pet("Fluffy", "Cat", 3, 10.0, [])
+        buddy = Pet("Buddy", "Dog", 5, 25.0, [])
+        owner.add_pet(fluffy)
+        owner.add_pet(buddy)
+        task = Task("Feed", Priority.HIGH, 5, due_date=datetime(2026, 3, 9))
+        fluffy.add_task(task)
+
+        view = task_view(owner)
+        row = view.row(task)
+        self.assertEqual((row.pet, row.title, row.priority, row.due_date, row.due_date_short),
+                         ("Fluffy", "Feed", "HIGH", "2026-03-09", "03/09/2026"))
+        self.assertIs(view.row(task), row)  # memoized
+
+        owner.update_task(task, duration=10, due_date=None)
+        self.assertEqual(view.row(task).duration_minutes, 10)
+        self.assertEqual(view.row(task).due_date, "No due date")
+
+        fluffy.remove_task(task)
+        buddy.add_task(task)
+        self.assertEqual(view.row(task).pet, "Buddy")
+        self.assertEqual(len(view), 1)
+        self.assertIs(task_view(owner), view)
+
+    # ===== HISTORY COMPACTION TESTS =====
+    def _pet_with_feed_history(self, owner, days):
+        """Complete a daily 'Feed' task `days` times, late on the 3rd completion"""
+        pet = Pet("Garfield", "Cat", 6, 25.0, [])
+        owner.add_pet(pet)
+        start = datetime.now() - timedelta(days=days)
+        task = Task("Feed", Priority.HIGH, 5, due_date=start, recurrence=Recurrence.DAILY)
+        pet.add_task(task)
+        scheduler = Scheduler()
+        for i in range(days):
+            next_task = scheduler.complete_task(owner, task)
+            done = task.due_date + timedelta(days=1 if i == 2 else 0, hours=8)
+            owner.update_task(task, last_completed=done)
+            task = next_task
+        return pet
+
+    def test_compact_history_keeps_recent_and_rolls_up_the_rest(self):
+        """Verify old completions become aggregates and the open occurrence is kept"""
+        owner = Owner("Jon")
+        pet = self._pet_with_feed_history(owner, 10)
+        self.assertEqual(pet.num_tasks, 11)
+
+        compacted = compact_history(owner, RetentionPolicy(keep_last=3))
+        self.assertEqual(compacted, 7)
+        self.assertEqual(pet.num_tasks, 4)  # 3 kept completions + the open occurrence
+        self.assertEqual(len([t for t in pet.tasks if not t.completed]), 1)
+
+        history = pet.history["Feed"]
+        self.assertEqual((history.count, history.total_minutes, history.on_time), (7, 35, 6))
+        self.assertEqual(history.total_days_late, 1)
+        self.assertEqual(history.best_streak, 4)
+        self.assertEqual(history.streak, 4)
+
+        # Compacted tasks are gone from the owner's indexes too
+        self.assertEqual(len(owner.due_index), 4)
+
+    def test_compact_history_is_incremental_and_persisted(self):
+        """Verify a budget splits compaction across calls and history survives JSON"""
+        owner = Owner("Jon")
+        pet = self._pet_with_feed_history(owner, 10)
+
+        self.assertEqual(compact_history(owner, RetentionPolicy(keep_last=2), budget=5), 5)
+        self.assertEqual(compact_history(owner, RetentionPolicy(keep_last=2), budget=5), 3)
+        self.assertEqual(compact_history(owner, RetentionPolicy(keep_last=2)), 0)
+        self.assertEqual(pet.history["Feed"].count, 8)
+
+        # Recent completions are kept by age as well
+        self.assertEqual(compact_history(owner, RetentionPolicy(keep_last=0, keep_days=30)), 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "owner.json")
+            save_owner_to_json(owner, filename)
+            loaded = load_owner_from_json(filename)
+            self.assertEqual(loaded.pets[0].history, pet.history)
+
     # ===== DATA PERSISTENCE TESTS =====
     def test_save_and_load_owner_data_json(self):
         """Verify owner data can be saved to and loaded from JSON"""
@@ -550,11 +883,523 @@ class TestPawPalSystem(unittest.TestCase):
         # Clean up
         os.remove(test_filename)
 
+    def test_bulk_csv_import_validates_and_creates_pets(self):
+        """Verify CSV import adds valid rows, creates missing pets and reports bad rows"""
+        owner = Owner("Facility")
+        owner.add_pet(Pet("Fluffy", "Cat", 3, 10.0, []))
+
+        csv_text = (
+            "pet,name,priority,duration,due_date,start_time,recurrence,breed\n"
+            "Fluffy,Feed,high,5,2026-03-01,,daily,\n"
+            "Rex,Walk,Medium,30,2026-03-01,08:00,once,Dog\n"
+            "Rex,Groom,urgent,30,2026-03-01,,once,Dog\n"
+            "Rex,Bath,low,-5,2026-03-01,,once,Dog\n"
+            "Rex,Vet,low,60,not-a-date,,once,Dog\n"
+        )
+        result = import_tasks_csv(owner, io.StringIO(csv_text))
+
+        self.assertEqual(result.added, 2)
+        self.assertEqual(result.pets_created, 1)
+        self.assertEqual(len(result.errors), 3)
+        self.assertIn("Row 3: invalid priority", result.errors[0])
+
+        rex = owner.pets[1]
+        self.assertEqual((rex.name, rex.breed), ("Rex", "Dog"))
+        self.assertEqual(rex.tasks[0].priority, Priority.MEDIUM)
+        self.assertEqual(rex.tasks[0].start_time, time(8, 0))
+        self.assertEqual(owner.pets[0].tasks[0].recurrence, Recurrence.DAILY)
+
+        with self.assertRaises(ValueError):
+            import_tasks_csv(Owner("Strict"), io.StringIO(csv_text), strict=True)
+
+    def test_bulk_import_rejects_bad_pet_columns_and_unhashable_values(self):
+        """Verify pet columns and JSON lists/objects are row errors, and strict imports nothing"""
+        lines = "\n".join(json.dumps(row) for row in (
+            {"pet": "Rex", "name": "Walk", "priority": "high", "duration": 30, "age": 3, "weight": 20.5},
+            {"pet": "Kit", "name": "Feed", "priority": "low", "duration": 5, "age": "three"},
+            {"pet": "Tom", "name": "Brush", "priority": ["high"], "duration": {"minutes": 5}},
+        ))
+        owner = Owner("Importer")
+        result = import_tasks_jsonl(owner, io.StringIO(lines))
+        self.assertEqual(result.added, 1)
+        self.assertEqual(result.errors, ["Row 2: invalid age 'three'", "Row 3: invalid priority ['high']"])
+        self.assertEqual((owner.pets[0].age, owner.pets[0].weight), (3, 20.5))
+
+        strict = Owner("Strict")
+        with self.assertRaises(ValueError):
+            import_tasks_jsonl(strict, io.StringIO(lines), strict=True)
+        self.assertEqual(strict.pets, [])
+
+    def test_bulk_import_rejects_wrongly_typed_values_before_adding_anything(self):
+        """Verify non-string text, non-time start times, fractional durations and int ids are row errors"""
+        good = {"pet": "Rex", "name": "Walk", "priority": "high", "duration": 30}
+        bad_rows = [
+            ({"start_time": 900}, "invalid start_time 900"),
+            ({"description": ["a", "b"]}, "invalid description ['a', 'b']"),
+            ({"scope": {"yard": 1}}, "invalid scope {'yard': 1}"),
+            ({"id": 42}, "invalid id 42"),
+            ({"duration": 2.5}, "invalid duration 2.5"),
+        ]
+        for changes, message in bad_rows:
+            lines = "\n".join(json.dumps(row) for row in (good, {**good, "name": "Bad", **changes}))
+            owner = Owner("Importer")
+            with self.assertRaises(ValueError) as raised:
+                import_tasks_jsonl(owner, io.StringIO(lines), strict=True)
+            self.assertIn(f"Row 2: {message}", str(raised.exception))
+            self.assertEqual(owner.pets, [])  # the valid first row wasn't added either
+
+            result = import_tasks_jsonl(owner, io.StringIO(lines))
+            self.assertEqual((result.added, result.errors), (1, [f"Row 2: {message}"]))
+
+        row = {**good, "duration": 30.0, "due_date": "2026-03-02T08:00:00+00:00",
+               "last_completed": "2026-03-02T09:00:00+00:00", "completed": True}
+        owner = Owner("Importer")
+        import_tasks_jsonl(owner, io.StringIO(json.dumps(row)))
+        task = owner.pets[0].tasks[0]
+        self.assertEqual(task.duration, 30)
+        self.assertIsNone(task.due_date.tzinfo)
+        self.assertIsNone(task.last_completed.tzinfo)
+        compact_history(owner, RetentionPolicy(keep_last=1))  # compares with naive datetimes
+        task.needs_scheduling()
+
+    def test_bulk_export_round_trips_through_import(self):
+        """Verify exported CSV and JSON Lines can be imported back unchanged"""
+        owner = Owner("Facility")
+        pet = Pet("Buddy", "Dog", 5, 25.0, [])
+        owner.add_pet(pet)
+        pet.add_task(Task("Walk", Priority.HIGH, 30, due_date=datetime(2026, 3, 1), start_time=time(9, 0),
+                          description="Around the block", recurrence=Recurrence.WEEKLY))
+        pet.add_task(Task("Meds", Priority.LOW, 5, completed=True, last_completed=datetime(2026, 2, 1, 8, 30)))
+
+        for export, load in ((export_tasks_csv, import_tasks_csv), (export_tasks_jsonl, import_tasks_jsonl)):
+            buffer = io.StringIO()
+            self.assertEqual(export(owner, buffer), 2)
+            buffer.seek(0)
+
+            copy = Owner("Copy")
+            result = load(copy, buffer, strict=True)
+            self.assertEqual(result.added, 2)
+            self.assertEqual(copy.pets[0].tasks, pet.tasks)
+            self.assertTrue(all(a.same_fields(b) for a, b in zip(copy.pets[0].tasks, pet.tasks)))
+
+    # ===== INTEGER TIME MODEL TESTS =====
+    def test_task_minutes_are_cached_and_follow_edits(self):
+        """Verify the cached day/minute numbers match the datetime fields after edits"""
+        due = datetime(2026, 3, 2, 7, 45)
+        task = Task("Vet", Priority.HIGH, 30, due_date=due, start_time=time(9, 15))
+        day = due.toordinal()
+        self.assertEqual((task.due_day, task.due_minute), (day, day * 1440 + 7 * 60 + 45))
+        self.assertEqual((task.start_minute, task.end_minute), (day * 1440 + 555, day * 1440 + 585))
+
+        task.duration = 60
+        task.start_time = time(10, 0)
+        self.assertEqual((task.start_minute, task.end_minute), (day * 1440 + 600, day * 1440 + 660))
+        task.due_date = due + timedelta(days=1)
+        self.assertEqual(task.start_minute, (day + 1) * 1440 + 600)
+        task.due_date = None
+        self.assertEqual((task.due_day, task.start_minute), (None, None))
+
+    def test_sort_by_time_handles_undated_tasks(self):
+        """Verify undated tasks sort last instead of failing to compare with dates"""
+        now = datetime.now()
+        later = Task("Later", Priority.LOW, 5, due_date=now + timedelta(hours=2))
+        undated = Task("Whenever", Priority.LOW, 5)
+        sooner = Task("Sooner", Priority.LOW, 5, due_date=now)
+        self.assertEqual(Scheduler().sort_by_time([later, undated, sooner]), [sooner, later, undated])
+
+        # Within one minute, seconds still order tasks as they did with full datetimes
+        base = datetime(2026, 3, 2, 8, 0)
+        late = Task("Late", Priority.LOW, 5, due_date=base.replace(second=40))
+        early = Task("Early", Priority.LOW, 5, due_date=base.replace(second=5, microsecond=1))
+        self.assertEqual(Scheduler().sort_by_time([undated, late, early]), [early, late, undated])
+
+    # ===== TASK TEMPLATE TESTS =====
+    def test_recurring_occurrences_share_one_template(self):
+        """Verify occurrences share their definition and edits copy it on write"""
+        scheduler = Scheduler()
+        feed = Task("Feed", Priority.HIGH, 10, due_date=datetime(2026, 3, 2), recurrence=Recurrence.DAILY,
+                    description="One cup")
+        next_feed = scheduler.create_next_recurring_task(feed)
+        self.assertIs(next_feed.template, feed.template)
+        self.assertIs(Task("Feed", Priority.HIGH, 10, recurrence=Recurrence.DAILY, description="One cup").template,
+                      feed.template)
+
+        next_feed.duration = 15
+        self.assertEqual(feed.duration, 10)
+        self.assertIsNot(next_feed.template, feed.template)
+        self.assertIs(next_feed.template, feed.template.replace(duration=15))
+
+    def test_json_writes_template_table_and_loads_legacy_records(self):
+        """Verify pets store each definition once and old full-record files still load"""
+        owner = Owner("Jane Doe")
+        pet = Pet("Buddy", "Dog", 5, 25.0, [])
+        owner.add_pet(pet)
+        day = datetime(2026, 3, 2)
+        for i in range(5):
+            pet.add_task(Task("Feed", Priority.HIGH, 10, due_date=day + timedelta(days=i),
+                              recurrence=Recurrence.DAILY, completed=i < 4))
+        pet.add_task(Task("Bath", Priority.LOW, 30))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "owner.json")
+            save_owner_to_json(owner, filename)
+            with open(filename) as f:
+                data = json.load(f)
+            self.assertEqual([t["name"] for t in data["pets"][0]["templates"]], ["Feed", "Bath"])
+            self.assertNotIn("name", data["pets"][0]["tasks"][0])
+
+            loaded = load_owner_from_json(filename)
+            self.assertTrue(all(a.same_fields(b) for a, b in zip(loaded.pets[0].tasks, pet.tasks)))
+            feeds = loaded.pets[0].tasks[:5]
+            self.assertTrue(all(t.template is feeds[0].template for t in feeds))
+
+            # Files from before template tables: every task is a full record
+            legacy = dict(data)
+            legacy["pets"] = [dict(data["pets"][0], tasks=[
+                {"name": "Feed", "priority": "high", "duration": 10, "due_date": day.isoformat(),
+                 "recurrence": "daily", "id": "legacy-1"}], templates=[])]
+            with open(filename, "w") as f:
+                json.dump(legacy, f)
+            [task] = load_owner_from_json(filename).pets[0].tasks
+            self.assertEqual((task.id, task.name, task.recurrence), ("legacy-1", "Feed", Recurrence.DAILY))
+            self.assertIs(task.template, TaskTemplate.intern("Feed", Priority.HIGH, 10, recurrence=Recurrence.DAILY))
+
+    # ===== TASK ID TESTS =====
+    def test_task_ids_distinguish_identical_tasks(self):
+        """Verify identical tasks get distinct ids and can be found, edited and removed by id"""
+        owner = Owner("Test Owner")
+        pet = Pet("Garfield", "Cat", 6, 25.0, [])
+        owner.add_pet(pet)
+        first = Task("Feed", Priority.HIGH, 5)
+        second = Task("Feed", Priority.HIGH, 5)
+        pet.add_task(first)
+        pet.add_task(second)
+
+        self.assertNotEqual(first.id, second.id)
+        self.assertIs(owner.get_task(second.id), second)
+        self.assertIs(owner.pet_of(second.id), pet)
+
+        owner.update_task(second.id, duration=10)
+        self.assertEqual(second.duration, 10)
+
+        self.assertIs(owner.remove_task(first.id), first)
+        self.assertEqual(pet.tasks, [second])
+        self.assertIsNone(owner.get_task(first.id))
+
+    def test_task_equality_is_by_id(self):
+        """Verify tasks compare and hash by id, with structural comparison kept explicit"""
+        first = Task("Feed", Priority.HIGH, 5)
+        second = Task("Feed", Priority.HIGH, 5)
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.same_fields(second))
+        self.assertEqual(len({first, second}), 2)
+
+        # A copy with the same id is the same task, even after edits
+        copy = Task("Feed", Priority.LOW, 5, id=first.id)
+        self.assertEqual(copy, first)
+        self.assertFalse(copy.same_fields(first))
+        self.assertIn(copy, {first})
+
+    def test_task_ids_persist_through_json(self):
+        """Verify task ids survive a save/load round trip and old files get ids"""
+        owner = Owner("Jane Doe")
+        pet = Pet("Buddy", "Dog", 5, 25.0, [])
+        task = Task("Walk Buddy", Priority.MEDIUM, 45)
+        pet.add_task(task)
+        owner.add_pet(pet)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "owner.json")
+            save_owner_to_json(owner, filename)
+            loaded = load_owner_from_json(filename)
+            self.assertIsNotNone(loaded.get_task(task.id))
+
+            # Files written before ids existed still load, with fresh ids
+            with open(filename) as f:
+                data = json.load(f)
+            del data["pets"][0]["tasks"][0]["id"]
+            with open(filename, "w") as f:
+                json.dump(data, f)
+            legacy_task = load_owner_from_json(filename).pets[0].tasks[0]
+            self.assertTrue(legacy_task.id)
+
     def test_load_missing_file_returns_none(self):
         """Verify loading a non-existent file returns None"""
         result = load_owner_from_json("non_existent_file.json")
         self.assertIsNone(result)
 
+    # ===== STARTUP LOADING TESTS =====
+    def _write_two_pet_owner(self, filename):
+        owner = Owner("Alice")
+        for name in ("Rex", "Tom"):
+            pet = Pet(name, "Dog", 3, 20.0, [])
+            owner.add_pet(pet)
+            pet.add_task(Task(f"Walk {name}", Priority.HIGH, 30, due_date=datetime.now()))
+        save_owner_to_json(owner, filename)
+        return owner
+
+    def test_lazy_load_defers_tasks_until_first_access(self):
+        """Verify lazily loaded pets convert and index their tasks on first use"""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "owner.json")
+            saved = self._write_two_pet_owner(filename)
+
+            owner = load_owner_from_json(filename, lazy=True)
+            rex, tom = owner.pets
+            self.assertFalse(rex.tasks_loaded or tom.tasks_loaded)
+            self.assertEqual(rex.tasks[0].name, "Walk Rex")
+            self.assertTrue(rex.tasks_loaded)
+            self.assertFalse(tom.tasks_loaded)
+            self.assertIs(owner.pet_of(rex.tasks[0]), rex)
+
+            # Owner-wide lookups load whatever is still deferred
+            tom_task_id = saved.pets[1].tasks[0].id
+            self.assertEqual(owner.get_task(tom_task_id).name, "Walk Tom")
+            self.assertEqual(len(owner.due_index.today()), 2)
+
+    def test_snapshot_skips_parsing_until_file_changes(self):
+        """Verify a snapshot is reused for an unchanged file and ignored once it changes"""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "owner.json")
+            self._write_two_pet_owner(filename)
+
+            first = load_owner_from_json(filename, snapshot=True)
+            self.assertTrue(os.path.exists(filename + ".snapshot"))
+            with patch("pawpal_system.json.load") as parse:
+                again = load_owner_from_json(filename, snapshot=True)
+            parse.assert_not_called()
+            self.assertEqual([t.id for t in again.pets[0].tasks], [t.id for t in first.pets[0].tasks])
+            self.assertEqual(len(again.due_index.today()), 2)
+
+            first.pets[0].add_task(Task("Feed Rex", Priority.LOW, 5))
+            save_owner_to_json(first, filename)
+            os.utime(filename, ns=(1, 1))  # distinct mtime even on coarse filesystem clocks
+            reloaded = load_owner_from_json(filename, snapshot=True)
+            self.assertEqual(reloaded.pets[0].num_tasks, 2)
+
+    # ===== SEGMENTED STORAGE TESTS =====
+    def test_segmented_save_rewrites_only_dirty_pets(self):
+        """Verify a segmented save writes every pet once, then only pets changed since"""
+        with tempfile.TemporaryDirectory() as tmp:
+            owner = Owner("Alice")
+            for name in ("Rex", "Tom", "Kit"):
+                pet = Pet(name, "Dog", 3, 20.0, [])
+                owner.add_pet(pet)
+                pet.add_task(Task(f"Walk {name}", Priority.HIGH, 30, due_date=datetime.now()))
+            self.assertEqual(save_owner_segments(owner, tmp), 3)
+            self.assertEqual(save_owner_segments(owner, tmp), 0)
+
+            rex, tom, kit = owner.pets
+            Scheduler().complete_task(owner, tom.tasks[0])
+            kit.weight = 4.5
+            self.assertFalse(rex.dirty)
+            self.assertTrue(tom.dirty and kit.dirty)
+            self.assertEqual(save_owner_segments(owner, tmp), 2)
+
+            loaded = load_owner_segments(tmp)
+            self.assertEqual([p.name for p in loaded.pets], ["Rex", "Tom", "Kit"])
+            self.assertTrue(loaded.pets[1].tasks[0].completed)
+            self.assertEqual(loaded.pets[2].weight, 4.5)
+            self.assertFalse(any(p.dirty for p in loaded.pets))
+            self.assertEqual(save_owner_segments(loaded, tmp), 0)
+
+    def test_segmented_save_removes_stale_segments(self):
+        """Verify removing a pet deletes its segment and the cache reloads directory stores"""
+        with tempfile.TemporaryDirectory() as tmp:
+            owner = Owner("Alice")
+            owner.add_pet(Pet("Rex", "Dog", 3, 20.0, []))
+            owner.add_pet(Pet("Tom", "Cat", 2, 4.0, []))
+            save_owner_segments(owner, tmp)
+            owner.remove_pet(owner.pets[1])
+            save_owner_segments(owner, tmp)
+            self.assertEqual(len(os.listdir(os.path.join(tmp, "pets"))), 1)
+
+            cache = OwnerCache()
+            self.assertEqual(cache.get(tmp).pets[0].name, "Rex")
+            self.assertIsNone(load_owner_segments(os.path.join(tmp, "missing")))
+
+    def test_segmented_snapshot_and_store_detection(self):
+        """Verify stores use the snapshot too, and an existing plain file is never taken for a store"""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = os.path.join(tmp, "pawpal_data")
+            owner = Owner("Alice")
+            owner.add_pet(Pet("Rex", "Dog", 3, 20.0, [Task("Walk Rex", Priority.HIGH, 30)]))
+            save_owner_segments(owner, store)
+
+            load_owner(store, snapshot=True)
+            self.assertTrue(os.path.exists(os.path.join(store, "owner.snapshot")))
+            with patch("pawpal_system.load_segment") as loads:
+                again = load_owner(store, snapshot=True)
+            loads.assert_not_called()
+            self.assertEqual(again.pets[0].tasks[0].name, "Walk Rex")
+            again.pets[0].add_task(Task("Feed Rex", Priority.LOW, 5))
+            self.assertEqual(save_owner_segments(again, store), 1)
+            self.assertEqual(load_owner(store, snapshot=True).pets[0].num_tasks, 2)
+
+            plain = os.path.join(tmp, "hostname")
+            with open(plain, "w") as f:
+                f.write("not owner data\n")
+            self.assertFalse(is_segmented_store(plain))
+            self.assertTrue(is_segmented_store(os.path.join(tmp, "new_store")))
+            self.assertIsNone(load_owner_segments(plain))
+
+
+    def test_cache_refreshes_only_changed_segments_across_workers(self):
+        """Verify a second cache (another worker) applies only the pets another one saved"""
+        with tempfile.TemporaryDirectory() as tmp:
+            owner = Owner("Alice")
+            for name in ("Rex", "Tom"):
+                pet = Pet(name, "Dog", 3, 20.0, [])
+                owner.add_pet(pet)
+                pet.add_task(Task(f"Walk {name}", Priority.HIGH, 30, due_date=datetime.now()))
+            save_owner_segments(owner, tmp)
+            worker_a, worker_b = OwnerCache(), OwnerCache()
+            owner_a, owner_b = worker_a.get(tmp), worker_b.get(tmp)
+            tom_b = owner_b.pets[1]
+            self.assertEqual(len(owner_b.due_index.today()), 2)
+
+            with worker_a.write(tmp) as owner:
+                Scheduler().complete_task(owner, owner.pets[0].tasks[0])
+            with patch("pawpal_system.load_segment", wraps=load_segment) as loads:
+                self.assertIs(worker_b.get(tmp), owner_b)
+            self.assertEqual(loads.call_count, 1)  # only Rex's segment is re-read
+            self.assertIs(owner_b.pets[1], tom_b)
+            self.assertTrue(owner_b.pets[0].tasks[0].completed)
+            self.assertEqual(len(owner_b.due_index.today()), 1)
+
+            # B saves a new pet without having seen A's next change; neither is lost
+            with worker_a.write(tmp) as owner:
+                owner.pets[1].add_task(Task("Feed Tom", Priority.LOW, 5))
+            worker_b.watch(interval=0.01)
+            try:
+                with worker_b.write(tmp) as owner:
+                    owner.add_pet(Pet("Kit", "Cat", 1, 4.0, []))
+            finally:
+                worker_b.unwatch()
+            owner_a = worker_a.get(tmp)
+            self.assertEqual([p.name for p in owner_a.pets], ["Rex", "Tom", "Kit"])
+            self.assertEqual(owner_a.pets[1].num_tasks, 2)
+
+    def test_cache_watch_reads_ahead_and_applies_on_get(self):
+        """Verify watch() only reads changes in the background; get() applies them on the caller's thread"""
+        with tempfile.TemporaryDirectory() as tmp:
+            owner = Owner("Alice")
+            owner.add_pet(Pet("Rex", "Dog", 3, 20.0, []))
+            save_owner_segments(owner, tmp)
+            worker_a, worker_b = OwnerCache(), OwnerCache()
+            worker_a.get(tmp)
+            owner_b = worker_b.get(tmp)
+            worker_b.watch(interval=0.01)
+            try:
+                with worker_a.write(tmp) as owner:
+                    owner.pets[0].add_task(Task("Walk Rex", Priority.HIGH, 30))
+                deadline = datetime.now() + timedelta(seconds=5)
+                while "pending" not in worker_b._entries[tmp] and datetime.now() < deadline:
+                    time_module.sleep(0.01)
+            finally:
+                worker_b.unwatch()
+            self.assertEqual(owner_b.pets[0].num_tasks, 0)
+            with patch("pawpal_system.load_segment") as loads:
+                self.assertIs(worker_b.get(tmp), owner_b)
+            loads.assert_not_called()
+            self.assertEqual(owner_b.pets[0].tasks[0].name, "Walk Rex")
+
+    def test_cache_reads_are_safe_against_concurrent_writes(self):
+        """Verify sessions rendering through read() never see a writer's changes mid-iteration"""
+        with tempfile.TemporaryDirectory() as tmp:
+            owner = Owner("Alice")
+            today = datetime.now()
+            for name in ("Rex", "Tom"):
+                owner.add_pet(Pet(name, "Dog", 3, 20.0, [Task(f"Feed {i}", Priority.LOW, 5, due_date=today)
+                                                          for i in range(1000)]))
+            save_owner_segments(owner, tmp)
+            cache = OwnerCache()
+            stop = datetime.now() + timedelta(seconds=1)
+
+            def render():
+                renders = 0
+                while datetime.now() < stop:
+                    with cache.read(tmp) as shared:
+                        for _ in task_view(shared).rows():
+                            pass
+                        sum(task.duration for task in shared.due_index.today())
+                        Scheduler().create_plan(shared)
+                    renders += 1
+                return renders
+
+            def write():
+                added = 0
+                while datetime.now() < stop:
+                    with cache.write(tmp) as shared:
+                        for pet in shared.pets:
+                            pet.add_task(Task(f"Walk {added}", Priority.HIGH, 5, due_date=today))
+                    added += 1
+                return added
+
+            cache.get(tmp)
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)  # switch threads often, as a loaded server would
+            self.addCleanup(sys.setswitchinterval, switch_interval)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                readers = [pool.submit(render) for _ in range(3)]
+                writer = pool.submit(write)
+                self.assertGreater(writer.result(), 0)
+                self.assertTrue(all(reader.result() > 0 for reader in readers))  # re-raises reader errors
+            with cache.read(tmp) as shared:
+                self.assertEqual(len(list(task_view(shared).rows())), 2 * (1000 + writer.result()))
+
+    def test_cache_write_keeps_outside_json_changes_and_refuses_deleted_stores(self):
+        """Verify write() applies another process's JSON save first, and won't recreate a deleted store"""
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "owner.json")
+            owner = Owner("Alice")
+            owner.add_pet(Pet("Rex", "Dog", 3, 20.0, []))
+            save_owner_to_json(owner, filename)
+            worker_a, worker_b = OwnerCache(), OwnerCache()
+            worker_a.get(filename)
+            worker_b.get(filename)
+            with worker_a.write(filename) as shared:
+                shared.pets[0].add_task(Task("Walk Rex", Priority.HIGH, 30))
+            os.utime(filename, ns=(1, 1))  # distinct stamp even on coarse filesystem clocks
+            with worker_b.write(filename) as shared:
+                shared.pets[0].add_task(Task("Feed Rex", Priority.LOW, 5))
+            self.assertEqual(sorted(t.name for t in load_owner_from_json(filename).pets[0].tasks),
+                             ["Feed Rex", "Walk Rex"])
+
+            store = os.path.join(tmp, "store")
+            save_owner_segments(owner, store)
+            worker_a.get(store)
+            shutil.rmtree(store)  # another session pressed Reset
+            with self.assertRaises(FileNotFoundError):
+                with worker_a.write(store) as shared:
+                    shared.add_pet(Pet("Kit", "Cat", 1, 4.0, []))
+            self.assertFalse(os.path.exists(store))
+            self.assertIsNone(worker_a.get(store))
+
+    def test_segment_versions_are_unique_per_save(self):
+        """Verify two processes saving the same segment from the same version are both noticed"""
+        with tempfile.TemporaryDirectory() as tmp:
+            owner = Owner("Alice")
+            owner.add_pet(Pet("Rex", "Dog", 3, 20.0, []))
+            save_owner_segments(owner, tmp)
+            process_a, process_b = load_owner_segments(tmp), load_owner_segments(tmp)
+            cache = OwnerCache()
+            cached = cache.get(tmp)
+            manifest = os.path.join(tmp, "owner.json")
+            with open(manifest, "rb") as f:
+                before_a = f.read()
+
+            process_a.pets[0].add_task(Task("Walk Rex", Priority.HIGH, 30))
+            save_owner_segments(process_a, tmp)
+            self.assertEqual(cache.get(tmp).pets[0].num_tasks, 1)
+            process_b.pets[0].add_task(Task("Feed Rex", Priority.LOW, 5))
+            process_b.pets[0].add_task(Task("Brush Rex", Priority.LOW, 5))
+            with open(manifest, "wb") as f:  # B read the manifest before A's save landed
+                f.write(before_a)
+            save_owner_segments(process_b, tmp)
+            self.assertEqual([t.name for t in cache.get(tmp).pets[0].tasks], ["Feed Rex", "Brush Rex"])
+            self.assertIs(cache.get(tmp), cached)
 
 if __name__ == '__main__':
     unittest.main()
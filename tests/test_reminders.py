@@ -0,0 +1,123 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta, time
+from unittest.mock import patch
+
+from pawpal_reminders import ReminderEngine, TimerWheel, LogFileSink, SmtpSink
+from pawpal_system import Owner, Pet, Task, Priority, Recurrence, Scheduler
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Tests for the hierarchical timer wheel"""
+
+    def test_fires_in_order_across_levels(self):
+        """Verify timers at every level fire exactly on their minute, and cancelled ones never do"""
+        rng = random.Random(7)
+        start = 1_000_000
+        wheel = TimerWheel(start)
+        expected = {}
+        for key in range(3000):
+            minute = start + rng.choice([rng.randint(1, 60), rng.randint(1, 5000), rng.randint(1, 300_000)])
+            wheel.schedule(key, minute, minute)
+            expected[key] = minute
+        for key in rng.sample(sorted(expected), 500):
+            self.assertTrue(wheel.cancel(key))
+            del expected[key]
+        self.assertFalse(wheel.cancel("missing"))
+
+        fired = []
+        now = start
+        while now < start + 300_000:
+            now += rng.choice([1, 7, 64, 1000])
+            for key, minute in wheel.advance(now):
+                self.assertLessEqual(minute, now)
+                self.assertGreater(minute, now - 1000 - 1)
+                fired.append(key)
+        self.assertEqual(sorted(fired), sorted(expected))
+        self.assertEqual(len(wheel), 0)
+
+    def test_past_timers_fire_on_next_advance(self):
+        wheel = TimerWheel(100)
+        wheel.schedule("late", 90, "x")
+        self.assertEqual(wheel.advance(100), [("late", "x")])
+
+
+class TestReminderEngine(unittest.TestCase):
+    """Tests for owner-driven reminders"""
+
+    def setUp(self):
+        self.owner = Owner("Jon")
+        self.pet = Pet("Odie", "Dog", 4, 20.0, [])
+        self.owner.add_pet(self.pet)
+        self.now = datetime(2026, 3, 2, 8, 0)
+        self.received = []
+        self.engine = ReminderEngine(self.owner, [self.received.append], lead_minutes=15, now=self.now)
+
+    def test_reminders_follow_task_changes(self):
+        """Verify reminders are scheduled, moved and cancelled as tasks change"""
+        vet = Task("Vet", Priority.HIGH, 60, due_date=self.now, start_time=time(9, 0))
+        walk = Task("Walk", Priority.LOW, 30, due_date=self.now + timedelta(days=1), recurrence=Recurrence.DAILY)
+        bath = Task("Bath", Priority.LOW, 20, due_date=self.now, start_time=time(10, 0))
+        for task in (vet, walk, bath):
+            self.pet.add_task(task)
+        self.assertEqual(len(self.engine), 3)
+
+        self.owner.update_task(bath, start_time=time(11, 0))
+        Scheduler().complete_task(self.owner, walk)  # cancels walk, schedules the next occurrence
+
+        self.assertEqual([r.task for r in self.engine.advance(self.now + timedelta(minutes=44))], [])
+        [reminder] = self.engine.advance(self.now + timedelta(minutes=45))
+        self.assertEqual((reminder.task, reminder.kind), (vet, "start"))
+        self.assertIn("starts at 09:00", reminder.message)
+
+        fired = self.engine.advance(self.now + timedelta(days=3))
+        self.assertEqual([r.task.name for r in fired], ["Bath", "Walk"])
+        self.assertEqual(fired[1].at, datetime(2026, 3, 4, 8, 0))
+        self.assertEqual(len(self.received), 3)
+
+    def test_removed_tasks_and_past_reminders_never_fire(self):
+        vet = Task("Vet", Priority.HIGH, 60, due_date=self.now, start_time=time(9, 0))
+        self.pet.add_task(vet)
+        self.pet.add_task(Task("Old", Priority.HIGH, 5, due_date=self.now - timedelta(days=3)))
+        self.owner.remove_task(vet)
+        self.assertEqual(self.engine.advance(self.now + timedelta(days=1)), [])
+
+    def test_fired_reminders_are_not_sent_again_after_edits(self):
+        """Verify editing or reloading a task after its reminder fired doesn't deliver it twice"""
+        vet = Task("Vet", Priority.HIGH, 60, due_date=self.now, start_time=time(9, 0))
+        self.pet.add_task(vet)
+        self.assertEqual(len(self.engine.advance(self.now + timedelta(minutes=50))), 1)
+
+        self.owner.update_task(vet, description="Bring the records")
+        self.owner.remove_task(vet)
+        self.pet.add_task(vet)  # e.g. the pet's segment was reloaded
+        self.assertEqual(self.engine.advance(self.now + timedelta(minutes=55)), [])
+        self.assertEqual(len(self.received), 1)
+
+        self.owner.update_task(vet, start_time=time(10, 0))  # moved: remind again
+        self.assertEqual([r.task for r in self.engine.advance(self.now + timedelta(hours=2))], [vet])
+
+    def test_log_file_and_smtp_sinks(self):
+        """Verify the bundled sinks deliver, and a failing sink doesn't block the others"""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "reminders.log")
+
+            def broken(reminder):
+                raise RuntimeError("down")
+
+            self.engine.sinks = [broken, LogFileSink(log), SmtpSink("jon@example.com")]
+            self.pet.add_task(Task("Feed", Priority.HIGH, 5, due_date=self.now + timedelta(hours=1)))
+            with patch("smtplib.SMTP") as smtp:
+                self.engine.advance(self.now + timedelta(hours=2))
+
+            with open(log) as f:
+                self.assertIn("'Feed' (Odie) is due 2026-03-02", f.read())
+            message = smtp.return_value.__enter__.return_value.send_message.call_args[0][0]
+            self.assertEqual(message["To"], "jon@example.com")
+            self.assertEqual(len(self.engine.errors), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
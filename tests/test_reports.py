@@ -0,0 +1,94 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, time
+
+from pawpal_reports import write_report, write_owner_reports
+from pawpal_system import Owner, Pet, Task, Priority, Scheduler, save_owner_to_json
+
+
+class TestReports(unittest.TestCase):
+    """Tests for streaming plan/conflict/overdue reports"""
+
+    def setUp(self):
+        self.owner = Owner("Jon <Arbuckle>")
+        self.pet = Pet("Odie", "Dog", 4, 20.0, [])
+        self.owner.add_pet(self.pet)
+        self.today = datetime(2026, 3, 2)
+        self.pet.add_task(Task("Walk", Priority.HIGH, 30, due_date=self.today - timedelta(days=2),
+                               description="Around the block"))
+        self.pet.add_task(Task("Vet", Priority.LOW, 60, due_date=self.today, start_time=time(9, 0)))
+        self.pet.add_task(Task("Groom", Priority.LOW, 45, due_date=self.today, start_time=time(9, 30)))
+        self.pet.add_task(Task("Play", Priority.MEDIUM, 10))
+
+    def report(self, fmt, **options):
+        out = io.StringIO()
+        write_report(self.owner, out, fmt, today=self.today.date(), **options)
+        return out.getvalue()
+
+    def test_json_report_matches_scheduler(self):
+        """Verify the JSON report parses and agrees with the plan, conflicts and overdue tasks"""
+        report = json.loads(self.report("json"))
+        plan = Scheduler().create_plan(self.owner)
+
+        self.assertEqual(report["owner"], "Jon <Arbuckle>")
+        self.assertEqual(report["plan"]["count"], 4)
+        self.assertEqual(report["plan"]["minutes"], 145)
+        self.assertEqual([t["id"] for t in report["plan"]["tasks"]], [t.id for t in plan])
+        self.assertEqual([(c["name1"], c["name2"]) for c in report["conflicts"]], [("Vet", "Groom")])
+        self.assertEqual([(t["name"], t["days_late"]) for t in report["overdue"]], [("Walk", 2)])
+
+    def test_limits_and_empty_sections(self):
+        """Verify plan limits shape the totals and empty sections still render validly"""
+        report = json.loads(self.report("json", top_k=2, sections=["plan"]))
+        self.assertEqual(report["plan"]["count"], 2)
+        self.assertEqual(report["plan"]["minutes"], 40)
+        self.assertNotIn("conflicts", report)
+
+        out = io.StringIO()
+        write_report(Owner("Nobody"), out, "json")
+        self.assertEqual(json.loads(out.getvalue())["plan"], {"count": 0, "minutes": 0, "tasks": []})
+        with self.assertRaises(ValueError):
+            self.report("pdf")
+
+    def test_text_markdown_and_html_escape_per_format(self):
+        """Verify each format renders every section and escapes its own special characters"""
+        text = self.report("text")
+        self.assertIn("Schedule Plan: 4 tasks, 145 minutes total", text)
+        self.assertIn("   Around the block", text)
+        self.assertIn("'Vet' (Odie) overlaps with 'Groom' (Odie)", text)
+
+        self.assertIn("# PawPal+ report for Jon \\<Arbuckle\\>", self.report("markdown"))
+
+        html = self.report("html")
+        self.assertIn("<h1>PawPal+ report for Jon &lt;Arbuckle&gt;</h1>", html)
+        self.assertTrue(html.rstrip().endswith("</html>"))
+
+    def test_tasks_are_written_one_at_a_time(self):
+        """Verify the report is written in many small pieces rather than one big string"""
+        writes = []
+
+        class Recorder:
+            def write(self, text):
+                writes.append(text)
+
+        write_report(self.owner, Recorder(), "text", sections=["plan"])
+        self.assertEqual(sum("min (" in w for w in writes), 4)
+        self.assertTrue(all(w.count("min (") <= 1 for w in writes))
+
+    def test_write_owner_reports_one_file_per_owner(self):
+        """Verify nightly digests get one report file per owner file"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "jon.json")
+            save_owner_to_json(self.owner, path)
+            written = write_owner_reports([path, os.path.join(tmp, "missing.json")],
+                                          os.path.join(tmp, "reports"), "markdown")
+            self.assertEqual(written, [os.path.join(tmp, "reports", "jon.md")])
+            with open(written[0]) as f:
+                self.assertIn("## Schedule plan", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+
+from pawpal_service import PawPalService, start_server
+
+
+async def _request(port, method, path, payload=None):
+    """Send one HTTP request and return (status, decoded JSON body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    data = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    return status, json.loads(data)
+
+
+class TestPawPalService(unittest.TestCase):
+    """Tests for the asyncio service and its HTTP front"""
+
+    def setUp(self):
+        self.store = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.store.cleanup()
+
+    def test_http_create_list_complete_and_plan(self):
+        """Verify tasks can be created, listed, completed and planned over HTTP"""
+        async def scenario():
+            server = await start_server(PawPalService(self.store.name), port=0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                status, created = await _request(port, "POST", "/owners/jon/tasks", {
+                    "pet": "Odie", "name": "Walk", "priority": "high", "duration": 30,
+                    "due_date": "2026-03-01", "recurrence": "daily"
+                })
+                self.assertEqual(status, 201)
+                await _request(port, "POST", "/owners/jon/tasks", {"pet": "Odie", "name": "Brush", "priority": "low", "duration": 10})
+
+                status, tasks = await _request(port, "GET", "/owners/jon/tasks")
+                self.assertEqual([t["name"] for t in tasks], ["Walk", "Brush"])
+
+                status, done = await _request(port, "POST", f"/owners/jon/tasks/{created['id']}/complete")
+                self.assertEqual(done["next_due_date"], "2026-03-02T00:00:00")
+
+                status, _ = await _request(port, "POST", "/owners/jon/tasks/nope/complete")
+                self.assertEqual(status, 404)
+
+                status, plan = await _request(port, "GET", "/owners/jon/plan?top_k=2")
+                self.assertEqual([t["name"] for t in plan], ["Walk", "Walk"])
+
+                status, error = await _request(port, "POST", "/owners/jon/tasks", {"pet": "Odie", "name": "X", "priority": "urgent", "duration": 5})
+                self.assertEqual(status, 400)
+                self.assertIn("priority", error["error"])
+
+        asyncio.run(scenario())
+        # Writes are persisted per owner
+        self.assertTrue(os.path.exists(os.path.join(self.store.name, "jon.json")))
+
+    def test_concurrent_clients_are_serialized_per_owner(self):
+        """Verify many concurrent creates on one owner all land"""
+        async def scenario():
+            service = PawPalService(self.store.name)
+            await asyncio.gather(*(
+                service.create_task("ann", {"pet": "Rex", "name": f"Task {i}", "priority": "medium", "duration": 5})
+                for i in range(50)
+            ))
+            self.assertEqual(len(await service.list_tasks("ann")), 50)
+            self.assertEqual(await service.conflicts("ann"), [])
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()